@@ -0,0 +1,118 @@
+import os
+import sys
+import glob
+import time
+import argparse
+import compressed_io
+from concurrent.futures import ProcessPoolExecutor
+import main
+import netlist_store
+import sky130_db
+
+# Conversão em lote: várias netlists em paralelo, uma por processo. Cada
+# projeto grava em <saída>/<nome>/<nome>.sch (folhas e submódulos ao lado),
+# então execuções simultâneas não se sobrescrevem.
+
+def design_name(path):
+    """Nome do projeto a partir do arquivo: blocos/uart.nl.v -> uart."""
+    return os.path.basename(path).split(".")[0]
+
+def read_manifest(path):
+    """Um caminho por linha ('#' inicia comentário), relativo ao manifesto."""
+    base = os.path.dirname(path)
+    files = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                files.append(os.path.join(base, line))
+    return files
+
+def expand_inputs(specs):
+    """
+    Lista de netlists a converter. Cada item pode ser um diretório (todos os
+    .v, .v.gz, .v.zst e .nlb dele), um arquivo .v (comprimido ou não), um
+    design exportado, um manifesto (qualquer outro arquivo) ou um glob.
+    Duplicatas são ignoradas; a ordem de entrada é mantida.
+    """
+    files = []
+    for spec in specs:
+        if os.path.isdir(spec):
+            files += sorted(f for pattern in ("*.v", "*.v.gz", "*.v.zst", "*" + netlist_store.DESIGN_EXT)
+                            for f in glob.glob(os.path.join(spec, pattern)))
+        elif os.path.isfile(spec):
+            netlist = compressed_io.strip_codec(spec).endswith(".v") or netlist_store.is_design_file(spec)
+            files += [spec] if netlist else read_manifest(spec)
+        else:
+            files += sorted(glob.glob(spec))
+    return list(dict.fromkeys(files))
+
+def output_for(input_file, out_dir):
+    name = design_name(input_file)
+    return os.path.join(out_dir, name, name + ".sch")
+
+def _init_worker(rules_file, sym_libs):
+    # Regras, símbolos e CELL_DB carregados uma vez por processo
+    main.load_libraries(rules_file, sym_libs)
+    len(sky130_db.CELL_DB)
+
+def _convert(task):
+    input_file, output_file, fused, policy, cache, options = task
+    start = time.perf_counter()
+    try:
+        files = main.convert_file(input_file, output_file, fused=fused, policy=policy, cache=cache, **options)
+        return input_file, files, time.perf_counter() - start, None
+    except Exception as e:
+        return input_file, [], time.perf_counter() - start, str(e)
+
+def run_batch(inputs, out_dir, workers=None, fused=False, policy=None, rules_file=None, sym_libs=(), cache=None, **options):
+    """
+    Converte 'inputs' em um pool de 'workers' processos e mostra o tempo de
+    cada arquivo. Retorna a lista de (arquivo, arquivos gerados, segundos, erro).
+    """
+    names = {}
+    for input_file in inputs:
+        names.setdefault(design_name(input_file), []).append(input_file)
+    clashes = {name: files for name, files in names.items() if len(files) > 1}
+    if clashes:
+        for name, files in clashes.items():
+            print(f"Erro: mais de uma netlist para o projeto '{name}': {', '.join(files)}")
+        return []
+
+    tasks = [(f, output_for(f, out_dir), fused, policy, cache, options) for f in inputs]
+    results = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(rules_file, list(sym_libs))) as pool:
+        for input_file, files, elapsed, error in pool.map(_convert, tasks):
+            results.append((input_file, files, elapsed, error))
+            if error:
+                print(f"[erro] {elapsed:8.2f} s  {input_file}: {error}")
+            else:
+                print(f"[ok]   {elapsed:8.2f} s  {input_file} -> {files[0]}")
+
+    failed = sum(1 for r in results if r[3])
+    print(f"{len(results) - failed}/{len(results)} netlist(s) convertida(s) em {time.perf_counter() - start:.2f} s.")
+    return results
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Conversão em lote de netlists sky130 para xschem.")
+    parser.add_argument("inputs", nargs="+", help="diretórios, arquivos .v, manifestos ou globs (entre aspas)")
+    parser.add_argument("--out-dir", default="schematics", help="diretório de saída (padrão: schematics)")
+    parser.add_argument("--workers", metavar="N", type=int, help="processos simultâneos (padrão: núcleos da máquina)")
+    main.add_conversion_args(parser)
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python batch.py <dir | arquivo.v | manifesto | 'glob'>... [--out-dir DIR] [--workers N] [--fused]")
+    else:
+        args = parse_args(sys.argv[1:])
+        inputs = expand_inputs(args.inputs)
+        if not inputs:
+            print("Erro: nenhuma netlist encontrada.")
+        else:
+            results = run_batch(inputs, args.out_dir, args.workers, args.fused, args.physical,
+                                args.rules, args.sym_lib, main.conversion_cache(args), **main.conversion_options(args))
+            if not results or any(r[3] for r in results):
+                sys.exit(1)
@@ -0,0 +1,301 @@
+import io
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import subprocess
+import func_cell_wr
+import instrument
+import main
+import ocup
+import placement
+import rename_netlist
+from sky130_db import CELL_DB
+
+# Benchmark do conversor: gera netlists sky130 pós-síntese sintéticas e mede
+# cada etapa (renomeação, leitura, ocupação, bloco funcional, escrita) em
+# tempo de parede, CPU, memória e vazão. Cada medição roda em um processo
+# novo, para que o pico de memória de um tamanho não contamine o seguinte.
+# Os resultados vão, um por linha, para um arquivo JSON Lines, e --compare
+# aponta regressões contra a última medição com os mesmos parâmetros.
+
+RESULTS_FILE = "bench_results.jsonl"
+STAGES = ('rename', 'parse', 'occupation', 'functional', 'write')
+
+# Células físicas no formato da netlist original (antes da renomeação)
+PHYSICAL_CELLS = ('sky130_fd_sc_hd__fill_1', 'sky130_fd_sc_hd__fill_2', 'sky130_fd_sc_hd__fill_4',
+                  'sky130_fd_sc_hd__fill_8', 'sky130_fd_sc_hd__tapvpwrvgnd_1', 'sky130_fd_sc_hd__decap_3',
+                  'sky130_fd_sc_hd__decap_4', 'sky130_ef_sc_hd__decap_20_12',
+                  'sky130_ef_sc_hd__decap_40_12', 'sky130_ef_sc_hd__decap_80_12')
+
+def functional_types(mix=None):
+    """
+    (tipos, pesos) das células funcionais do CELL_DB com entradas e saídas.
+    'mix' ({prefixo: peso}) restringe e pondera por prefixo do tipo, ex.:
+    {'nand2': 3, 'sdfxtp': 1}; sem ele, todos os tipos com o mesmo peso.
+    Um prefixo que não seleciona nenhum tipo é um erro, não um peso ignorado.
+    """
+    types, weights = [], []
+    used = set()
+    for cell_type in sorted(CELL_DB):
+        if ocup.physical_kind(cell_type):
+            continue
+        pins = CELL_DB[cell_type]
+        outs = [p for p in pins if func_cell_wr.is_output_pin(cell_type, p)]
+        if not outs or len(outs) == len(pins):
+            continue
+        if mix is None:
+            weight = 1
+        else:
+            prefix = next((p for p in mix if cell_type.startswith(p)), None)
+            weight = mix[prefix] if prefix is not None else 0
+            used.add(prefix)
+        if weight:
+            types.append(cell_type)
+            weights.append(weight)
+    unused = [prefix for prefix in (mix or ()) if prefix not in used]
+    if unused:
+        raise ValueError(f"nenhuma célula funcional do CELL_DB para o(s) prefixo(s): {', '.join(unused)}")
+    if not types:
+        raise ValueError("nenhuma célula do CELL_DB corresponde ao mix pedido")
+    return types, weights
+
+def parse_mix(spec):
+    """Converte 'nand2=3,sdfxtp=1' em {'nand2': 3.0, 'sdfxtp': 1.0}, validando os prefixos."""
+    mix = {}
+    for item in spec.split(","):
+        prefix, _, weight = item.partition("=")
+        if prefix.strip():
+            mix[prefix.strip()] = float(weight or 1)
+    try:
+        functional_types(mix)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+    return mix
+
+def generate_netlist(path, n_func, filler_ratio=0.3, mix=None, fanout_skew=1.0, n_inputs=64, n_outputs=64, seed=1):
+    """
+    Grava em 'path' uma netlist pós-síntese sintética com 'n_func' células
+    funcionais e a fração 'filler_ratio' do total em células físicas,
+    intercaladas. Cada entrada liga-se a uma net já dirigida (entradas
+    primárias ou saídas anteriores), sorteada com viés para as primeiras
+    conforme 'fanout_skew' (1 = uniforme; maior = poucas nets de fanout alto).
+    As saídas das últimas 'n_outputs' células são as portas de saída.
+    Retorna o número de células físicas.
+    """
+    rng = random.Random(seed)
+    types, weights = functional_types(mix)
+    choice = rng.choices(types, weights, k=n_func)
+    n_phys = round(n_func * filler_ratio / (1 - filler_ratio)) if filler_ratio < 1 else 0
+    n_outputs = min(n_outputs, n_func)
+
+    # Nome da net de cada saída, definido antes de escrever (as declarações vêm primeiro)
+    pin_dirs = {t: [(p, func_cell_wr.is_output_pin(t, p)) for p in CELL_DB[t]] for t in types}
+    out_nets, n_wires = [], 0
+    for k, cell_type in enumerate(choice):
+        nets = []
+        for pin, output in pin_dirs[cell_type]:
+            if output:
+                if k >= n_func - n_outputs and not nets:
+                    nets.append(f"out{k - (n_func - n_outputs)}")
+                else:
+                    nets.append(f"n{n_wires}")
+                    n_wires += 1
+        out_nets.append(nets)
+
+    with open(path, 'w') as f:
+        inputs = [f"in{i}" for i in range(n_inputs)]
+        outputs = [f"out{i}" for i in range(n_outputs)]
+        f.write(f"module synth_{n_func} ({', '.join(inputs + outputs)});\n")
+        f.writelines(f" input {name};\n" for name in inputs)
+        f.writelines(f" output {name};\n" for name in outputs)
+        f.writelines(f" wire n{i};\n" for i in range(n_wires))
+
+        driven = list(inputs)
+        phys_left, func_left = n_phys, n_func
+        k = i_phys = 0
+        while func_left or phys_left:
+            if phys_left and rng.random() * (func_left + phys_left) < phys_left:
+                f.write(f" {rng.choice(PHYSICAL_CELLS)} FILLER_{i_phys} ();\n")
+                i_phys += 1
+                phys_left -= 1
+                continue
+            cell_type = choice[k]
+            conns, outs = [], iter(out_nets[k])
+            for pin, output in pin_dirs[cell_type]:
+                if output:
+                    conns.append(f".{pin}({next(outs)})")
+                else:
+                    conns.append(f".{pin}({driven[int(len(driven) * rng.random() ** fanout_skew)]})")
+            f.write(f" sky130_fd_sc_hd__{cell_type} _{k}_ (" + ",\n    ".join(conns) + ");\n")
+            driven.extend(out_nets[k])
+            k += 1
+            func_left -= 1
+        f.write("endmodule\n")
+    return n_phys
+
+# Unidade dos itens de cada etapa, para o relatório
+UNITS = {'rename': 'bytes', 'parse': 'instances', 'occupation': 'instances', 'functional': 'instances', 'write': 'bytes'}
+
+def run_stages(netlist_file, work_dir, occ_mode='matrix', layout='levelized', jobs=1, trace_memory=False):
+    """
+    Executa as etapas do conversor sobre 'netlist_file' e retorna as medições
+    por etapa. Com 'trace_memory', cada etapa também tem o pico de memória
+    Python do tracemalloc (py_peak_mb), ao custo de tempos bem maiores.
+    """
+    stats = instrument.Stats(trace_memory)
+    intermediate = os.path.join(work_dir, "bench.rn.v")
+    output = os.path.join(work_dir, "bench.sch")
+
+    with stats.stage('rename', os.path.getsize(netlist_file)):
+        rename_netlist.clean_and_organize_netlist(netlist_file, intermediate)
+
+    with stats.stage('parse'):
+        netlist = main.read_netlist(intermediate)
+    stats.add_items('parse', len(netlist))
+
+    num_cols = ocup.occupation_columns(len(netlist.occ_indices), main.OCC_MAX_ROWS, occ_mode, netlist.lumped)
+    x_func_start = main.X_MATRIZ_BASE + (max(1, num_cols) * main.OCC_X_STEP) + 400
+
+    # Geração em memória, para separar o custo de gerar o texto do de gravá-lo
+    occ_buf, func_buf = io.StringIO(), io.StringIO()
+    with stats.stage('occupation', len(netlist.occ_indices)):
+        ocup.write_occupation(occ_buf, netlist.occ_cells, main.X_MATRIZ_BASE, main.OCC_Y_STEP, main.OCC_X_STEP,
+                              main.OCC_MAX_ROWS, occ_mode, netlist.lumped, jobs)
+    with stats.stage('functional', len(netlist.func_indices)):
+        func_cell_wr.write_functional_block(func_buf, netlist.func_cells, netlist.inputs, netlist.outputs,
+                                            x_func_start, main.FUNC_Y_START, None, layout, jobs)
+
+    with stats.stage('write'):
+        with open(output, 'w') as f_out:
+            f_out.write("\n".join(main.SCH_HEADER))
+            f_out.write(occ_buf.getvalue())
+            f_out.write(func_buf.getvalue())
+    stats.add_items('write', os.path.getsize(output))
+
+    stages = stats.as_dict()['stages']
+    for stage, unit in UNITS.items():
+        stages[stage]['unit'] = unit
+    return stages
+
+def run_isolated(netlist_file, work_dir, occ_mode='matrix', layout='levelized', jobs=1, trace_memory=False):
+    """run_stages em um processo Python novo (ver o subcomando 'run-stages')."""
+    cmd = [sys.executable, os.path.abspath(__file__), "run-stages", netlist_file, work_dir, occ_mode, layout, str(jobs)]
+    if trace_memory:
+        cmd.append("--trace-memory")
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"medição falhou:\n{result.stdout}{result.stderr}")
+    # A última linha é o JSON; antes dela, as mensagens do conversor
+    return json.loads(result.stdout.splitlines()[-1])
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def best_of(runs):
+    """Por etapa, a repetição mais rápida (menos sujeita a ruído da máquina)."""
+    return {stage: min((run[stage] for run in runs), key=lambda r: r['wall_s']) for stage in runs[0]}
+
+def compare(record, results_file, tolerance):
+    """Compara com a última medição de mesmos parâmetros no arquivo; True se houve regressão."""
+    previous = None
+    try:
+        with open(results_file, 'r') as f:
+            for line in f:
+                entry = json.loads(line)
+                if entry.get('params') == record['params']:
+                    previous = entry
+    except (OSError, ValueError):
+        pass
+    if previous is None:
+        print("  (sem medição anterior com os mesmos parâmetros)")
+        return False
+
+    regression = False
+    for stage in STAGES:
+        old, new = previous['stages'][stage]['wall_s'], record['stages'][stage]['wall_s']
+        ratio = new / old if old else 1.0
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  <- REGRESSÃO"
+            regression = True
+        print(f"  {stage:<11} {old:8.3f} s -> {new:8.3f} s  ({ratio:5.2f}x){flag}")
+    print(f"  (comparado com {previous.get('revision')} de {previous.get('date')})")
+    return regression
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Benchmark do conversor com netlists sintéticas.")
+    parser.add_argument("--cells", metavar="N", type=int, nargs="+", default=[10000, 100000],
+                        help="células funcionais de cada netlist gerada (várias para medir escalabilidade)")
+    parser.add_argument("--filler-ratio", type=float, default=0.3, help="fração de células físicas no total")
+    parser.add_argument("--mix", type=parse_mix, help="pesos por prefixo de tipo, ex.: nand2=3,sdfxtp=1")
+    parser.add_argument("--fanout-skew", type=float, default=1.0,
+                        help="1 = fanout uniforme; maior concentra as cargas em poucas nets")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=1, help="repetições por tamanho (vale a mais rápida)")
+    parser.add_argument("--occ-mode", choices=ocup.OCC_MODES, default="matrix")
+    parser.add_argument("--layout", choices=placement.LAYOUTS, default="levelized")
+    parser.add_argument("--jobs", type=int, default=1, help="processos para ocupação e bloco funcional")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="mede também o pico de memória Python por etapa (tracemalloc; tempos bem maiores)")
+    parser.add_argument("--results", default=RESULTS_FILE, help="arquivo JSON Lines de resultados")
+    parser.add_argument("--compare", action="store_true", help="compara com a medição anterior de mesmos parâmetros")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="piora relativa tolerada em --compare")
+    parser.add_argument("--keep", metavar="DIR", help="mantém netlists e saídas em DIR")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__" and sys.argv[1:2] == ["run-stages"]:
+    # Uma medição, no processo novo criado por run_isolated
+    netlist_file, work_dir, occ_mode, layout, jobs = sys.argv[2:7]
+    stages = run_stages(netlist_file, work_dir, occ_mode, layout, int(jobs), "--trace-memory" in sys.argv)
+    print(json.dumps(stages))
+
+elif __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
+    work_dir = args.keep or tempfile.mkdtemp(prefix="bench_")
+    os.makedirs(work_dir, exist_ok=True)
+    regression = False
+
+    for n_cells in args.cells:
+        params = {'cells': n_cells, 'filler_ratio': args.filler_ratio, 'mix': args.mix,
+                  'fanout_skew': args.fanout_skew, 'seed': args.seed, 'occ_mode': args.occ_mode,
+                  'layout': args.layout, 'jobs': args.jobs}
+        if args.trace_memory:
+            params['trace_memory'] = True
+        netlist_file = os.path.join(work_dir, f"synth_{n_cells}.nl.v")
+        start = time.perf_counter()
+        n_phys = generate_netlist(netlist_file, n_cells, args.filler_ratio, args.mix, args.fanout_skew, seed=args.seed)
+        print(f"Netlist sintética: {n_cells} funcionais + {n_phys} físicas "
+              f"({os.path.getsize(netlist_file) / 1e6:.1f} MB, {time.perf_counter() - start:.1f} s)")
+
+        runs = [run_isolated(netlist_file, work_dir, args.occ_mode, args.layout, args.jobs, args.trace_memory)
+                for _ in range(args.repeat)]
+        stages = best_of(runs)
+        for stage in STAGES:
+            r = stages[stage]
+            print(f"  {stage:<11} {r['wall_s']:8.3f} s  cpu {r['cpu_s']:8.3f} s  "
+                  f"{r['items_per_s'] or 0:>12,} {r['unit']}/s  {instrument.memory_summary(r)}")
+
+        record = {'date': time.strftime("%Y-%m-%dT%H:%M:%S"), 'revision': git_revision(),
+                  'python': platform.python_version(), 'machine': platform.machine(),
+                  'params': params, 'stages': stages,
+                  'total_wall_s': round(sum(stages[s]['wall_s'] for s in STAGES), 4)}
+        if args.compare:
+            regression |= compare(record, args.results, args.tolerance)
+        with open(args.results, 'a') as f:
+            f.write(json.dumps(record) + "\n")
+
+        if not args.keep:
+            for name in os.listdir(work_dir):
+                os.remove(os.path.join(work_dir, name))
+    if not args.keep:
+        os.rmdir(work_dir)
+    sys.exit(1 if regression else 0)
@@ -0,0 +1,63 @@
+import io
+import gzip
+
+try:
+    import zstandard
+except ImportError:  # opcional: só necessário para .zst (pip install zstandard)
+    zstandard = None
+
+# Arquivos comprimidos lidos e gravados em streaming, escolhidos pela
+# extensão (.gz, .zst); qualquer outro nome é um arquivo comum. Nada é
+# descomprimido para arquivos temporários.
+
+CODECS = ('gz', 'zst')
+
+# Níveis que equilibram velocidade e tamanho para esquemáticos grandes
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+def codec_of(path):
+    """'gz', 'zst' ou None, pela extensão de 'path'."""
+    for codec in CODECS:
+        if path.endswith("." + codec):
+            return codec
+    return None
+
+def is_compressed(path):
+    return codec_of(path) is not None
+
+def strip_codec(path):
+    """netlist.nl.v.gz -> netlist.nl.v"""
+    codec = codec_of(path)
+    return path[:-len(codec) - 1] if codec else path
+
+def output_name(path, codec=None):
+    """Nome do arquivo gravado com 'codec': saida.sch -> saida.sch.gz."""
+    return f"{path}.{codec}" if codec else path
+
+def _require_zstandard(path):
+    if zstandard is None:
+        raise RuntimeError(f"'{path}' é zstd; instale o pacote zstandard (pip install zstandard)")
+
+def open_binary(path):
+    """Leitura em bytes, descomprimindo em streaming conforme a extensão."""
+    codec = codec_of(path)
+    if codec == 'gz':
+        return gzip.open(path, 'rb')
+    if codec == 'zst':
+        _require_zstandard(path)
+        return zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), read_across_frames=True)
+    return open(path, 'rb')
+
+def open_text(path, mode='r'):
+    """open(path, mode) em texto ('r' ou 'w'), comprimindo ou descomprimindo conforme a extensão."""
+    codec = codec_of(path)
+    if codec == 'gz':
+        return gzip.open(path, mode + 't', compresslevel=GZIP_LEVEL)
+    if codec == 'zst':
+        _require_zstandard(path)
+        if mode == 'r':
+            return io.TextIOWrapper(open_binary(path))
+        writer = zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(open(path, 'wb'))
+        return io.TextIOWrapper(writer)
+    return open(path, mode)
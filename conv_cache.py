@@ -0,0 +1,130 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+
+# Cache de conversões endereçado por conteúdo. A chave combina o hash da
+# netlist de entrada com tudo o que influencia a saída (CELL_DB, regras,
+# parâmetros de geometria, opções e o próprio código do conversor); uma
+# entrada guarda os arquivos gerados. Entradas menos usadas recentemente
+# são descartadas quando o cache passa do tamanho máximo.
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "verilog_to_xschem", "conversions")
+CACHE_FORMAT = 1
+DEFAULT_MAX_MB = 2048
+
+_code_hash = None
+
+def code_hash():
+    """Hash dos fontes do conversor: uma versão nova invalida as entradas antigas."""
+    global _code_hash
+    if _code_hash is None:
+        h = hashlib.sha1()
+        src_dir = os.path.dirname(os.path.abspath(__file__))
+        for name in sorted(os.listdir(src_dir)):
+            if name.endswith(".py"):
+                with open(os.path.join(src_dir, name), 'rb') as f:
+                    h.update(name.encode())
+                    h.update(f.read())
+        _code_hash = h.hexdigest()
+    return _code_hash
+
+def file_hash(path):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def conversion_key(input_file, output_name, settings):
+    """Chave da conversão: conteúdo da entrada + nome da saída + 'settings' (JSON-serializável)."""
+    h = hashlib.sha1()
+    h.update(f"{CACHE_FORMAT}\0{code_hash()}\0{file_hash(input_file)}\0{output_name}\0".encode())
+    h.update(json.dumps(settings, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+class ConversionCache:
+    """Diretório de entradas <chave>/ com os arquivos gerados e um meta.json."""
+    def __init__(self, cache_dir=CACHE_DIR, max_mb=DEFAULT_MAX_MB):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_mb * 1024 * 1024
+
+    def _entry(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def fetch(self, key, out_dir):
+        """Copia os arquivos da entrada para 'out_dir'; retorna a lista ou None (miss)."""
+        entry = self._entry(key)
+        try:
+            with open(os.path.join(entry, "meta.json"), 'r') as f:
+                meta = json.load(f)
+            files = []
+            for name in meta['files']:
+                target = os.path.join(out_dir, name)
+                shutil.copyfile(os.path.join(entry, name), target)
+                files.append(target)
+            # Uso recente: o mtime do meta.json ordena a evicção
+            os.utime(os.path.join(entry, "meta.json"))
+        except (OSError, ValueError, KeyError):
+            return None
+        return files
+
+    def store(self, key, files):
+        """Guarda 'files' (todos no mesmo diretório) sob 'key' e aplica o limite de tamanho."""
+        entry = self._entry(key)
+        if os.path.isdir(entry):
+            return
+        tmp = f"{entry}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(tmp, exist_ok=True)
+            names = []
+            for path in files:
+                name = os.path.basename(path)
+                shutil.copyfile(path, os.path.join(tmp, name))
+                names.append(name)
+            with open(os.path.join(tmp, "meta.json"), 'w') as f:
+                json.dump({'files': names, 'created': time.time()}, f)
+            os.rename(tmp, entry)
+        except OSError:
+            # Outro processo gravou a mesma entrada, ou disco sem espaço/permissão
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+        self.evict()
+
+    def entries(self):
+        """(último uso, tamanho, caminho) de cada entrada completa."""
+        result = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return result
+        for name in names:
+            entry = os.path.join(self.cache_dir, name)
+            meta = os.path.join(entry, "meta.json")
+            if name.endswith(".tmp") or not os.path.isfile(meta):
+                continue
+            try:
+                size = sum(e.stat().st_size for e in os.scandir(entry))
+                result.append((os.stat(meta).st_mtime, size, entry))
+            except OSError:
+                continue
+        return result
+
+    def evict(self, max_bytes=None):
+        """Remove as entradas menos usadas até o total caber em 'max_bytes'."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, entry in entries:
+            if total <= limit:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        removed = self.evict(0)
+        print(f"Cache de conversões: {removed} entrada(s) removida(s).")
@@ -0,0 +1,191 @@
+import os
+import re
+import zlib
+import marshal
+import hashlib
+from array import array
+import func_cell_wr
+import netlist_model
+import placement
+from sky130_db import CELL_DB
+
+# Reconversão incremental (--eco). Ao lado do esquemático fica um sidecar
+# (<saída>.eco) com, por instância funcional, o hash do seu conteúdo, a
+# posição e o texto emitido. Na conversão seguinte, instâncias com o mesmo
+# hash reaproveitam o texto (mesmas coordenadas e labels); só as novas e as
+# alteradas são geradas de novo, e as removidas somem. Novas instâncias vão
+# para uma área de ECO à direita do bloco, sem mexer no resto. Se a origem do
+# bloco mudou (ex.: mais células de ocupação alargam a matriz à esquerda), as
+# posições e o texto reaproveitados são deslocados junto com ela.
+
+ECO_FORMAT = 1
+ECO_ROWS = 50
+
+def sidecar_path(output_file):
+    return output_file + ".eco"
+
+def environment_key(layout):
+    """O que invalida o sidecar inteiro: formato, layout e geometria das células."""
+    return f"{ECO_FORMAT}:{layout}:{CELL_DB.fingerprint()}"
+
+# Coordenadas das linhas 'C {símbolo} x y ...' e 'N x1 y1 x2 y2 ...' do texto emitido
+_COORDS = re.compile(r"^(C \{[^}]*\} )(-?\d+) (-?\d+)|^N (-?\d+) (-?\d+) (-?\d+) (-?\d+)", re.M)
+
+def translate(text, dx, dy):
+    """Texto de instâncias emitido por func_cell_wr deslocado de (dx, dy)."""
+    def shift(m):
+        if m.group(1):
+            return f"{m.group(1)}{int(m.group(2)) + dx} {int(m.group(3)) + dy}"
+        x1, y1, x2, y2 = (int(v) for v in m.group(4, 5, 6, 7))
+        return f"N {x1 + dx} {y1 + dy} {x2 + dx} {y2 + dy}"
+    return _COORDS.sub(shift, text)
+
+def load_sidecar(path, env):
+    """Sidecar anterior, ou None se ausente, ilegível ou gerado em outras condições."""
+    try:
+        with open(path, 'rb') as f:
+            data = marshal.loads(zlib.decompress(f.read()))
+    except (OSError, EOFError, ValueError, TypeError, zlib.error):
+        return None
+    if data.get('env') != env:
+        return None
+    return data
+
+def save_sidecar(path, data):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(zlib.compress(marshal.dumps(data), 1))
+    os.replace(tmp, path)
+
+def port_owners(netlist, inputs, outputs, net_index):
+    """Instância -> portas primárias que ela recebe (ipin na 1ª carga, opin no driver)."""
+    owners = {}
+    for ports, owner_of in ((inputs, net_index.first_load), (outputs, net_index.driver)):
+        for name in ports:
+            net = netlist.net_ids.get(name)
+            if net is not None:
+                owner = owner_of(net)
+                if owner >= 0:
+                    owners.setdefault(owner, []).append(name)
+    return owners
+
+def instance_keys(cells, owners):
+    """Hash do conteúdo de cada instância: tipo, conexões e portas que ela recebe."""
+    netlist = cells.netlist
+    inst_type, cell_types = netlist.inst_type, netlist.cell_types
+    offsets, pin_ids, pin_nets = netlist.pin_offsets, netlist.pin_ids, netlist.pin_nets
+    pin_names, net_names = netlist.pin_names, netlist.net_names
+    keys = []
+    for index in cells.indices:
+        conns = " ".join(f"{pin_names[pin_ids[p]]}={net_names[pin_nets[p]]}"
+                         for p in range(offsets[index], offsets[index + 1]))
+        text = f"{cell_types[inst_type[index]]}|{conns}|{owners.get(index, '')}"
+        keys.append(hashlib.blake2b(text.encode(), digest_size=8).digest())
+    return keys
+
+class _Pieces(list):
+    """Destino de func_cell_wr.emit_range que guarda cada escrita separada."""
+    write = list.append
+
+def write_functional_block_eco(out, cells, inputs, outputs, x_start, y_start, sidecar_file, layout='levelized'):
+    """
+    Como func_cell_wr.write_functional_block, reaproveitando o sidecar da
+    conversão anterior. Sem sidecar válido gera tudo (saída idêntica à
+    normal) e grava o sidecar para a próxima vez.
+    """
+    netlist = cells.netlist
+    n = len(cells)
+    net_index = netlist_model.build_net_index(netlist, func_cell_wr.is_output_pin, cells.indices)
+    owners = port_owners(netlist, inputs, outputs, net_index)
+    keys = instance_keys(cells, owners)
+    env = environment_key(layout)
+    old = load_sidecar(sidecar_file, env)
+    inst_names = netlist.inst_names
+
+    # Posições: as antigas para o que já existia; área de ECO para o resto
+    reuse = [None] * n
+    dx = dy = 0
+    if old is None:
+        if layout == 'levelized':
+            xs, ys = placement.levelized_placement(cells, net_index, func_cell_wr.is_output_pin, x_start, y_start)
+        else:
+            xs, ys = placement.column_placement(n, x_start, y_start)
+        next_label = 0
+        n_new, n_changed, n_removed = n, 0, 0
+    else:
+        old_pos = {name: k for k, name in enumerate(old['names'])}
+        old_xs, old_ys = array('l'), array('l')
+        old_xs.frombytes(old['xs'])
+        old_ys.frombytes(old['ys'])
+        old_starts = array('Q')
+        old_starts.frombytes(old['starts'])
+        old_text = old['text']
+
+        # Origem deslocada desde a conversão anterior: tudo o que é
+        # reaproveitado acompanha o bloco
+        dx, dy = x_start - old['origin'][0], y_start - old['origin'][1]
+        if dx or dy:
+            old_xs = array('l', (x + dx for x in old_xs))
+            old_ys = array('l', (y + dy for y in old_ys))
+
+        xs, ys = array('l', [0]) * n, array('l', [0]) * n
+        added = []
+        n_changed = 0
+        for k, index in enumerate(cells.indices):
+            j = old_pos.pop(inst_names[index], None)
+            if j is None:
+                added.append(k)
+                continue
+            xs[k], ys[k] = old_xs[j], old_ys[j]
+            if old['keys'][j] == keys[k]:
+                text = old_text[old_starts[j]:old_starts[j + 1]]
+                reuse[k] = translate(text, dx, dy) if dx or dy else text
+            else:
+                n_changed += 1
+
+        # Área de ECO: colunas de ECO_ROWS células à direita de tudo o que existe
+        x_eco = (max(old_xs) if len(old_xs) else x_start) + 2 * placement.COL_STEP
+        for slot, k in enumerate(added):
+            xs[k] = x_eco + (slot // ECO_ROWS) * placement.COL_STEP
+            ys[k] = y_start - (slot % ECO_ROWS) * placement.ROW_STEP
+        next_label = old['next_label']
+        n_new, n_removed = len(added), len(old_pos)
+
+    state = func_cell_wr.block_state(cells, inputs, outputs, xs, ys, net_index)
+
+    # Texto de cada instância, reaproveitado ou gerado, na ordem da netlist
+    placed = set()
+    pieces = _Pieces()
+    texts = []
+    starts = array('Q', [0])
+    total = flushed = 0
+    for k in range(n):
+        text = reuse[k]
+        if text is None:
+            next_label, nets = func_cell_wr.emit_range(state, k, k + 1, next_label, pieces)
+            text = pieces.pop()
+        else:
+            nets = [netlist.net_ids[name] for name in owners.get(cells.indices[k], ())]
+        placed.update(nets)
+        texts.append(text)
+        total += len(text)
+        starts.append(total)
+        if len(texts) - flushed >= func_cell_wr.WRITE_CHUNK:
+            out.write("".join(texts[flushed:]))
+            flushed = len(texts)
+    out.write("".join(texts[flushed:]))
+
+    func_cell_wr.write_unplaced_ports(out, netlist, inputs, outputs, placed, x_start, y_start)
+
+    n_reused = n - n_new - n_changed
+    if old is not None and n_reused == n and not n_removed and not (dx or dy):
+        print(f"ECO: nenhuma alteração ({n} instâncias reaproveitadas).")
+        return
+
+    save_sidecar(sidecar_file, {
+        'env': env, 'origin': (x_start, y_start), 'next_label': next_label,
+        'names': [inst_names[i] for i in cells.indices], 'keys': keys,
+        'xs': xs.tobytes(), 'ys': ys.tobytes(), 'starts': starts.tobytes(), 'text': "".join(texts),
+    })
+    print(f"ECO: {n_reused} instância(s) reaproveitada(s), {n_changed} alterada(s), "
+          f"{n_new} nova(s), {n_removed} removida(s).")
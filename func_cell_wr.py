@@ -1,75 +1,249 @@
+import io
 from sky130_db import CELL_DB
+import netlist_model
+import parallel
+import placement
 
-def get_pin_side(pin_name):
+# Pinos de alimentação global: não recebem fio nem label
+POWER_PINS = frozenset({'VGND', 'VNB', 'VPB', 'VPWR'})
+
+def is_output_pin(cell_type, pin_name):
+    """Direção usada pelo índice de nets: pinos de saída dirigem a net."""
+    return CELL_DB.pin_direction(cell_type, pin_name) == 'out'
+
+# Atributos fixos de toda instância de célula padrão
+CELL_ATTRS = "VGND=VGND VNB=VNB VPB=VPB VPWR=VPWR prefix=sky130_fd_sc_hd__"
+
+# Instâncias acumuladas antes de cada escrita no arquivo
+WRITE_CHUNK = 4096
+
+class CellTemplate(dict):
+    """
+    Tipo de célula já resolvido para a escrita: o início da linha 'C' e, por
+    id de pino, (dy, dx, dx_lab, saída), com dx negativo à esquerda e dx_lab
+    na ponta do stub de 30 unidades, ou None para pinos de alimentação.
+    Resolvido uma vez por tipo (CELL_DB + direção); depois o custo por
+    instância é um lookup.
+    """
+    def __init__(self, netlist, cell_type):
+        super().__init__()
+        self.cell_type = cell_type
+        self.metrics = CELL_DB.get(cell_type)
+        self.head = f"\nC {{sky130_stdcells/{cell_type}.sym}} "
+
+        # Fallback padrão se o pino não estiver no DB: dy=0, dx=60
+        metrics = self.metrics or {}
+        for pin_id, pin_name in enumerate(netlist.pin_names):
+            if pin_name in POWER_PINS:
+                self[pin_id] = None
+                continue
+            dy, dx_off = metrics.get(pin_name, (0, 60))
+            if is_output_pin(cell_type, pin_name):
+                self[pin_id] = (dy, dx_off, dx_off + 30, True)
+            else:
+                self[pin_id] = (dy, -dx_off, -dx_off - 30, False)
+
+class BlockState:
+    """
+    Tudo o que a escrita de uma faixa do bloco funcional precisa: arrays da
+    netlist, posições, índice de nets, templates. Com --jobs vai uma única
+    vez para cada processo do pool.
     """
-    Determina se um pino deve ficar à esquerda (entrada) ou à direita (saída).
-    Segue as convenções da biblioteca sky130_fd_sc_hd.
+    __slots__ = ('indices', 'xs', 'ys', 'inst_names', 'inst_type', 'offsets', 'pin_ids', 'pin_nets',
+                 'net_names', 'net_index', 'port_nets', 'templates')
+
+    def __init__(self, cells, xs, ys, net_index, port_nets, templates):
+        netlist = cells.netlist
+        self.indices, self.xs, self.ys = cells.indices, xs, ys
+        self.inst_names, self.inst_type = netlist.inst_names, netlist.inst_type
+        self.offsets, self.pin_ids, self.pin_nets = netlist.pin_offsets, netlist.pin_ids, netlist.pin_nets
+        self.net_names = netlist.net_names
+        self.net_index = net_index
+        self.port_nets = port_nets
+        self.templates = templates
+
+def block_state(cells, inputs, outputs, xs, ys, net_index):
+    """BlockState do bloco: templates dos tipos usados e nets das portas primárias."""
+    netlist = cells.netlist
+
+    # Um template por tipo usado, na ordem de aparição (células ausentes do
+    # CELL_DB são avisadas uma vez por conversão, em main.convert_file)
+    templates = {}
+    for type_id in dict.fromkeys(netlist.inst_type[i] for i in cells.indices):
+        templates[type_id] = CellTemplate(netlist, netlist.cell_types[type_id])
+
+    # Nets de portas primárias ainda não colocadas: 1 = entrada, 2 = saída
+    port_nets = bytearray(len(netlist.net_names))
+    for ports, flag in ((inputs, 1), (outputs, 2)):
+        for name in ports:
+            net = netlist.net_ids.get(name)
+            if net is not None:
+                port_nets[net] = flag
+
+    return BlockState(cells, xs, ys, net_index, port_nets, templates)
+
+def write_unplaced_ports(out, netlist, inputs, outputs, placed, x_start, y_start):
+    """
+    Portas que não tocam diretamente nenhuma célula (barramentos, portas
+    ligadas só a submódulos): ipin/opin avulsos, conectados pelo nome.
+    'placed' são as nets de portas já colocadas junto às células.
     """
-    # Entradas típicas
-    input_prefixes = ['A', 'B', 'C', 'D', 'S', 'CLK', 'RESET', 'SET', 'SLEEP', 'GATE', 'DE', 'CI']
-    # Saídas típicas
-    output_prefixes = ['X', 'Y', 'Q', 'CO', 'GCLK']
-    
-    name_upper = pin_name.upper()
-    
-    if any(name_upper.startswith(p) for p in input_prefixes):
-        return "LEFT"
-    if any(name_upper.startswith(p) for p in output_prefixes):
-        return "RIGHT"
-    
-    # Caso especial: 'S' pode ser seletor (entrada) ou soma (saída)
-    # No DB, somadores usam 'S' na direita e Muxes usam 'S' na esquerda.
-    return "LEFT" # Padrão para segurança
-
-def generate_functional_block(cells, inputs, outputs, x_start, y_start):
+    k = 0
     lines = []
-    for i, cell in enumerate(cells):
-        y_gate = y_start - (i * 300)
-        x_gate = x_start
-        cell_type = cell['type']
-        
+    for ports, sym, prefix in ((inputs, "ipin", "in"), (outputs, "opin", "out")):
+        for name, width in ports.items():
+            if netlist.net_ids.get(name) not in placed:
+                lines.append(f"\nC {{{sym}.sym}} {x_start-400} {y_start - k*40} 0 0 {{name={prefix}_{name} lab={name}{width}}}")
+                k += 1
+    out.write("".join(lines))
+
+def emit_range(state, start, end, n_labels, out):
+    """
+    Escreve as instâncias cells[start:end] em 'out'. Os labels são numerados
+    a partir de n_labels + 1. Retorna (último label usado, nets de portas
+    primárias colocadas nesta faixa).
+    """
+    indices, xs, ys = state.indices, state.xs, state.ys
+    inst_names, inst_type, templates = state.inst_names, state.inst_type, state.templates
+    offsets, pin_ids, pin_nets, net_names = state.offsets, state.pin_ids, state.pin_nets, state.net_names
+    net_index, port_nets = state.net_index, state.port_nets
+    placed = []
+
+    # As linhas são montadas em pedaços e gravadas a cada WRITE_CHUNK instâncias
+    chunk = []
+    emit = chunk.append
+
+    for k in range(start, end):
+        index = indices[k]
+        x_gate, y_gate = xs[k], ys[k]
+        template = templates[inst_type[index]]
+
         # 1. Colocação da Instância da Célula
-        attr = f"name={cell['name']} VGND=VGND VNB=VNB VPB=VPB VPWR=VPWR prefix=sky130_fd_sc_hd__"
-        lines.append(f"C {{sky130_stdcells/{cell_type}.sym}} {x_gate} {y_gate} 0 0 {{{attr}}}")
-        
-        # 2. Busca de métricas no nosso Banco de Dados
-        # Caso a célula não exista, define um fallback padrão
-        cell_metrics = CELL_DB.get(cell_type, {})
-        
-        for pin_name, net_name in cell['conns']:
-            # Ignora pinos de alimentação global
-            if pin_name in ['VGND', 'VNB', 'VPB', 'VPWR']:
+        emit(f"{template.head}{x_gate} {y_gate} 0 0 {{name={inst_names[index]} {CELL_ATTRS}}}")
+
+        # 2. Pinos: só deslocamentos, o resto vem do template do tipo
+        for p in range(offsets[index], offsets[index + 1]):
+            pin = template[pin_ids[p]]
+            if pin is None:
                 continue
-            
-            # Obtém métricas: dy (vertical), dx_off (distância do centro ao pino)
-            # Fallback padrão se o pino não estiver no DB: dy=0, dx=60
-            dy, dx_off = cell_metrics.get(pin_name, (0, 60))
-            
+            dy, dx, dx_lab, output = pin
+            net = pin_nets[p]
+            net_name = net_names[net]
+
             yp = y_gate + dy
-            side = get_pin_side(pin_name)
-            
-            if side == "LEFT":
-                # Ponto exato onde o fio toca o pino no símbolo
-                xp_pin = x_gate - dx_off
-                
-                if net_name in inputs:
-                    # CONEXÃO GLOBAL: Fio do ipin (-150) até o pino
-                    lines.append(f"N {x_gate-150} {yp} {xp_pin} {yp} {{lab={net_name}}}")
-                    lines.append(f"C {{ipin.sym}} {x_gate-150} {yp} 0 0 {{name=in_{net_name}_{i} lab={net_name}}}")
+            # Ponto exato onde o fio toca o pino no símbolo
+            xp_pin = x_gate + dx
+
+            if not output:
+                if port_nets[net] == 1 and net_index.first_load(net) == index:
+                    # CONEXÃO GLOBAL: Fio do ipin (-150) até o pino, uma vez por porta
+                    port_nets[net] = 0
+                    placed.append(net)
+                    x_port = x_gate - 150
+                    emit(f"\nN {x_port} {yp} {xp_pin} {yp} {{lab={net_name}}}"
+                         f"\nC {{ipin.sym}} {x_port} {yp} 0 0 {{name=in_{net_name} lab={net_name}}}")
                 else:
-                    # CONEXÃO INTERNA: Stub de 30 unidades para clareza
-                    lines.append(f"N {xp_pin-30} {yp} {xp_pin} {yp} {{lab={net_name}}}")
-            
-            else: # side == "RIGHT"
-                # Ponto exato onde o fio toca o pino no símbolo
-                xp_pin = x_gate + dx_off
-                
-                if net_name in outputs:
-                    # CONEXÃO GLOBAL: Fio do pino até o opin (+150)
-                    lines.append(f"N {xp_pin} {yp} {x_gate+150} {yp} {{lab={net_name}}}")
-                    lines.append(f"C {{opin.sym}} {x_gate+150} {yp} 0 0 {{name=out_{net_name}_{i} lab={net_name}}}")
+                    # CONEXÃO POR NOME: Stub de 30 unidades terminado em label
+                    n_labels += 1
+                    x_lab = x_gate + dx_lab
+                    emit(f"\nN {x_lab} {yp} {xp_pin} {yp} {{lab={net_name}}}"
+                         f"\nC {{lab_pin.sym}} {x_lab} {yp} 0 0 {{name=l{n_labels} lab={net_name}}}")
+
+            else:
+                if port_nets[net] == 2 and net_index.driver(net) == index:
+                    # CONEXÃO GLOBAL: Fio do pino até o opin (+150), uma vez por porta
+                    port_nets[net] = 0
+                    placed.append(net)
+                    x_port = x_gate + 150
+                    emit(f"\nN {xp_pin} {yp} {x_port} {yp} {{lab={net_name}}}"
+                         f"\nC {{opin.sym}} {x_port} {yp} 0 0 {{name=out_{net_name} lab={net_name}}}")
                 else:
-                    # CONEXÃO INTERNA: Stub de 30 unidades
-                    lines.append(f"N {xp_pin} {yp} {xp_pin+30} {yp} {{lab={net_name}}}")
+                    # CONEXÃO POR NOME: Stub de 30 unidades terminado em label
+                    n_labels += 1
+                    x_lab = x_gate + dx_lab
+                    emit(f"\nN {xp_pin} {yp} {x_lab} {yp} {{lab={net_name}}}"
+                         f"\nC {{lab_pin.sym}} {x_lab} {yp} 0 1 {{name=l{n_labels} lab={net_name}}}")
+
+        if len(chunk) >= WRITE_CHUNK:
+            out.write("".join(chunk))
+            chunk.clear()
+
+    out.write("".join(chunk))
+    return n_labels, placed
+
+def _scan_range(state, start, end):
+    """
+    Passada leve sobre cells[start:end], com as mesmas decisões de
+    emit_range sem formatar nada: quantos labels a faixa usa e quais portas
+    ela coloca. Dá a numeração inicial de cada faixa no modo paralelo.
+    Não altera port_nets: o mesmo estado ainda serve à rodada de escrita.
+    """
+    indices, inst_type, templates = state.indices, state.inst_type, state.templates
+    offsets, pin_ids, pin_nets = state.offsets, state.pin_ids, state.pin_nets
+    net_index, port_nets = state.net_index, state.port_nets
+    n_labels = 0
+    placed = set()
+    for k in range(start, end):
+        index = indices[k]
+        template = templates[inst_type[index]]
+        for p in range(offsets[index], offsets[index + 1]):
+            pin = template[pin_ids[p]]
+            if pin is None:
+                continue
+            net = pin_nets[p]
+            flag = port_nets[net]
+            if flag and net not in placed and flag == (2 if pin[3] else 1) and (
+                    net_index.driver(net) if pin[3] else net_index.first_load(net)) == index:
+                placed.add(net)
+            else:
+                n_labels += 1
+    return n_labels, placed
+
+def _emit_text(state, start, end, n_labels):
+    """Versão de emit_range para os processos do pool: devolve o texto."""
+    buf = io.StringIO()
+    emit_range(state, start, end, n_labels, buf)
+    return buf.getvalue()
+
+def write_functional_block(out, cells, inputs, outputs, x_start, y_start, net_index=None, layout='levelized', jobs=1):
+    """
+    Escreve o bloco funcional em 'out' (qualquer objeto com write); cada
+    linha vai precedida de '\n', continuando um arquivo já iniciado. Com o
+    índice net -> (driver, cargas), cada porta primária é emitida uma única
+    vez: o ipin na primeira carga da net e o opin no seu driver. As demais
+    conexões (inclusive nets internas) recebem um stub de 30 unidades
+    terminado em lab_pin, que liga as nets pelo nome.
+    layout='levelized' distribui as células em grade por nível lógico
+    (entradas -> saídas); layout='column' mantém a coluna única original.
+    Com jobs > 1, blocos grandes são gerados em faixas por um pool de
+    processos; a saída é idêntica à da geração serial.
+    """
+    netlist = cells.netlist
+    if net_index is None:
+        net_index = netlist_model.build_net_index(netlist, is_output_pin, cells.indices)
+
+    if layout == 'levelized':
+        xs, ys = placement.levelized_placement(cells, net_index, is_output_pin, x_start, y_start)
+    else:
+        xs, ys = placement.column_placement(len(cells), x_start, y_start)
+
+    state = block_state(cells, inputs, outputs, xs, ys, net_index)
+    n = len(cells)
+    if parallel.worth_parallel(n, jobs):
+        ranges = parallel.chunk_ranges(n, jobs)
+        with parallel.ChunkPool(state, jobs) as pool:
+            # 1ª rodada: labels e portas de cada faixa -> numeração inicial de cada uma
+            placed = set()
+            starts, total = [], 0
+            for count, nets in pool.map(_scan_range, ranges):
+                starts.append(total)
+                total += count
+                placed.update(nets)
+            # 2ª rodada: texto de cada faixa, gravado na ordem
+            for text in pool.map(_emit_text, [(a, b, base) for (a, b), base in zip(ranges, starts)]):
+                out.write(text)
+    else:
+        _, nets = emit_range(state, 0, n, 0, out)
+        placed = set(nets)
 
-    return lines
\ No newline at end of file
+    write_unplaced_ports(out, netlist, inputs, outputs, placed, x_start, y_start)
@@ -0,0 +1,216 @@
+import os
+from array import array
+import func_cell_wr
+import netlist_model
+
+# Nets com fanout acima disso (clock, reset) não guiam o agrupamento,
+# senão puxariam o projeto inteiro para a mesma folha.
+CLUSTER_MAX_FANOUT = 32
+
+# Geometria dos símbolos gerados
+SYM_PIN_STEP = 20
+SYM_HALF_WIDTH = 130
+SYM_PIN_LEN = 20
+
+def partition_cells(cells, net_index, max_cells):
+    """
+    Agrupa as células por conectividade: uma busca em largura seguindo as
+    nets (ignorando as de fanout alto) gera uma ordem em que vizinhos ficam
+    próximos, e essa ordem é fatiada em folhas de no máximo 'max_cells'.
+    Retorna uma lista de arrays de índices de instância. O(V+E).
+    """
+    netlist = cells.netlist
+    offsets, pin_nets = netlist.pin_offsets, netlist.pin_nets
+    drivers = net_index.drivers
+
+    in_cells = bytearray(len(netlist))
+    for i in cells.indices:
+        in_cells[i] = 1
+    visited = bytearray(len(netlist))
+    net_done = bytearray(len(netlist.net_names))
+
+    order = array('I')
+    for seed in cells.indices:
+        if visited[seed]:
+            continue
+        visited[seed] = 1
+        order.append(seed)
+        head = len(order) - 1
+        while head < len(order):
+            i = order[head]
+            head += 1
+            for k in range(offsets[i], offsets[i + 1]):
+                net = pin_nets[k]
+                if net_done[net] or net_index.fanout(net) > CLUSTER_MAX_FANOUT:
+                    continue
+                net_done[net] = 1
+                neighbors = list(net_index.loads(net))
+                if drivers[net] >= 0:
+                    neighbors.append(drivers[net])
+                for j in neighbors:
+                    if in_cells[j] and not visited[j]:
+                        visited[j] = 1
+                        order.append(j)
+
+    return [order[k:k + max_cells] for k in range(0, len(order), max_cells)]
+
+def sheet_ports(netlist, sheets, net_index):
+    """
+    Portas de cada folha: nets usadas em mais de uma folha, ou que são portas
+    primárias. Saída se o driver da net está na folha, entrada caso contrário.
+    Retorna uma lista de (entradas, saídas), dicts nome -> largura ('') na
+    ordem de aparição.
+    """
+    offsets, pin_nets = netlist.pin_offsets, netlist.pin_nets
+    n_nets = len(netlist.net_names)
+
+    sheet_of_inst = array('i', [-1]) * len(netlist)
+    sheet_of_net = array('i', [-1]) * n_nets
+    crossing = bytearray(n_nets)
+    for s, indices in enumerate(sheets):
+        for i in indices:
+            sheet_of_inst[i] = s
+            for k in range(offsets[i], offsets[i + 1]):
+                net = pin_nets[k]
+                owner = sheet_of_net[net]
+                if owner < 0:
+                    sheet_of_net[net] = s
+                elif owner != s:
+                    crossing[net] = 1
+
+    # Portas primárias, inclusive cada bit de barramento ('d' -> 'd[0]', 'd[1]', ...)
+    port_names = set(netlist.inputs) | set(netlist.outputs)
+    for net, name in enumerate(netlist.net_names):
+        if name.split('[')[0] in port_names:
+            crossing[net] = 1
+    # Nets ligadas a instâncias de submódulos precisam chegar ao nível superior
+    for i in netlist.sub_indices:
+        for k in range(offsets[i], offsets[i + 1]):
+            crossing[pin_nets[k]] = 1
+
+    ports = []
+    for s, indices in enumerate(sheets):
+        ins, outs = {}, {}
+        for i in indices:
+            for k in range(offsets[i], offsets[i + 1]):
+                net = pin_nets[k]
+                if not crossing[net]:
+                    continue
+                name = netlist.net_names[net]
+                driver = net_index.driver(net)
+                if driver >= 0 and sheet_of_inst[driver] == s:
+                    outs[name] = ""
+                else:
+                    ins[name] = ""
+        # Net dirigida na folha e também lida nela: é só saída
+        for name in outs:
+            ins.pop(name, None)
+        ports.append((ins, outs))
+    return ports
+
+def _pin_offsets(n):
+    """Coordenadas y dos pinos de um lado do símbolo, centradas em 0."""
+    return [-(n - 1) * SYM_PIN_STEP // 2 + k * SYM_PIN_STEP for k in range(n)]
+
+def symbol_height(inputs, outputs):
+    return max(len(inputs), len(outputs), 1) * SYM_PIN_STEP + 20
+
+def generate_symbol(inputs, outputs):
+    """Símbolo subcircuit com as entradas à esquerda e as saídas à direita."""
+    half_h = symbol_height(inputs, outputs) // 2
+    w = SYM_HALF_WIDTH
+    x_pin = w + SYM_PIN_LEN
+    lines = [
+        "v {xschem version=3.4.8RC file_version=1.3}",
+        "G {}",
+        "K {type=subcircuit",
+        "format=\"@name @pinlist @symname\"",
+        "template=\"name=x1\"",
+        "}",
+        "V {}", "S {}", "E {}",
+        f"L 4 {-w} {-half_h} {w} {-half_h} {{}}",
+        f"L 4 {-w} {half_h} {w} {half_h} {{}}",
+        f"L 4 {-w} {-half_h} {-w} {half_h} {{}}",
+        f"L 4 {w} {-half_h} {w} {half_h} {{}}",
+    ]
+    for name, y in zip(inputs, _pin_offsets(len(inputs))):
+        lines.append(f"L 4 {-x_pin} {y} {-w} {y} {{}}")
+        lines.append(f"B 5 {-x_pin - 2.5} {y - 2.5} {-x_pin + 2.5} {y + 2.5} {{name={name} dir=in }}")
+        lines.append(f"T {{{name}}} {-w + 5} {y - 4} 0 0 0.2 0.2 {{}}")
+    for name, y in zip(outputs, _pin_offsets(len(outputs))):
+        lines.append(f"L 4 {w} {y} {x_pin} {y} {{}}")
+        lines.append(f"B 5 {x_pin - 2.5} {y - 2.5} {x_pin + 2.5} {y + 2.5} {{name={name} dir=out }}")
+        lines.append(f"T {{{name}}} {w - 5} {y - 4} 0 1 0.2 0.2 {{}}")
+    lines.append(f"T {{@symname}} {-w + 10} {-half_h - 20} 0 0 0.3 0.3 {{}}")
+    lines.append(f"T {{@name}} {w - 40} {-half_h - 20} 0 0 0.2 0.2 {{}}")
+    return lines
+
+def generate_instance(sym_name, inst_name, inputs, outputs, x, y, conns=None):
+    """
+    Instância de um símbolo gerado com um lab_pin em cada pino. Sem 'conns'
+    a net tem o nome do pino (folhas); com 'conns' (pino -> net), pinos sem
+    conexão ficam sem label (submódulos).
+    """
+    x_pin = SYM_HALF_WIDTH + SYM_PIN_LEN
+    lines = [f"C {{{sym_name}.sym}} {x} {y} 0 0 {{name={inst_name}}}"]
+    sides = ((inputs, -x_pin, 0), (outputs, x_pin, 1))
+    k = 0
+    for pins, dx, flip in sides:
+        for name, dy in zip(pins, _pin_offsets(len(pins))):
+            net = name if conns is None else conns.get(name)
+            if net is None:
+                continue
+            k += 1
+            lines.append(f"C {{lab_pin.sym}} {x + dx} {y + dy} 0 {flip} {{name=l_{inst_name}_{k} lab={net}}}")
+    return lines
+
+def write_lines(path, lines):
+    with open(path, 'w') as f_out:
+        f_out.write("\n".join(lines))
+
+def append_lines(out, lines):
+    """Continua um arquivo já iniciado: cada linha vai precedida de '\n'."""
+    for line in lines:
+        out.write("\n")
+        out.write(line)
+
+def write_sheets(out, netlist, output_file, header, max_cells, x_start, y_start, layout='levelized', jobs=1):
+    """
+    Divide o bloco funcional em folhas de até 'max_cells' células. Cada folha
+    vira um .sch + .sym ao lado de 'output_file'; as linhas do nível superior
+    (instâncias das folhas e portas primárias) são escritas em 'out'.
+    Retorna os arquivos gerados.
+    """
+    cells = netlist.func_cells
+    net_index = netlist_model.build_net_index(netlist, func_cell_wr.is_output_pin, cells.indices)
+    sheets = partition_cells(cells, net_index, max_cells)
+    ports = sheet_ports(netlist, sheets, net_index)
+
+    base = os.path.splitext(output_file)[0]
+    files = []
+    y = y_start
+    for s, (indices, (ins, outs)) in enumerate(zip(sheets, ports)):
+        sheet_name = f"{os.path.basename(base)}_s{s}"
+        sheet_base = f"{base}_s{s}"
+
+        sch_file, sym_file = sheet_base + ".sch", sheet_base + ".sym"
+        with open(sch_file, 'w') as f_out:
+            f_out.write("\n".join(header))
+            func_cell_wr.write_functional_block(
+                f_out, netlist_model.InstanceList(netlist, indices), ins, outs, 0, 0, layout=layout, jobs=jobs)
+        write_lines(sym_file, generate_symbol(ins, outs))
+        files += [sch_file, sym_file]
+
+        half_h = symbol_height(ins, outs) // 2
+        y -= half_h
+        append_lines(out, generate_instance(sheet_name, f"x{s}", ins, outs, x_start + 400, y))
+        y -= half_h + 100
+
+    # Portas primárias do nível superior, ligadas às folhas pelo nome
+    for k, (name, width) in enumerate(netlist.inputs.items()):
+        out.write(f"\nC {{ipin.sym}} {x_start} {y_start - k * 40} 0 0 {{name=in_{name} lab={name}{width}}}")
+    for k, (name, width) in enumerate(netlist.outputs.items()):
+        out.write(f"\nC {{opin.sym}} {x_start + 1000} {y_start - k * 40} 0 0 {{name=out_{name} lab={name}{width}}}")
+
+    print(f"{len(sheets)} folha(s) gerada(s) para o bloco funcional.")
+    return files
@@ -0,0 +1,213 @@
+import sys
+import json
+import time
+import cProfile
+import platform
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Instrumentação por etapa (--stats / --profile). Um Stats ativo registra,
+# para cada etapa, tempo de parede e de CPU, memória residente (o pico do
+# processo e quanto a etapa o elevou, também para os processos filhos do
+# --jobs), chamadas e itens processados, além de contadores e histogramas (tipos de
+# célula, células ausentes do CELL_DB). Sem Stats ativo, stage() e count()
+# não fazem nada, então os pontos de medição ficam no código sem custo.
+# Etapas do mesmo nome acumulam (ex.: 'functional' de cada submódulo).
+
+MB = 1024 * 1024
+
+_active = None
+
+def peak_rss_mb(children=False):
+    """
+    Pico de memória residente do processo até aqui (MB), ou None sem o
+    módulo resource. Com 'children', o maior pico entre os processos filhos
+    já terminados (ex.: os do pool do --jobs). O pico nunca diminui: para a
+    memória de uma etapa, veja o quanto ela o elevou ('rss_growth_mb').
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (MB if sys.platform == 'darwin' else 1024), 1)
+
+class Stats:
+    """
+    Medições de uma execução. Com 'trace_memory', o tracemalloc também mede
+    o pico de memória alocada pelo Python em cada etapa e os maiores pontos
+    de alocação (bem mais lento: só para investigar memória).
+    """
+    def __init__(self, trace_memory=False):
+        self.stages = {}
+        self.counters = {}
+        self.histograms = {}
+        self.info = {}
+        self.trace_memory = trace_memory
+        self._open = []
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _fold_peak(self):
+        # O pico do tracemalloc é global: ao abrir/fechar uma etapa aninhada,
+        # ele é repassado a todas as etapas abertas antes de ser zerado
+        peak = tracemalloc.get_traced_memory()[1] / MB
+        for record in self._open:
+            record['py_peak_mb'] = max(record.get('py_peak_mb', 0.0), peak)
+        tracemalloc.reset_peak()
+
+    @contextmanager
+    def stage(self, name, items=0):
+        record = self.stages.get(name)
+        if record is None:
+            record = self.stages[name] = {'wall_s': 0.0, 'cpu_s': 0.0, 'calls': 0, 'items': 0}
+        if self.trace_memory:
+            self._fold_peak()
+        self._open.append(record)
+        rss, child_rss = peak_rss_mb(), peak_rss_mb(children=True)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record['wall_s'] += time.perf_counter() - wall
+            record['cpu_s'] += time.process_time() - cpu
+            record['calls'] += 1
+            record['items'] += items
+            if self.trace_memory:
+                self._fold_peak()
+            self._open.pop()
+            record['peak_rss_mb'] = peak_rss_mb()
+            if rss is not None:
+                # Quanto a etapa elevou o pico do processo e o dos filhos
+                record['rss_growth_mb'] = round(record.get('rss_growth_mb', 0.0) + record['peak_rss_mb'] - rss, 1)
+                child_growth = peak_rss_mb(children=True) - child_rss
+                if child_growth or 'children_rss_growth_mb' in record:
+                    record['children_rss_growth_mb'] = round(record.get('children_rss_growth_mb', 0.0) + child_growth, 1)
+
+    def add_items(self, name, n):
+        self.stages.setdefault(name, {'wall_s': 0.0, 'cpu_s': 0.0, 'calls': 0, 'items': 0})['items'] += n
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def histogram(self, name, counts):
+        """Soma 'counts' ({chave: n}) ao histograma 'name'."""
+        hist = self.histograms.setdefault(name, {})
+        for key, n in counts.items():
+            hist[key] = hist.get(key, 0) + n
+
+    def as_dict(self):
+        stages = {}
+        for name, record in self.stages.items():
+            wall = record['wall_s']
+            stages[name] = dict(record, wall_s=round(wall, 4), cpu_s=round(record['cpu_s'], 4),
+                                items_per_s=round(record['items'] / wall) if wall > 0 and record['items'] else None)
+            if 'py_peak_mb' in record:
+                stages[name]['py_peak_mb'] = round(record['py_peak_mb'], 1)
+        histograms = {name: dict(sorted(hist.items(), key=lambda kv: (-kv[1], kv[0])))
+                      for name, hist in self.histograms.items()}
+        return {'info': self.info, 'stages': stages, 'counters': self.counters,
+                'histograms': histograms, 'peak_rss_mb': peak_rss_mb(),
+                'children_peak_rss_mb': peak_rss_mb(children=True)}
+
+    def dump(self, path):
+        """Grava o JSON em 'path' ('-' para a saída padrão)."""
+        text = json.dumps(self.as_dict(), indent=2, ensure_ascii=False)
+        if path == '-':
+            print(text)
+        else:
+            with open(path, 'w') as f:
+                f.write(text + "\n")
+            print(f"Estatísticas gravadas em '{path}'.")
+
+    def print_summary(self):
+        for name, record in self.as_dict()['stages'].items():
+            rate = f"{record['items_per_s']:>12,}/s" if record['items_per_s'] else " " * 14
+            print(f"  {name:<11} {record['wall_s']:8.3f} s  cpu {record['cpu_s']:8.3f} s  "
+                  f"{record['items']:>10,} itens {rate}  {memory_summary(record)}")
+
+def memory_summary(record):
+    """Memória de uma etapa de as_dict()['stages'] para os relatórios."""
+    text = f"pico {record.get('peak_rss_mb')} MB (+{record.get('rss_growth_mb', 0)})"
+    if record.get('children_rss_growth_mb'):
+        text += f", filhos +{record['children_rss_growth_mb']} MB"
+    if 'py_peak_mb' in record:
+        text += f", python {record['py_peak_mb']} MB"
+    return text
+
+def activate(stats):
+    """Torna 'stats' o destino de stage()/count() (None desativa)."""
+    global _active
+    _active = stats
+    if stats is not None:
+        stats.info.setdefault('python', platform.python_version())
+
+def active():
+    return _active
+
+@contextmanager
+def stage(name, items=0):
+    if _active is None:
+        yield None
+    else:
+        with _active.stage(name, items) as record:
+            yield record
+
+def add_items(name, n):
+    if _active is not None:
+        _active.add_items(name, n)
+
+def count(name, n=1):
+    if _active is not None:
+        _active.count(name, n)
+
+def histogram(name, counts):
+    if _active is not None:
+        _active.histogram(name, counts)
+
+def read_phases(items):
+    """
+    Repassa os itens de verilog_parser.iter_netlist separando a leitura em
+    'ports' (cabeçalhos e declarações) e 'instances', conforme o tipo do
+    item corrente; o tempo de quem consome entra na fase em que ele está.
+    """
+    stats = _active
+    phase, context = None, None
+    try:
+        for kind, item in items:
+            current = 'instances' if kind in ('instance', 'skipped') else 'ports'
+            if current != phase:
+                if context is not None:
+                    context.__exit__(None, None, None)
+                phase, context = current, stats.stage(current)
+                context.__enter__()
+            if kind == 'port' or kind == 'instance':
+                stats.add_items(phase, 1)
+            elif kind == 'skipped':
+                stats.add_items(phase, item[1])
+            yield kind, item
+    finally:
+        if context is not None:
+            context.__exit__(None, None, None)
+
+def top_allocations(limit=10):
+    """Maiores pontos de alocação ainda vivos, segundo o tracemalloc."""
+    if not tracemalloc.is_tracing():
+        return []
+    stats = tracemalloc.take_snapshot().statistics('lineno')[:limit]
+    return [{'where': str(s.traceback), 'size_mb': round(s.size / MB, 2), 'blocks': s.count} for s in stats]
+
+@contextmanager
+def profiled(path):
+    """cProfile em volta do bloco; o resultado vai para 'path' (leia com python -m pstats)."""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        print(f"Perfil gravado em '{path}' (python -m pstats {path}).")
@@ -1,9 +1,24 @@
-import re
 import sys
+import argparse
 import os
+from array import array
 import shutil
+import contextlib
+import compressed_io
+import conv_cache
 import ocup
+import eco as eco_mod
 import func_cell_wr
+import netlist_model
+import netlist_store
+import hier_sheets
+import instrument
+import placement
+import query
+import rename_netlist
+import verilog_parser
+import sky130_db
+import sym_indexer
 
 def move_file_to_parent(filename):
     """Move o arquivo gerado para o diretório pai (../)"""
@@ -14,68 +29,456 @@ def move_file_to_parent(filename):
     except Exception as e:
         print(f"Erro ao mover o arquivo: {e}")
 
-def run_converter(input_file):
-    output_file = "rn_wrapper.sch"
-    
-    if not os.path.exists(input_file):
-        print(f"Erro: {input_file} não encontrado.")
-        return
+def build_design(items, policy=None):
+    """
+    Monta um netlist_model.Design com um Netlist por módulo (portas e
+    instâncias de ocupação x funcionais x submódulos) a partir dos registros
+    de verilog_parser.iter_netlist/iter_netlist_file.
+    Com uma 'policy' (ocup.PhysicalCellPolicy), células físicas descartadas ou
+    agregadas nem chegam a virar dicionários: só a contagem por tipo é mantida.
+    """
+    design = netlist_model.Design()
+    netlist = None
+    dropped = {}
 
-    inputs, outputs = {}, {}
-    occ_cells, func_cells = [], []
+    # Leitura em passada única: portas e instâncias vêm direto do arquivo
+    if instrument.active() is not None:
+        items = instrument.read_phases(items)
+    for kind, item in items:
+        if kind == 'module':
+            netlist = design.add_module(item)
+            continue
+        if netlist is None:
+            # Conteúdo fora de qualquer 'module'
+            netlist = design.add_module("unknown")
 
-    try:
-        with open(input_file, 'r') as f:
-            content = f.read()
-
-        # Extração de Portas
-        re_port = re.compile(r"^\s*(input|output)\s+(\[[^\]]+\]\s+)?(\w+)", re.MULTILINE)
-        for direction, _, name in re_port.findall(content):
-            if direction == "input": inputs[name] = True
-            else: outputs[name] = True
-
-        # Extração de Instâncias
-        reserved = ['module', 'endmodule', 'input', 'output', 'wire', 'assign', 'always']
-        re_inst = re.compile(r"(\w+)\s+(\w+)\s*\((.*?)\);", re.DOTALL)
-        
-        for cell_type, inst_name, pins_raw in re_inst.findall(content):
-            if cell_type in reserved: continue
-            
-            pin_conns = re.findall(r"\.(\w+)\(([^)]+)\)", pins_raw)
-            data = {'type': cell_type, 'name': inst_name, 'conns': pin_conns}
-            
-            if any(x in cell_type.lower() for x in ['decap', 'fill', 'tap']):
-                occ_cells.append(data)
+        if kind == 'port':
+            direction, name, width = item
+            if direction == "input": netlist.inputs[name] = width
+            elif direction == "output": netlist.outputs[name] = width
+
+        elif kind == 'instance':
+            cell_type = item['type']
+            netlist.add_instance(cell_type, item['name'], item['conns'], ocup.physical_kind(cell_type) is not None)
+
+        elif kind == 'skipped':
+            cell_type, count = item
+            target = netlist.lumped if policy.action(cell_type) == 'lump' else dropped
+            target[cell_type] = target.get(cell_type, 0) + count
+
+        elif kind == 'endmodule':
+            netlist = None
+
+    report_dropped(dropped)
+
+    if not design.modules:
+        design.add_module("unknown")
+    design.finalize()
+    return design
+
+def report_dropped(dropped):
+    if dropped:
+        summary = ", ".join(f"{t}={n}" for t, n in dropped.items())
+        print(f"Células físicas descartadas: {summary}")
+
+def apply_physical_policy(design, policy):
+    """
+    Aplica 'policy' às células de ocupação de um design já montado (ex.:
+    carregado de um .nlb), com o mesmo resultado de aplicá-la na leitura.
+    """
+    dropped = {}
+    for netlist in design.modules.values():
+        inst_type, cell_types = netlist.inst_type, netlist.cell_types
+        kept = array('I')
+        for i in netlist.occ_indices:
+            cell_type = cell_types[inst_type[i]]
+            if policy(cell_type):
+                kept.append(i)
             else:
-                func_cells.append(data)
+                target = netlist.lumped if policy.action(cell_type) == 'lump' else dropped
+                target[cell_type] = target.get(cell_type, 0) + 1
+        netlist.occ_indices = kept
+    report_dropped(dropped)
+
+def collect_design(lines, policy=None):
+    """Design a partir de linhas de texto (handle do arquivo ou gerador)."""
+    return build_design(verilog_parser.iter_netlist(lines, policy), policy)
+
+def collect_netlist(lines, policy=None):
+    """Netlist do módulo de topo (os demais ficam acessíveis por netlist.design)."""
+    return collect_design(lines, policy).top
+
+# Geometria do esquemático: matriz de ocupação à esquerda, bloco funcional depois dela
+X_MATRIZ_BASE = -1200
+OCC_Y_STEP = 100
+OCC_X_STEP = 200
+OCC_MAX_ROWS = 10
+FUNC_Y_START = -500
+
+SCH_HEADER = ["v {xschem version=3.4.8RC file_version=1.3}", "G {}", "K {}", "V {}", "S {}", "F {}", "E {}", ""]
 
-        # Montagem do Arquivo
-        sch_lines = ["v {xschem version=3.4.8RC file_version=1.3}", "G {}", "K {}", "V {}", "S {}", "F {}", "E {}", ""]
-        X_MATRIZ_BASE = -1200
+def convert_submodules(out, netlist, output_file, module_cache, x, y, **options):
+    """
+    Escreve em 'out' as instâncias dos submódulos de 'netlist'. Cada módulo
+    distinto é convertido uma única vez (.sch + .sym ao lado de 'output_file')
+    e o resultado é reutilizado em todas as instanciações; 'module_cache'
+    guarda os pinos (entradas, saídas) dos módulos já convertidos.
+    Retorna os arquivos gerados.
+    """
+    files = []
+    out_dir = os.path.dirname(output_file)
+
+    for inst in netlist.sub_cells:
+        module = inst.type
+        if module not in module_cache:
+            sub = netlist.design.modules[module]
+            ins = [name + width for name, width in sub.inputs.items()]
+            outs = [name + width for name, width in sub.outputs.items()]
+            module_cache[module] = (ins, outs)
+
+            sub_base = os.path.join(out_dir, module)
+            # .sch e .sym do submódulo nunca são comprimidos: o pai referencia
+            # <módulo>.sym, e o xschem desce para <módulo>.sch
+            files += write_schematic(sub_base + ".sch", sub, module_cache=module_cache, **options)
+            sym_file = sub_base + ".sym"
+            hier_sheets.write_lines(sym_file, hier_sheets.generate_symbol(ins, outs))
+            files.append(sym_file)
+
+        ins, outs = module_cache[module]
+        conns = dict(inst.conns)
+        # Pino do símbolo 'd[3:0]' corresponde à porta 'd' da instância
+        pin_conns = {pin: conns[pin.split('[')[0]] for pin in ins + outs if pin.split('[')[0] in conns}
+
+        half_h = hier_sheets.symbol_height(ins, outs) // 2
+        y += half_h
+        hier_sheets.append_lines(out, hier_sheets.generate_instance(module, inst.name, ins, outs, x, y, pin_conns))
+        y += half_h + 100
+
+    return files
+
+def write_schematic(output_file, netlist, occ_mode='matrix', layout='levelized', sheet_cells=None, module_cache=None, jobs=1,
+                    eco=False, compress=None):
+    """
+    Gera o esquemático e retorna a lista de arquivos escritos. Com
+    'sheet_cells', o bloco funcional é dividido em folhas hierárquicas
+    (.sch + .sym) instanciadas no esquemático principal. Instâncias de
+    outros módulos da netlist viram símbolos de subcircuito, convertidos
+    uma vez por módulo (ver convert_submodules).
+    Todas as seções são escritas em streaming, direto no arquivo; com
+    jobs > 1, as células de blocos grandes são geradas por um pool de processos.
+    Com 'eco', o bloco funcional é regenerado de forma incremental a partir
+    do sidecar <saída>.eco da conversão anterior (ver eco.py).
+    Com 'compress' ('gz', 'zst'), só este esquemático é gravado comprimido,
+    em streaming, com a extensão do codec somada ao nome (saida.sch.gz);
+    folhas e submódulos (.sch + .sym) ficam sem compressão, pois o xschem
+    os encontra pelo nome do símbolo ao descer na hierarquia.
+    """
+    sch_file = compressed_io.output_name(output_file, compress)
+    files = [sch_file]
+
+    # Largura do módulo de ocupação a partir das contagens: o bloco funcional
+    # começa logo depois, sem precisar gerar a ocupação antes
+    num_cols = ocup.occupation_columns(len(netlist.occ_indices), OCC_MAX_ROWS, occ_mode, netlist.lumped)
+    x_func_start = X_MATRIZ_BASE + (max(1, num_cols) * OCC_X_STEP) + 400
+
+    # Salva localmente primeiro
+    with compressed_io.open_text(sch_file, 'w') as f_out:
+        f_out.write("\n".join(SCH_HEADER))
 
         # Módulo de Ocupação
-        occ_lines, num_cols = ocup.generate_occupation_matrix(occ_cells, X_MATRIZ_BASE, 100, 200, 10)
-        sch_lines.extend(occ_lines)
+        with instrument.stage('occupation', len(netlist.occ_indices)):
+            ocup.write_occupation(f_out, netlist.occ_cells, X_MATRIZ_BASE, OCC_Y_STEP, OCC_X_STEP, OCC_MAX_ROWS,
+                                  occ_mode, netlist.lumped, jobs)
 
         # Módulo Funcional
-        x_func_start = X_MATRIZ_BASE + (max(1, num_cols) * 200) + 400
-        func_lines = func_cell_wr.generate_functional_block(func_cells, inputs, outputs, x_func_start, -500)
-        sch_lines.extend(func_lines)
+        with instrument.stage('functional', len(netlist.func_indices)):
+            if eco and not sheet_cells:
+                eco_mod.write_functional_block_eco(f_out, netlist.func_cells, netlist.inputs, netlist.outputs, x_func_start,
+                                                   FUNC_Y_START, eco_mod.sidecar_path(output_file), layout)
+            elif sheet_cells:
+                files += hier_sheets.write_sheets(f_out, netlist, output_file, SCH_HEADER, sheet_cells, x_func_start, FUNC_Y_START,
+                                                  layout, jobs)
+            else:
+                func_cell_wr.write_functional_block(f_out, netlist.func_cells, netlist.inputs, netlist.outputs, x_func_start,
+                                                    FUNC_Y_START, layout=layout, jobs=jobs)
+
+        # Submódulos, em uma coluna abaixo do bloco funcional
+        if len(netlist.sub_indices):
+            if module_cache is None:
+                module_cache = {}
+            files += convert_submodules(f_out, netlist, output_file, module_cache, x_func_start + 150, 200,
+                                        occ_mode=occ_mode, layout=layout, sheet_cells=sheet_cells, jobs=jobs, eco=eco)
+
+    print(f"Esquemático '{sch_file}' gerado.")
+    return files
+
+DEFAULT_OUTPUT = "rn_wrapper.sch"
+
+def load_libraries(rules_file=None, sym_libs=()):
+    """Regras extras de renomeação e bibliotecas de símbolos, antes de qualquer conversão."""
+    if rules_file:
+        rename_netlist.load_rename_rules(rules_file)
+    for sym_dir in sym_libs:
+        sky130_db.CELL_DB.add_cells(*sym_indexer.load_symbol_library(sym_dir))
 
-        # Salva localmente primeiro
-        with open(output_file, 'w') as f_out:
-            f_out.write("\n".join(sch_lines))
-        
-        print(f"Esquemático '{output_file}' gerado.")
+def read_netlist(input_file, fused=False, intermediate_file=None, policy=None):
+    """
+    Netlist de topo de 'input_file'. Com 'fused', lê a netlist original
+    pós-síntese e aplica a renomeação do rename_netlist em streaming, sem
+    passar pelo disco; o rn_wrapper.v intermediário só é escrito se
+    'intermediate_file' for dado. Entradas .gz/.zst são descomprimidas em
+    streaming (ver compressed_io). Um design exportado (.nlb, ver
+    netlist_store) é carregado direto, sem tokenizar o Verilog.
+    """
+    if netlist_store.is_design_file(input_file):
+        design = netlist_store.load_design(input_file)
+        if policy is not None:
+            apply_physical_policy(design, policy)
+        return design.top
 
-        # Move para o diretório pai
-        move_file_to_parent(output_file)
+    if not fused:
+        if compressed_io.is_compressed(input_file):
+            with compressed_io.open_binary(input_file) as f:
+                return build_design(verilog_parser.iter_netlist_stream(f, policy), policy).top
+        # Arquivo mapeado em memória e lido como bytes (ver verilog_parser.iter_netlist_file)
+        return build_design(verilog_parser.iter_netlist_file(input_file, policy), policy).top
+
+    info = rename_netlist.new_netlist_info()
+    writer = rename_netlist.IntermediateWriter(intermediate_file) if intermediate_file else None
+
+    with compressed_io.open_text(input_file) as f:
+        netlist = collect_netlist(rename_netlist.iter_clean_lines(f, info, writer), policy)
+
+    if writer:
+        writer.finish(info)
+        print(f"Netlist intermediária '{intermediate_file}' gerada.")
+    return netlist
+
+def record_netlist_stats(netlist):
+    """Contagens, histogramas de tipos de célula e ausências do CELL_DB da netlist lida (--stats)."""
+    for module in netlist.design.modules.values():
+        for group, indices in (('functional', module.func_indices), ('physical', module.occ_indices),
+                               ('submodules', module.sub_indices)):
+            hist = module.type_counts(indices)
+            instrument.histogram(f'{group}_cells', hist)
+            instrument.count(f'{group}_instances', len(indices))
+            if group == 'functional':
+                misses = {t: n for t, n in hist.items() if t not in sky130_db.CELL_DB}
+                instrument.histogram('db_misses', misses)
+                instrument.count('db_miss_instances', sum(misses.values()))
+        instrument.histogram('physical_cells', module.lumped)
+        instrument.count('modules')
+        instrument.count('ports', len(module.inputs) + len(module.outputs))
+        instrument.count('nets', len(module.net_names))
+        instrument.add_items('read', len(module))
+
+def conversion_settings(fused=False, policy=None, **options):
+    """Tudo, além da netlist, que influencia a saída: entra na chave do cache de conversões."""
+    return {
+        'fused': fused,
+        'rules': rename_netlist.RENAME_RULES if fused else None,
+        'policy': policy.rules if policy else None,
+        'options': {k: v for k, v in options.items() if k not in ('jobs', 'eco')},
+        'geometry': (X_MATRIZ_BASE, OCC_Y_STEP, OCC_X_STEP, OCC_MAX_ROWS, FUNC_Y_START,
+                     placement.COL_STEP, placement.ROW_STEP),
+        'cell_db': sky130_db.CELL_DB.fingerprint(),
+    }
+
+def convert_file(input_file, output_file, fused=False, intermediate_file=None, policy=None, cache=None, export_file=None,
+                 strict_cells=False, **options):
+    """
+    Converte um arquivo e retorna os arquivos gerados; erros sobem para quem
+    chamou. Com 'cache' (conv_cache.ConversionCache), uma conversão idêntica
+    já feita é só copiada do cache (não vale para --eco, --intermediate e
+    'export_file', que dependem de estado fora da saída). Com 'export_file',
+    o design lido também é gravado no formato binário do netlist_store.
+    Com 'strict_cells', a conversão falha logo após a leitura se houver
+    células ausentes do CELL_DB, antes de gerar qualquer arquivo.
+    """
+    out_dir = os.path.dirname(output_file)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+
+    key = None
+    if cache is not None and not options.get('eco') and not intermediate_file and not export_file and not strict_cells:
+        key = conv_cache.conversion_key(input_file, os.path.basename(output_file),
+                                        conversion_settings(fused, policy, **options))
+        with instrument.stage('cache'):
+            files = cache.fetch(key, out_dir)
+        if files is not None:
+            instrument.count('cache_hits')
+            print(f"Esquemático '{files[0]}' recuperado do cache.")
+            return files
+
+    with instrument.stage('read'):
+        netlist = read_netlist(input_file, fused, intermediate_file, policy)
+    if instrument.active() is not None:
+        record_netlist_stats(netlist)
+    # Células ausentes do CELL_DB: um aviso por tipo para o design inteiro
+    # (e não por bloco, folha ou submódulo), ou erro com 'strict_cells'
+    missing = query.missing_cells(netlist.design)
+    if missing and strict_cells:
+        summary = ", ".join(f"{t} ({n})" for t, n in sorted(missing.items()))
+        raise ValueError(f"células ausentes do CELL_DB: {summary}")
+    for cell_type in sorted(missing):
+        print(f"Aviso: célula '{cell_type}' ausente do CELL_DB; pinos na posição padrão.")
+    if export_file:
+        netlist_store.save_design(export_file, netlist.design, input_file, policy)
+        print(f"Design '{export_file}' exportado.")
+
+    # A escrita é em streaming: 'write' inclui 'occupation' e 'functional'
+    with instrument.stage('write'):
+        files = write_schematic(output_file, netlist, **options)
+    if instrument.active() is not None:
+        instrument.add_items('write', sum(os.path.getsize(f) for f in files))
+
+    if key is not None:
+        with instrument.stage('cache'):
+            cache.store(key, files)
+    return files
+
+def _run_single(input_file, output_file, **kwargs):
+    """Arquivos gerados, ou None se a conversão falhou (o erro é mostrado e vai para --stats)."""
+    if not os.path.exists(input_file):
+        print(f"Erro: {input_file} não encontrado.")
+        return None
+
+    try:
+        files = convert_file(input_file, output_file or DEFAULT_OUTPUT, **kwargs)
+
+        # Sem saída explícita: move para o diretório pai, como sempre foi
+        if output_file is None:
+            for filename in files:
+                move_file_to_parent(filename)
+        return files
 
     except Exception as e:
         print(f"Erro no processamento: {e}")
+        if instrument.active() is not None:
+            instrument.active().info['error'] = f"{type(e).__name__}: {e}"
+        return None
+
+def run_converter(input_file, policy=None, output_file=None, **options):
+    """
+    Converte uma netlist já normalizada; 'options' vão para write_schematic.
+    Sem 'output_file', grava rn_wrapper.sch e o move para o diretório pai.
+    Retorna os arquivos gerados, ou None em caso de erro.
+    """
+    return _run_single(input_file, output_file, policy=policy, **options)
+
+def run_pipeline(input_file, intermediate_file=None, policy=None, output_file=None, **options):
+    """
+    Pipeline fundido: lê a netlist original pós-síntese, aplica a renomeação
+    do rename_netlist em streaming e alimenta os geradores sem passar pelo disco.
+    O rn_wrapper.v intermediário só é escrito se 'intermediate_file' for dado.
+    """
+    return _run_single(input_file, output_file, fused=True, intermediate_file=intermediate_file, policy=policy, **options)
+
+def positive_int(text):
+    """Tipo do argparse para contagens que precisam ser >= 1."""
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"precisa ser um inteiro positivo: {text}")
+    return value
+
+def add_conversion_args(parser):
+    """Opções de conversão comuns ao main.py e ao batch.py."""
+    parser.add_argument("--fused", action="store_true",
+                        help="lê a netlist original e aplica a renomeação em streaming, sem rn_wrapper.v")
+    parser.add_argument("--occ-mode", choices=ocup.OCC_MODES, default="matrix",
+                        help="matrix: uma instância por célula de ocupação; array: uma instância vetorial por tipo")
+    parser.add_argument("--layout", choices=placement.LAYOUTS, default="levelized",
+                        help="levelized: grade por nível lógico; column: coluna única")
+    parser.add_argument("--sheet-cells", metavar="N", type=positive_int,
+                        help="divide o bloco funcional em folhas hierárquicas de até N células")
+    parser.add_argument("--jobs", metavar="N", type=int, default=1,
+                        help="gera as células de blocos grandes em N processos (saída idêntica à serial)")
+    parser.add_argument("--eco", action="store_true",
+                        help="reconversão incremental: só regenera as instâncias alteradas desde a última (sidecar .eco)")
+    parser.add_argument("--compress", choices=compressed_io.CODECS,
+                        help="grava o esquemático de topo comprimido (saida.sch.gz / .zst); folhas e submódulos ficam sem compressão")
+    parser.add_argument("--physical", metavar="REGRAS", type=ocup.parse_physical_policy,
+                        help="política para células físicas já na leitura, ex.: fill=drop,tap=drop,decap=lump")
+    parser.add_argument("--sym-lib", metavar="DIR", action="append", default=[],
+                        help="diretório de .sym do xschem indexado para completar o CELL_DB (pode repetir)")
+    parser.add_argument("--rules", metavar="ARQUIVO",
+                        help="regras extras de renomeação ('padrão -> substituição'), ex.: células específicas do PDK")
+    parser.add_argument("--strict-cells", action="store_true",
+                        help="falha logo após a leitura se houver células ausentes do CELL_DB")
+    parser.add_argument("--cache", action="store_true",
+                        help="reaproveita conversões idênticas já feitas (mesma netlist, CELL_DB e opções)")
+    parser.add_argument("--cache-dir", metavar="DIR", default=conv_cache.CACHE_DIR,
+                        help="diretório do cache de conversões")
+    parser.add_argument("--cache-max-mb", metavar="MB", type=int, default=conv_cache.DEFAULT_MAX_MB,
+                        help="tamanho máximo do cache; as entradas usadas há mais tempo saem primeiro")
+    parser.add_argument("--cache-clear", action="store_true", help="esvazia o cache de conversões antes de rodar")
+
+def conversion_cache(args):
+    """ConversionCache pedido na linha de comando (None sem --cache); --cache-clear o esvazia."""
+    if not (args.cache or args.cache_clear):
+        return None
+    cache = conv_cache.ConversionCache(args.cache_dir, args.cache_max_mb)
+    if args.cache_clear:
+        cache.clear()
+    return cache if args.cache else None
+
+def conversion_options(args):
+    """Opções de convert_file/write_schematic a partir dos argumentos de add_conversion_args."""
+    return dict(occ_mode=args.occ_mode, layout=args.layout, sheet_cells=args.sheet_cells, jobs=args.jobs, eco=args.eco,
+                compress=args.compress, strict_cells=args.strict_cells)
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Conversor de netlist sky130 pós-síntese para esquemático xschem.")
+    parser.add_argument("input_file", help="netlist .v (já normalizada, ou a original com --fused)")
+    parser.add_argument("-o", "--output", metavar="ARQUIVO.sch",
+                        help="esquemático de saída (padrão: rn_wrapper.sch, movido para ..)")
+    parser.add_argument("--intermediate", metavar="ARQUIVO",
+                        help="com --fused, grava também a netlist normalizada intermediária")
+    parser.add_argument("--export-design", metavar="ARQUIVO.nlb",
+                        help="grava também o design lido em formato binário, para recarregar sem reler o Verilog")
+    parser.add_argument("--stats", metavar="ARQUIVO.json",
+                        help="grava tempo, CPU, memória e contagens por etapa em JSON ('-' para a saída padrão; as mensagens vão para stderr)")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="com --stats, mede também o pico de memória Python por etapa (mais lento)")
+    parser.add_argument("--profile", metavar="ARQUIVO.prof", help="roda a conversão sob o cProfile e grava o perfil")
+    add_conversion_args(parser)
+    args = parser.parse_args(argv)
+    if args.tracemalloc and not args.stats:
+        parser.error("--tracemalloc precisa de --stats (o pico por etapa vai para o JSON)")
+    return args
 
 if __name__ == "__main__":
-    if len(sys.argv) == 2:
-        run_converter(sys.argv[1])
+    if len(sys.argv) < 2:
+        print("Uso: python main.py <arquivo.v | design.nlb> [--fused [--intermediate rn_wrapper.v]] [-o saida.sch]")
+        print("     python main.py inspect <arquivo.v | design.nlb> [--types] [--net NET] [--json]")
+    elif sys.argv[1] == "inspect":
+        sys.exit(query.run_inspect(sys.argv[2:]))
     else:
-        print("Uso: python main.py <arquivo.v>")
\ No newline at end of file
+        args = parse_args(sys.argv[1:])
+        stats = instrument.Stats(args.tracemalloc) if args.stats else None
+        instrument.activate(stats)
+
+        # Com --stats -, a saída padrão fica só para o JSON: as mensagens da conversão vão para stderr
+        with contextlib.redirect_stdout(sys.stderr) if args.stats == '-' else contextlib.nullcontext():
+            load_libraries(args.rules, args.sym_lib)
+            options = conversion_options(args)
+            if stats is not None:
+                stats.info.update(input=args.input_file, fused=args.fused, options=dict(options))
+            options['cache'] = conversion_cache(args)
+            options['export_file'] = args.export_design
+
+            with instrument.profiled(args.profile) if args.profile else contextlib.nullcontext():
+                if args.fused:
+                    files = run_pipeline(args.input_file, args.intermediate, args.physical, args.output, **options)
+                else:
+                    files = run_converter(args.input_file, args.physical, args.output, **options)
+
+        if stats is not None:
+            stats.info['status'] = 'ok' if files is not None else 'erro'
+            if args.tracemalloc:
+                stats.info['top_allocations'] = instrument.top_allocations()
+            if args.stats != '-':
+                stats.print_summary()
+            stats.dump(args.stats)
+        if files is None:
+            sys.exit(1)
@@ -0,0 +1,255 @@
+from array import array
+
+
+class Instance:
+    """
+    Visão leve de uma instância do Netlist. Não guarda dados próprios:
+    tipo, nome e conexões são lidos das tabelas do netlist sob demanda.
+    """
+    __slots__ = ('netlist', 'index')
+
+    def __init__(self, netlist, index):
+        self.netlist = netlist
+        self.index = index
+
+    @property
+    def type(self):
+        nl = self.netlist
+        return nl.cell_types[nl.inst_type[self.index]]
+
+    @property
+    def name(self):
+        return self.netlist.inst_names[self.index]
+
+    @property
+    def conns(self):
+        """Lista de (pino, net), na ordem da netlist."""
+        nl = self.netlist
+        start, end = nl.pin_offsets[self.index], nl.pin_offsets[self.index + 1]
+        pin_names, net_names = nl.pin_names, nl.net_names
+        return [(pin_names[nl.pin_ids[k]], net_names[nl.pin_nets[k]]) for k in range(start, end)]
+
+
+class InstanceList:
+    """Sequência de instâncias (funcionais ou de ocupação) indexada por um array de índices."""
+    __slots__ = ('netlist', 'indices')
+
+    def __init__(self, netlist, indices):
+        self.netlist = netlist
+        self.indices = indices
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return InstanceList(self.netlist, self.indices[i])
+        return Instance(self.netlist, self.indices[i])
+
+    def __iter__(self):
+        netlist = self.netlist
+        for index in self.indices:
+            yield Instance(netlist, index)
+
+
+class Netlist:
+    """
+    Modelo compacto da netlist: nomes de nets, pinos e tipos de célula são
+    internados (um id inteiro por nome distinto) e a conectividade fica em
+    arrays no estilo CSR: as conexões da instância i ocupam as posições
+    pin_offsets[i]..pin_offsets[i+1] de pin_ids/pin_nets.
+    Assim o consumo de memória acompanha a conectividade, e não o overhead
+    de um dicionário e de uma lista de tuplas por instância.
+    """
+    def __init__(self, module="unknown", design=None):
+        self.module = module
+        self.design = design
+        # Portas: nome -> largura ('' ou '[msb:lsb]')
+        self.inputs = {}
+        self.outputs = {}
+        self.lumped = {}
+
+        self.net_names, self.net_ids = [], {}
+        self.pin_names, self.pin_ids_by_name = [], {}
+        self.cell_types, self.type_ids = [], {}
+
+        self.inst_names = []
+        self.inst_type = array('I')
+        self.pin_offsets = array('L', [0])
+        self.pin_ids = array('I')
+        self.pin_nets = array('I')
+
+        self.func_indices = array('I')
+        self.occ_indices = array('I')
+        # Instâncias de outros módulos da própria netlist (hierarquia)
+        self.sub_indices = array('I')
+
+    @staticmethod
+    def _intern(name, names, ids):
+        idx = ids.get(name)
+        if idx is None:
+            idx = ids[name] = len(names)
+            names.append(name)
+        return idx
+
+    def net_id(self, name):
+        return self._intern(name, self.net_names, self.net_ids)
+
+    def type_id(self, cell_type):
+        return self._intern(cell_type, self.cell_types, self.type_ids)
+
+    def add_instance(self, cell_type, name, conns, physical=False):
+        """Adiciona uma instância; 'physical' a coloca no grupo de ocupação."""
+        index = len(self.inst_names)
+        self.inst_names.append(name)
+        self.inst_type.append(self.type_id(cell_type))
+
+        pin_names, pin_ids_by_name = self.pin_names, self.pin_ids_by_name
+        net_names, net_ids = self.net_names, self.net_ids
+        for pin, net in conns:
+            self.pin_ids.append(self._intern(pin, pin_names, pin_ids_by_name))
+            self.pin_nets.append(self._intern(net, net_names, net_ids))
+        self.pin_offsets.append(len(self.pin_ids))
+
+        (self.occ_indices if physical else self.func_indices).append(index)
+        return index
+
+    def __len__(self):
+        return len(self.inst_names)
+
+    def type_counts(self, indices=None):
+        """Tipo de célula -> número de instâncias entre 'indices' (padrão: todas)."""
+        inst_type = self.inst_type
+        counts = [0] * len(self.cell_types)
+        for i in (range(len(inst_type)) if indices is None else indices):
+            counts[inst_type[i]] += 1
+        return {self.cell_types[t]: n for t, n in enumerate(counts) if n}
+
+    def instance(self, index):
+        return Instance(self, index)
+
+    @property
+    def func_cells(self):
+        return InstanceList(self, self.func_indices)
+
+    @property
+    def occ_cells(self):
+        return InstanceList(self, self.occ_indices)
+
+    @property
+    def sub_cells(self):
+        return InstanceList(self, self.sub_indices)
+
+    def split_submodules(self, module_names):
+        """Move para sub_indices as instâncias cujo tipo é um módulo da netlist."""
+        if not any(t in module_names for t in self.cell_types):
+            return
+        inst_type, cell_types = self.inst_type, self.cell_types
+        func = array('I')
+        for i in self.func_indices:
+            (self.sub_indices if cell_types[inst_type[i]] in module_names else func).append(i)
+        self.func_indices = func
+
+
+class Design:
+    """
+    Conjunto de módulos de uma netlist hierárquica. Cada módulo é lido uma
+    única vez em seu próprio Netlist; o topo é o módulo que não é instanciado
+    por nenhum outro (o último definido, se houver mais de um).
+    """
+    def __init__(self):
+        self.modules = {}
+
+    def add_module(self, name):
+        netlist = self.modules[name] = Netlist(name, self)
+        return netlist
+
+    def finalize(self):
+        names = set(self.modules)
+        for netlist in self.modules.values():
+            netlist.split_submodules(names)
+
+    @property
+    def top(self):
+        instantiated = set()
+        for netlist in self.modules.values():
+            instantiated.update(netlist.cell_types[netlist.inst_type[i]] for i in netlist.sub_indices)
+        candidates = [name for name in self.modules if name not in instantiated] or list(self.modules)
+        return self.modules[candidates[-1]]
+
+
+class NetIndex:
+    """
+    Índice net -> (driver, cargas) sobre as instâncias funcionais.
+    drivers[net] é o índice da instância que dirige a net (-1 se nenhuma);
+    as cargas ficam em CSR: load_insts[load_offsets[net]:load_offsets[net+1]].
+    """
+    def __init__(self, drivers, load_offsets, load_insts):
+        self.drivers = drivers
+        self.load_offsets = load_offsets
+        self.load_insts = load_insts
+
+    def driver(self, net_id):
+        return self.drivers[net_id]
+
+    def loads(self, net_id):
+        return self.load_insts[self.load_offsets[net_id]:self.load_offsets[net_id + 1]]
+
+    def fanout(self, net_id):
+        return self.load_offsets[net_id + 1] - self.load_offsets[net_id]
+
+    def first_load(self, net_id):
+        start = self.load_offsets[net_id]
+        return self.load_insts[start] if start < self.load_offsets[net_id + 1] else -1
+
+
+def build_net_index(netlist, is_output_pin, indices=None):
+    """
+    Monta o NetIndex em O(pinos). 'is_output_pin(tipo, pino)' decide a
+    direção; a resposta é memorizada por (tipo, pino). 'indices' restringe
+    o índice a um subconjunto das instâncias (padrão: todas as funcionais).
+    """
+    if indices is None:
+        indices = netlist.func_indices
+    n_nets = len(netlist.net_names)
+    drivers = array('i', [-1]) * n_nets
+    load_counts = array('L', [0]) * (n_nets + 1)
+    direction = {}
+
+    offsets, pin_ids, pin_nets, inst_type = netlist.pin_offsets, netlist.pin_ids, netlist.pin_nets, netlist.inst_type
+
+    def pin_is_output(type_id, pin_id):
+        key = (type_id, pin_id)
+        out = direction.get(key)
+        if out is None:
+            out = direction[key] = bool(is_output_pin(netlist.cell_types[type_id], netlist.pin_names[pin_id]))
+        return out
+
+    # 1ª passada: drivers e contagem de cargas por net
+    for i in indices:
+        type_id = inst_type[i]
+        for k in range(offsets[i], offsets[i + 1]):
+            net = pin_nets[k]
+            if pin_is_output(type_id, pin_ids[k]):
+                if drivers[net] < 0:
+                    drivers[net] = i
+            else:
+                load_counts[net + 1] += 1
+
+    # Soma de prefixos -> offsets
+    for net in range(n_nets):
+        load_counts[net + 1] += load_counts[net]
+    load_offsets = load_counts
+
+    # 2ª passada: preenche as cargas na ordem das instâncias
+    load_insts = array('I', [0]) * load_offsets[n_nets]
+    fill = array('L', load_offsets[:n_nets])
+    for i in indices:
+        type_id = inst_type[i]
+        for k in range(offsets[i], offsets[i + 1]):
+            if not pin_is_output(type_id, pin_ids[k]):
+                net = pin_nets[k]
+                load_insts[fill[net]] = i
+                fill[net] += 1
+
+    return NetIndex(drivers, load_offsets, load_insts)
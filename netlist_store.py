@@ -0,0 +1,192 @@
+import os
+import sys
+import time
+import struct
+import marshal
+from array import array
+import netlist_model
+
+# Formato binário do design já lido (.nlb), para reaproveitar a leitura entre
+# execuções sem tokenizar o Verilog de novo. Layout:
+#   MAGIC | tamanho do cabeçalho (u64) | cabeçalho (marshal) | seções
+# O cabeçalho é o índice: metadados da origem e, por módulo, as contagens e a
+# posição (início, tamanho) de cada seção. Seções são os arrays CSR do
+# netlist_model.Netlist em bytes crus e as tabelas de nomes internados em um
+# único bloco UTF-8 separado por '\n' (nomes Verilog não contêm quebras de
+# linha). Carregar é ler os blocos e montar os arrays com frombytes.
+
+MAGIC = b"VXNLB\0\0\1"
+STORE_FORMAT = 1
+DESIGN_EXT = ".nlb"
+
+_ARRAYS = ('inst_type', 'pin_offsets', 'pin_ids', 'pin_nets', 'func_indices', 'occ_indices', 'sub_indices')
+_NAMES = ('net_names', 'pin_names', 'cell_types', 'inst_names')
+
+def is_design_file(path):
+    """True se 'path' é um design exportado (verifica a assinatura, não a extensão)."""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+def _module_sections(netlist):
+    """(nome da seção, bytes) de um módulo, na ordem em que são gravadas."""
+    yield 'ports', marshal.dumps((netlist.inputs, netlist.outputs, netlist.lumped))
+    for name in _NAMES:
+        yield name, "\n".join(getattr(netlist, name)).encode()
+    for name in _ARRAYS:
+        yield name, getattr(netlist, name).tobytes()
+
+def save_design(path, design, source=None, policy=None):
+    """
+    Grava 'design' (netlist_model.Design) em 'path'. 'source' (arquivo de
+    origem) e 'policy' (regras de células físicas usadas na leitura) vão
+    para o cabeçalho, para quem carregar saber o que o design representa.
+    """
+    modules, blobs = [], []
+    offset = 0
+    for netlist in design.modules.values():
+        sections = {}
+        for name, data in _module_sections(netlist):
+            sections[name] = (offset, len(data))
+            blobs.append(data)
+            offset += len(data)
+        modules.append({
+            'name': netlist.module,
+            'counts': {name: len(getattr(netlist, name)) for name in _NAMES + _ARRAYS},
+            'sections': sections,
+        })
+
+    header = marshal.dumps({
+        'format': STORE_FORMAT,
+        'byteorder': sys.byteorder,
+        'itemsize': {name: (code, array(code).itemsize) for name, code in _array_codes().items()},
+        'source': _source_info(source),
+        'policy': policy.rules if policy else None,
+        'created': time.time(),
+        'top': design.top.module if design.modules else None,
+        'modules': modules,
+    })
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        for data in blobs:
+            f.write(data)
+    os.replace(tmp, path)
+
+def _array_codes():
+    """Typecode de cada array do Netlist (igual ao de um Netlist vazio)."""
+    empty = netlist_model.Netlist()
+    return {name: getattr(empty, name).typecode for name in _ARRAYS}
+
+def _source_info(source):
+    if source is None:
+        return None
+    try:
+        st = os.stat(source)
+        return {'path': os.path.abspath(source), 'size': st.st_size, 'mtime': st.st_mtime}
+    except OSError:
+        return {'path': source}
+
+def read_index(path):
+    """Cabeçalho (índice) do arquivo e a posição onde começam as seções."""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"'{path}' não é um design exportado ({DESIGN_EXT})")
+        size, = struct.unpack("<Q", f.read(8))
+        header = marshal.loads(f.read(size))
+    if header.get('format') != STORE_FORMAT:
+        raise ValueError(f"'{path}': formato {header.get('format')} não suportado (esperado {STORE_FORMAT})")
+    return header, len(MAGIC) + 8 + size
+
+def _load_array(typecode, stored, data, swap):
+    """Array com o typecode do modelo a partir dos bytes gravados ('stored' = (typecode, itemsize))."""
+    values = array(typecode)
+    if values.itemsize != stored[1]:
+        # Outra plataforma (ex.: 'L' de 4 bytes): lê com um typecode do tamanho gravado
+        code = next(c for c in "BHILQ" if array(c).itemsize == stored[1])
+        values = array(code)
+    values.frombytes(data)
+    if swap:
+        values.byteswap()
+    return values if values.typecode == typecode else array(typecode, values)
+
+def _load_module(design, module, header, read_section):
+    """Monta o Netlist de 'module'; read_section(início, tamanho) devolve os bytes de uma seção."""
+    netlist = design.add_module(module['name'])
+    swap = header['byteorder'] != sys.byteorder
+
+    def section(name):
+        return read_section(*module['sections'][name])
+
+    netlist.inputs, netlist.outputs, netlist.lumped = marshal.loads(section('ports'))
+    for name in _NAMES:
+        setattr(netlist, name, str(section(name), 'utf-8').split("\n") if module['counts'][name] else [])
+    for name in _ARRAYS:
+        typecode = getattr(netlist, name).typecode
+        setattr(netlist, name, _load_array(typecode, header['itemsize'][name], section(name), swap))
+
+    netlist.net_ids = {name: i for i, name in enumerate(netlist.net_names)}
+    netlist.pin_ids_by_name = {name: i for i, name in enumerate(netlist.pin_names)}
+    netlist.type_ids = {name: i for i, name in enumerate(netlist.cell_types)}
+    return netlist
+
+def load_design(path, modules=None):
+    """
+    Design gravado por save_design. Com 'modules' (nomes), só esses módulos
+    são lidos, pelo índice, sem passar pelo resto do arquivo.
+    """
+    header, base = read_index(path)
+    design = netlist_model.Design()
+    with open(path, 'rb') as f:
+        if modules is None:
+            # Tudo de uma vez; as seções são fatias do mesmo buffer, sem cópia
+            f.seek(base)
+            data = memoryview(f.read())
+            read_section = lambda start, size: data[start:start + size]
+        else:
+            def read_section(start, size):
+                f.seek(base + start)
+                return f.read(size)
+        for module in header['modules']:
+            if modules is None or module['name'] in modules:
+                _load_module(design, module, header, read_section)
+    return design
+
+def describe(path):
+    """Resumo do arquivo a partir só do índice."""
+    header, _ = read_index(path)
+    source = header['source'] or {}
+    print(f"{path}: formato {header['format']}, origem {source.get('path', '?')}, topo {header['top']}")
+    if header['policy']:
+        print(f"  células físicas: {header['policy']}")
+    for module in header['modules']:
+        counts = module['counts']
+        print(f"  {module['name']}: {counts['inst_names']} instâncias ({counts['func_indices']} funcionais, "
+              f"{counts['occ_indices']} de ocupação, {counts['sub_indices']} submódulos), {counts['net_names']} nets")
+
+def export_name(input_file):
+    """blocos/uart.nl.v -> uart.nlb"""
+    return os.path.basename(input_file).split(".")[0] + DESIGN_EXT
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python netlist_store.py <netlist.v> [saida.nlb] [--fused]   # lê e exporta")
+        print("     python netlist_store.py <design.nlb>                       # mostra o índice")
+    elif is_design_file(sys.argv[1]):
+        describe(sys.argv[1])
+    else:
+        import main
+        args = [a for a in sys.argv[1:] if a != "--fused"]
+        input_file = args[0]
+        output = args[1] if len(args) > 1 else export_name(input_file)
+        try:
+            start = time.perf_counter()
+            netlist = main.read_netlist(input_file, fused="--fused" in sys.argv)
+            save_design(output, netlist.design, input_file)
+            print(f"Design '{output}' exportado em {time.perf_counter() - start:.2f} s.")
+        except Exception as e:
+            print(f"Erro: {e}")
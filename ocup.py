@@ -1,15 +1,141 @@
 import math
+import parallel
+
+OCC_MODES = ('matrix', 'array')
+
+# Políticas para células físicas (sem comportamento lógico):
+#   keep: instância a instância, como no restante da netlist
+#   drop: descartada já na leitura
+#   lump: descartada na leitura e reduzida a uma instância vetorial equivalente
+PHYSICAL_ACTIONS = ('keep', 'drop', 'lump')
+PHYSICAL_KINDS = ('decap', 'fill', 'tap')
+
+def physical_kind(cell_type):
+    """Classifica o tipo de célula em 'decap', 'fill', 'tap' ou None (funcional)."""
+    name = cell_type.lower()
+    for kind in PHYSICAL_KINDS:
+        if kind in name:
+            return kind
+    return None
+
+class PhysicalCellPolicy:
+    """
+    Política por tipo de célula física. As regras podem ser por família
+    ('fill') ou por tipo exato ('decap_3'); o tipo exato tem precedência.
+    A decisão é memorizada por tipo, então o custo por instância é um lookup.
+    Usada como instance_filter do verilog_parser: True mantém a instância.
+    """
+    def __init__(self, rules=None):
+        self.rules = dict(rules or {})
+        self._actions = {}
+
+    def action(self, cell_type):
+        action = self._actions.get(cell_type)
+        if action is None:
+            kind = physical_kind(cell_type)
+            if kind is None:
+                action = 'keep'
+            else:
+                action = self.rules.get(cell_type, self.rules.get(kind, 'keep'))
+            self._actions[cell_type] = action
+        return action
+
+    def __call__(self, cell_type):
+        return self.action(cell_type) == 'keep'
+
+def parse_physical_policy(spec):
+    """Converte 'fill=drop,tap=drop,decap=lump' em uma PhysicalCellPolicy."""
+    rules = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item: continue
+        target, _, action = item.partition("=")
+        if action not in PHYSICAL_ACTIONS:
+            raise ValueError(f"política inválida '{item}' (use {', '.join(PHYSICAL_ACTIONS)})")
+        rules[target.strip()] = action
+    return PhysicalCellPolicy(rules)
+
+def occupation_columns(n_cells, max_rows, mode='matrix', lumped=None):
+    """
+    Número de colunas ocupadas pelo módulo de ocupação, calculado só pelas
+    contagens, antes de gerar qualquer linha (define onde começa o bloco funcional).
+    """
+    if mode == 'array':
+        return 1 if n_cells or lumped else 0
+    return math.ceil(n_cells / max_rows) + (1 if lumped else 0)
+
+def iter_occupation_lines(cells, x_base, y_step, x_step, max_rows, mode='matrix', lumped=None):
+    """
+    Gera (em streaming) as células de ocupação (decap, fill, tap) à esquerda do bloco funcional.
+    mode='matrix': uma instância por célula, em matriz de max_rows linhas.
+    mode='array' : uma instância vetorial do xschem por tipo (name=x_tipo[0:N-1]),
+                   mantendo a contagem (e portanto a capacitância total) para
+                   simulação, com um texto de resumo ao lado de cada uma.
+    'lumped' são contagens por tipo de células agregadas já na leitura
+    (política 'lump'); viram instâncias vetoriais em uma coluna extra.
+    """
+    if mode == 'array':
+        counts = count_cell_types(cells)
+        for cell_type, count in (lumped or {}).items():
+            counts[cell_type] = counts.get(cell_type, 0) + count
+        yield from iter_occupation_arrays(counts, x_base, y_step)
+        return
 
-def generate_occupation_matrix(cells, x_base, y_step, x_step, max_rows):
-    lines = []
     for i, cell in enumerate(cells):
-        col = i // max_rows
-        row = i % max_rows
-        x = x_base + (col * x_step)
+        yield _matrix_line(i, cell.name, cell.type, x_base, y_step, x_step, max_rows)
+
+    if lumped:
+        num_cols = math.ceil(len(cells) / max_rows)
+        yield from iter_occupation_arrays(lumped, x_base + (num_cols * x_step), y_step)
+
+def _matrix_line(i, name, cell_type, x_base, y_step, x_step, max_rows):
+    col = i // max_rows
+    row = i % max_rows
+    x = x_base + (col * x_step)
+    y = row * y_step
+
+    attr = f"name={name} VGND=VGND VNB=VNB VPB=VPB VPWR=VPWR prefix=sky130_fd_sc_hd__"
+    return f"C {{sky130_stdcells/{cell_type}.sym}} {x} {y} 0 0 {{{attr}}}"
+
+def _matrix_range(state, start, end):
+    """Texto das células cells[start:end] da matriz (processos do pool de --jobs)."""
+    indices, inst_names, inst_type, cell_types, layout = state
+    return "".join("\n" + _matrix_line(k, inst_names[indices[k]], cell_types[inst_type[indices[k]]], *layout)
+                   for k in range(start, end))
+
+def write_occupation(out, cells, x_base, y_step, x_step, max_rows, mode='matrix', lumped=None, jobs=1):
+    """
+    Escreve em 'out' as linhas de iter_occupation_lines, cada uma precedida
+    de '\n'. Com jobs > 1, uma matriz grande é gerada em faixas por um pool
+    de processos, gravadas na ordem (saída idêntica à serial).
+    """
+    if mode == 'matrix' and parallel.worth_parallel(len(cells), jobs):
+        netlist = cells.netlist
+        state = (cells.indices, netlist.inst_names, netlist.inst_type, netlist.cell_types,
+                 (x_base, y_step, x_step, max_rows))
+        with parallel.ChunkPool(state, jobs) as pool:
+            for text in pool.map(_matrix_range, parallel.chunk_ranges(len(cells), jobs)):
+                out.write(text)
+        # Coluna extra das células agregadas, como em iter_occupation_lines
+        num_cols = math.ceil(len(cells) / max_rows)
+        lines = iter_occupation_arrays(lumped, x_base + (num_cols * x_step), y_step) if lumped else ()
+    else:
+        lines = iter_occupation_lines(cells, x_base, y_step, x_step, max_rows, mode, lumped)
+    for line in lines:
+        out.write("\n")
+        out.write(line)
+
+def count_cell_types(cells):
+    """Contagem por tipo, na ordem da primeira ocorrência."""
+    counts = {}
+    for cell in cells:
+        counts[cell.type] = counts.get(cell.type, 0) + 1
+    return counts
+
+def iter_occupation_arrays(counts, x_base, y_step):
+    """Uma instância vetorial por tipo de célula, empilhadas em uma única coluna."""
+    for row, (cell_type, count) in enumerate(counts.items()):
         y = row * y_step
-        
-        attr = f"name={cell['name']} VGND=VGND VNB=VNB VPB=VPB VPWR=VPWR prefix=sky130_fd_sc_hd__"
-        lines.append(f"C {{sky130_stdcells/{cell['type']}.sym}} {x} {y} 0 0 {{{attr}}}")
-    
-    num_cols = math.ceil(len(cells) / max_rows) if cells else 0
-    return lines, num_cols
\ No newline at end of file
+        attr = f"name=x_{cell_type}[0:{count - 1}] VGND=VGND VNB=VNB VPB=VPB VPWR=VPWR prefix=sky130_fd_sc_hd__"
+        yield f"C {{sky130_stdcells/{cell_type}.sym}} {x_base} {y} 0 0 {{{attr}}}"
+        yield f"T {{{cell_type} x{count}}} {x_base + 60} {y - 10} 0 0 0.3 0.3 {{}}"
@@ -0,0 +1,48 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+# Geração paralela de blocos de linhas (--jobs N): o trabalho é dividido em
+# faixas contíguas de instâncias, cada processo gera o texto de uma faixa e o
+# pai grava os textos na ordem das faixas, então a saída é idêntica à serial.
+
+# Abaixo disso, por faixa, o custo de subir os processos não compensa
+MIN_CHUNK = 5000
+# Faixas por processo, para equilibrar a carga entre eles
+CHUNKS_PER_JOB = 4
+
+_state = None
+
+def _set_state(state):
+    global _state
+    _state = state
+
+def _run(task):
+    fn, args = task
+    return fn(_state, *args)
+
+def chunk_ranges(n, jobs):
+    """Divide range(n) em faixas (início, fim) contíguas, na ordem."""
+    n_chunks = max(1, min(jobs * CHUNKS_PER_JOB, n // MIN_CHUNK))
+    size = math.ceil(n / n_chunks) if n else 0
+    return [(start, min(start + size, n)) for start in range(0, n, size)] if n else []
+
+def worth_parallel(n, jobs):
+    return jobs > 1 and n >= 2 * MIN_CHUNK
+
+class ChunkPool:
+    """
+    ProcessPoolExecutor em que 'state' (arrays da netlist, templates...) é
+    enviado uma única vez para cada processo. map(fn, faixas) chama
+    fn(state, *faixa) nos processos e devolve os resultados na ordem das faixas.
+    """
+    def __init__(self, state, jobs):
+        self.executor = ProcessPoolExecutor(max_workers=jobs, initializer=_set_state, initargs=(state,))
+
+    def map(self, fn, chunks):
+        return self.executor.map(_run, [(fn, chunk) for chunk in chunks])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.executor.shutdown()
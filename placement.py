@@ -0,0 +1,131 @@
+import math
+from array import array
+
+LAYOUTS = ('levelized', 'column')
+
+# Pinos que caracterizam elementos de estado (flip-flops, latches, clock gates):
+# suas entradas não contam para o nível lógico, o que quebra os laços sequenciais.
+SEQUENTIAL_PINS = {'CLK', 'CLK_N', 'GATE', 'GATE_N'}
+
+# Espaçamento da grade (unidades do xschem)
+COL_STEP = 600
+ROW_STEP = 300
+
+def column_placement(n_cells, x_start, y_start):
+    """Layout original: todas as células em uma única coluna."""
+    xs = array('l', [x_start]) * n_cells
+    ys = array('l', (y_start - (i * ROW_STEP) for i in range(n_cells)))
+    return xs, ys
+
+def compute_levels(cells, net_index, is_output_pin):
+    """
+    Nível lógico de cada célula (na ordem de 'cells') por ordenação
+    topológica (Kahn) em O(V+E): entradas primárias e saídas de elementos
+    sequenciais são nível 0. Células em laços combinacionais ficam com -1.
+    """
+    netlist = cells.netlist
+    offsets, pin_ids, pin_nets, inst_type = netlist.pin_offsets, netlist.pin_ids, netlist.pin_nets, netlist.inst_type
+    drivers = net_index.drivers
+    n = len(cells)
+
+    # Posição de cada instância dentro de 'cells'
+    position = array('i', [-1]) * len(netlist)
+    for k, i in enumerate(cells.indices):
+        position[i] = k
+
+    sequential = {}
+    def is_sequential(type_id, i):
+        seq = sequential.get(type_id)
+        if seq is None:
+            seq = sequential[type_id] = any(
+                netlist.pin_names[pin_ids[k]] in SEQUENTIAL_PINS for k in range(offsets[i], offsets[i + 1]))
+        return seq
+
+    direction = {}
+    def pin_is_output(type_id, pin_id):
+        key = (type_id, pin_id)
+        out = direction.get(key)
+        if out is None:
+            out = direction[key] = bool(is_output_pin(netlist.cell_types[type_id], netlist.pin_names[pin_id]))
+        return out
+
+    # Grau de entrada: pinos de entrada ligados a nets com driver dentro do bloco
+    indeg = array('l', [0]) * n
+    seq_flags = array('b', [0]) * n
+    for k, i in enumerate(cells.indices):
+        type_id = inst_type[i]
+        if is_sequential(type_id, i):
+            seq_flags[k] = 1
+            continue
+        d = 0
+        for p in range(offsets[i], offsets[i + 1]):
+            if not pin_is_output(type_id, pin_ids[p]):
+                drv = drivers[pin_nets[p]]
+                if drv >= 0 and position[drv] >= 0:
+                    d += 1
+        indeg[k] = d
+
+    levels = array('l', [0]) * n
+    queue = array('l', (k for k in range(n) if indeg[k] == 0))
+    head = 0
+    while head < len(queue):
+        k = queue[head]
+        head += 1
+        i = cells.indices[k]
+        next_level = levels[k] + 1
+        seen = set()
+        for p in range(offsets[i], offsets[i + 1]):
+            net = pin_nets[p]
+            if drivers[net] != i or net in seen:
+                continue
+            seen.add(net)
+            for j in net_index.loads(net):
+                kj = position[j]
+                if kj < 0 or seq_flags[kj]:
+                    continue
+                if levels[kj] < next_level:
+                    levels[kj] = next_level
+                indeg[kj] -= 1
+                if indeg[kj] == 0:
+                    queue.append(kj)
+
+    # Quem não entrou na fila está em um laço combinacional
+    for k in range(n):
+        if indeg[k] > 0:
+            levels[k] = -1
+    return levels
+
+def levelized_placement(cells, net_index, is_output_pin, x_start, y_start, max_rows=None):
+    """
+    Coloca as células em uma grade 2-D por nível lógico: cada nível ocupa
+    colunas de no máximo 'max_rows' linhas (padrão ~sqrt(N), para um layout
+    aproximadamente quadrado). Células em laços vão para uma grade de largura
+    limitada depois do último nível. Retorna arrays (xs, ys) na ordem de 'cells'.
+    """
+    n = len(cells)
+    levels = compute_levels(cells, net_index, is_output_pin)
+    if max_rows is None:
+        max_rows = max(10, math.ceil(math.sqrt(n)))
+
+    # Quantas células por nível -> quantas colunas cada nível ocupa
+    n_levels = (max(levels) + 1) if n else 0
+    counts = array('l', [0]) * (n_levels + 1)  # última posição: células em laço
+    for level in levels:
+        counts[level] += 1  # level -1 cai na última posição
+
+    first_col = array('l', [0]) * (n_levels + 1)
+    col = 0
+    for level in range(n_levels + 1):
+        first_col[level] = col
+        col += math.ceil(counts[level] / max_rows)
+
+    xs = array('l', [0]) * n
+    ys = array('l', [0]) * n
+    filled = array('l', [0]) * (n_levels + 1)
+    for k in range(n):
+        level = levels[k]
+        slot = filled[level]
+        filled[level] = slot + 1
+        xs[k] = x_start + (first_col[level] + slot // max_rows) * COL_STEP
+        ys[k] = y_start - (slot % max_rows) * ROW_STEP
+    return xs, ys
@@ -0,0 +1,185 @@
+import sys
+import json
+import heapq
+import argparse
+import func_cell_wr
+import netlist_model
+import ocup
+from sky130_db import CELL_DB
+
+# Consultas sobre a netlist lida, sem gerar esquemático: células ausentes do
+# CELL_DB, contagem por tipo, fanout, driver e cargas de nets. Os índices
+# (nets, tipos, nomes de instância) são montados uma vez, na primeira
+# consulta que precisa deles, e reaproveitados pelas seguintes.
+
+class NetlistQuery:
+    """Consultas sobre um netlist_model.Netlist (tipicamente o de topo)."""
+    def __init__(self, netlist):
+        self.netlist = netlist
+        self._net_index = None
+        self._counts = {}
+        self._inst_ids = None
+
+    @property
+    def net_index(self):
+        """NetIndex das instâncias funcionais (direções de pino pelo CELL_DB)."""
+        if self._net_index is None:
+            self._net_index = netlist_model.build_net_index(self.netlist, func_cell_wr.is_output_pin)
+        return self._net_index
+
+    def cell_counts(self, group='functional'):
+        """Tipo -> instâncias, para 'functional', 'physical', 'submodules' ou 'all'."""
+        counts = self._counts.get(group)
+        if counts is None:
+            netlist = self.netlist
+            indices = {'functional': netlist.func_indices, 'physical': netlist.occ_indices,
+                       'submodules': netlist.sub_indices, 'all': None}[group]
+            counts = self._counts[group] = netlist.type_counts(indices)
+        return counts
+
+    def missing_cells(self):
+        """Tipos funcionais ausentes do CELL_DB -> instâncias (pinos iriam para a posição padrão)."""
+        return {t: n for t, n in self.cell_counts('functional').items() if t not in CELL_DB}
+
+    def _net_id(self, net):
+        net_id = self.netlist.net_ids.get(net)
+        if net_id is None:
+            raise KeyError(f"net '{net}' (módulo {self.netlist.module})")
+        return net_id
+
+    def fanout(self, net):
+        """Cargas funcionais da net."""
+        return self.net_index.fanout(self._net_id(net))
+
+    def driver(self, net):
+        """Nome da instância que dirige a net, ou None (porta de entrada, sem driver)."""
+        index = self.net_index.driver(self._net_id(net))
+        return self.netlist.inst_names[index] if index >= 0 else None
+
+    def loads(self, net):
+        names = self.netlist.inst_names
+        return [names[i] for i in self.net_index.loads(self._net_id(net))]
+
+    def top_fanout(self, n=10):
+        """As 'n' nets de maior fanout, como [(net, fanout)]."""
+        index, names = self.net_index, self.netlist.net_names
+        offsets = index.load_offsets
+        best = heapq.nlargest(n, range(len(names)), key=lambda net: offsets[net + 1] - offsets[net])
+        return [(names[net], index.fanout(net)) for net in best]
+
+    def undriven_nets(self):
+        """Nets com carga funcional mas sem driver nem porta de entrada."""
+        index, names, inputs = self.net_index, self.netlist.net_names, self.netlist.inputs
+        return [names[net] for net in range(len(names))
+                if index.drivers[net] < 0 and index.fanout(net) and names[net].split('[')[0] not in inputs]
+
+    def instance(self, name):
+        """netlist_model.Instance pelo nome."""
+        if self._inst_ids is None:
+            self._inst_ids = {inst: i for i, inst in enumerate(self.netlist.inst_names)}
+        return self.netlist.instance(self._inst_ids[name])
+
+    def summary(self, top=10):
+        netlist = self.netlist
+        return {
+            'module': netlist.module,
+            'inputs': len(netlist.inputs), 'outputs': len(netlist.outputs),
+            'instances': len(netlist), 'functional': len(netlist.func_indices),
+            'physical': len(netlist.occ_indices), 'submodules': len(netlist.sub_indices),
+            'nets': len(netlist.net_names),
+            'missing_cells': self.missing_cells(),
+            'top_fanout': self.top_fanout(top),
+            'undriven_nets': len(self.undriven_nets()),
+        }
+
+def query_design(design):
+    """NetlistQuery de cada módulo do design, pelo nome do módulo."""
+    return {name: NetlistQuery(netlist) for name, netlist in design.modules.items()}
+
+def missing_cells(design):
+    """Células ausentes do CELL_DB em todo o design: tipo -> instâncias."""
+    missing = {}
+    for q in query_design(design).values():
+        for cell_type, n in q.missing_cells().items():
+            missing[cell_type] = missing.get(cell_type, 0) + n
+    return missing
+
+def print_report(q, args):
+    netlist = q.netlist
+    if args.types:
+        print(f"Tipos de célula ({args.types}) em {netlist.module}:")
+        for cell_type, n in sorted(q.cell_counts(args.types).items(), key=lambda kv: (-kv[1], kv[0])):
+            print(f"  {cell_type:<28} {n:>10,}")
+    for net in args.net:
+        print(f"Net {net}: fanout {q.fanout(net)}, driver {q.driver(net) or '(nenhum)'}")
+        for name in q.loads(net)[:args.top]:
+            print(f"  carga {name}")
+    if args.types or args.net:
+        return
+
+    s = q.summary(args.top)
+    print(f"Módulo {s['module']}: {s['instances']:,} instâncias ({s['functional']:,} funcionais, "
+          f"{s['physical']:,} de ocupação, {s['submodules']:,} submódulos), {s['nets']:,} nets, "
+          f"{s['inputs']} entradas, {s['outputs']} saídas")
+    if s['missing_cells']:
+        print("  Ausentes do CELL_DB (pinos na posição padrão):")
+        for cell_type, n in sorted(s['missing_cells'].items()):
+            print(f"    {cell_type:<26} {n:>10,}")
+    print("  Maior fanout: " + ", ".join(f"{net}={n}" for net, n in s['top_fanout']))
+    if s['undriven_nets']:
+        print(f"  Nets sem driver: {s['undriven_nets']}")
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="main.py inspect",
+                                     description="Consultas sobre a netlist, sem gerar o esquemático.")
+    parser.add_argument("input_file", help="netlist .v (normalizada, ou a original com --fused), .gz/.zst ou .nlb")
+    parser.add_argument("--fused", action="store_true", help="aplica a renomeação do rename_netlist na leitura")
+    parser.add_argument("--module", help="módulo consultado (padrão: topo; 'all' para todos)")
+    parser.add_argument("--types", nargs="?", const="functional", choices=('functional', 'physical', 'submodules', 'all'),
+                        help="contagem por tipo de célula")
+    parser.add_argument("--net", action="append", default=[], help="fanout, driver e cargas da net (pode repetir)")
+    parser.add_argument("--top", type=int, default=10, help="nets de maior fanout / cargas listadas")
+    parser.add_argument("--json", action="store_true", help="resumo em JSON")
+    parser.add_argument("--strict", action="store_true", help="sai com código 2 se houver células ausentes do CELL_DB")
+    parser.add_argument("--physical", metavar="REGRAS", type=ocup.parse_physical_policy,
+                        help="política de células físicas na leitura, como na conversão")
+    parser.add_argument("--sym-lib", metavar="DIR", action="append", default=[], help="diretório de .sym do xschem")
+    parser.add_argument("--rules", metavar="ARQUIVO", help="regras extras de renomeação")
+    return parser.parse_args(argv)
+
+def run_inspect(argv):
+    """CLI: python main.py inspect <netlist> [...]. Retorna o código de saída."""
+    import main
+    args = parse_args(argv)
+    try:
+        main.load_libraries(args.rules, args.sym_lib)
+        netlist = main.read_netlist(args.input_file, args.fused, policy=args.physical)
+        queries = query_design(netlist.design)
+        if args.module == 'all':
+            selected = list(queries.values())
+        elif args.module and args.module not in queries:
+            raise KeyError(f"módulo '{args.module}'")
+        else:
+            selected = [queries[args.module or netlist.module]]
+
+        if args.json:
+            print(json.dumps({q.netlist.module: q.summary(args.top) for q in selected}, indent=2, ensure_ascii=False))
+        else:
+            for q in selected:
+                print_report(q, args)
+    except KeyError as e:
+        print(f"Erro: {e.args[0]} não encontrado(a).")
+        return 1
+    except Exception as e:
+        print(f"Erro: {e}")
+        return 1
+
+    if args.strict and missing_cells(netlist.design):
+        return 2
+    return 0
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python query.py <arquivo.v | design.nlb> [--types] [--net NET] [--module M|all] [--json]")
+    else:
+        sys.exit(run_inspect(sys.argv[1:]))
@@ -1,97 +1,268 @@
 import re
 import sys
 import os
+import tempfile
+import compressed_io
 
-def clean_and_organize_netlist(input_file):
-    output_file = "rn_wrapper.v"
-    
+# Regras de Renomeação de Células: (regex, substituição), em ordem de prioridade.
+# Todas são compiladas em um único padrão e aplicadas em uma só varredura
+# por linha; em cada posição vale a primeira regra da tabela que casar. Regras
+# extras (--rules) entram antes das embutidas, para que uma regra escrita
+# sobre o nome completo do PDK não perca para a remoção genérica do prefixo.
+decap_pattern = r"sky130_ef_sc_hd__decap_\d+_12"
+standard_prefix = "sky130_fd_sc_hd__"
+
+RENAME_RULES = [
+    (decap_pattern, "decap_12"),
+    (standard_prefix, ""),
+]
+
+_combined_rules = None
+_n_extra_rules = 0
+
+# Regex para capturar o nome do módulo
+re_module = re.compile(r"(?:macro)?module\s+(\w+)")
+# Regex para capturar input/output [largura] nome;
+re_port = re.compile(r"^\s*(input|output)\s+(\[[^\]]+\]\s+)?(\w+)\s*;")
+
+
+def _numbered_backref(pattern):
+    """Primeira referência numerada (\\1, (?(1)...)) fora de classes de caracteres, ou None."""
+    i, in_class = 0, False
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            if not in_class and pattern[i + 1:i + 2].isdigit() and pattern[i + 1] != "0":
+                return pattern[i:i + 2]
+            i += 2
+            continue
+        if in_class:
+            in_class = c != "]"
+        elif c == "[":
+            in_class = True
+            # ']' logo no início da classe é literal
+            i += 2 if pattern[i + 1:i + 2] == "]" else 3 if pattern[i + 1:i + 3] == "^]" else 1
+            continue
+        elif pattern.startswith("(?(", i) and pattern[i + 3:i + 4].isdigit():
+            return pattern[i:i + 4]
+        i += 1
+    return None
+
+
+def add_rename_rule(pattern, replacement):
+    """
+    Estende a tabela com uma regra específica de PDK (ex.: células do okada).
+    As regras extras valem antes das embutidas, na ordem em que são
+    adicionadas. Como todas viram um único regex, grupos são renumerados:
+    referências numeradas e flags globais ('(?i)...') são recusadas; use
+    grupos nomeados ('(?P<n>...)(?P=n)') e flags locais ('(?i:...)').
+    """
+    global _combined_rules, _n_extra_rules
+    re.compile(pattern)  # valida antes de aceitar
+    backref = _numbered_backref(pattern)
+    if backref:
+        raise ValueError(f"regra '{pattern}': referência numerada '{backref}' não é suportada; use grupos nomeados")
+
+    RENAME_RULES.insert(_n_extra_rules, (pattern, replacement))
+    _combined_rules = None
+    try:
+        _compile_rules()
+    except re.error as e:
+        # Ex.: flags globais fora do início ou nome de grupo repetido no regex combinado
+        del RENAME_RULES[_n_extra_rules]
+        _combined_rules = None
+        raise ValueError(f"regra '{pattern}' não pode ser combinada com as demais: {e}") from None
+    _n_extra_rules += 1
+
+
+def load_rename_rules(rules_file):
+    """
+    Lê regras extras de um arquivo texto, uma por linha no formato
+    'padrão -> substituição'. Linhas vazias e iniciadas por '#' são ignoradas.
+    """
+    with open(rules_file, 'r') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"): continue
+            if "->" not in line:
+                raise ValueError(f"{rules_file}:{line_no}: regra sem '->'")
+            pattern, replacement = (part.strip() for part in line.split("->", 1))
+            try:
+                add_rename_rule(pattern, replacement)
+            except (re.error, ValueError) as e:
+                raise ValueError(f"{rules_file}:{line_no}: {e}") from None
+
+
+def _compile_rules():
+    """Junta a tabela em um único regex com um grupo nomeado por regra."""
+    global _combined_rules
+    if _combined_rules is None:
+        alternatives = "|".join(f"(?P<r{i}>{pattern})" for i, (pattern, _) in enumerate(RENAME_RULES))
+        replacements = {}
+        for i, (pattern, repl) in enumerate(RENAME_RULES):
+            if "\\" in repl:
+                # Substituição com referências (\1, \g<nome>): expande só o trecho casado
+                replacements[f"r{i}"] = lambda text, rule=re.compile(pattern), repl=repl: rule.sub(repl, text, count=1)
+            else:
+                replacements[f"r{i}"] = lambda text, repl=repl: repl
+        regex = re.compile(alternatives)
+        _combined_rules = (regex, lambda m: replacements[m.lastgroup](m.group()))
+    return _combined_rules
+
+
+def rename_line(line):
+    """Aplica as regras de renomeação de células em uma linha."""
+    regex, replace = _compile_rules()
+    return regex.sub(replace, line)
+
+
+def new_netlist_info():
+    """
+    Estado coletado durante a limpeza: nome e portas (estilo ANSI) do módulo
+    corrente e a lista dos módulos já encerrados.
+    """
+    return {'module': "unknown", 'inputs': {}, 'outputs': {}, 'modules': []}
+
+
+def iter_clean_lines(lines, info, body_sink=None):
+    """
+    Transformação em streaming: gera cada linha já renomeada, preenche 'info'
+    com o módulo e as portas e, se 'body_sink' for dado, grava nele o corpo
+    (wires e instâncias) que compõe o arquivo normalizado. Netlists com vários
+    módulos são tratadas módulo a módulo: a cada 'endmodule' o body_sink
+    recebe end_module(info) e as portas são reiniciadas para o próximo.
+    """
+    # Flags de controle
+    found_first_body_line = False
+
+    for line in lines:
+        # Aplica renomeação de células na linha
+        line = rename_line(line)
+        yield line
+
+        stripped = line.strip()
+        if not stripped: continue
+
+        # Identifica nome do módulo (início de um novo módulo)
+        m_mod = re_module.match(stripped)
+        if m_mod:
+            info['module'] = m_mod.group(1)
+            info['inputs'], info['outputs'] = {}, {}
+            found_first_body_line = False
+            continue
+
+        # Fim do módulo corrente
+        if stripped.startswith("endmodule"):
+            info['modules'].append(info['module'])
+            if body_sink is not None:
+                body_sink.end_module(info)
+            continue
+
+        # Captura definições de portas
+        m_port = re_port.search(stripped)
+        if m_port:
+            direction = m_port.group(1)
+            width = m_port.group(2).strip() + " " if m_port.group(2) else ""
+            name = m_port.group(3)
+
+            if direction == "input":
+                info['inputs'][name] = f"input {width}{name}"
+            else:
+                info['outputs'][name] = f"output {width}{name}"
+            continue
+
+        # Identifica o início do corpo real (wires ou instâncias)
+        # Ignora linhas que são apenas nomes de portas ou parênteses do cabeçalho antigo
+        if stripped.startswith("wire") or "(" in stripped:
+            found_first_body_line = True
+
+        if found_first_body_line and body_sink is not None:
+            body_sink.write(line)
+
+
+def write_organized_module(f_out, info, body):
+    """Reconstrução de um módulo seguindo IEEE 1364-2005 (Estilo ANSI)."""
+    f_out.write(f"module {info['module']} (\n")
+
+    # Ordena entradas e saídas alfabeticamente
+    inputs, outputs = info['inputs'], info['outputs']
+    sorted_ports = [inputs[k] for k in sorted(inputs)] + [outputs[k] for k in sorted(outputs)]
+
+    for i, port in enumerate(sorted_ports):
+        comma = "," if i < len(sorted_ports) - 1 else ""
+        f_out.write(f"    {port}{comma}\n")
+
+    f_out.write(");\n\n")
+
+    # Escreve o corpo (wires e instâncias)
+    for b_line in body:
+        f_out.write(b_line)
+
+    f_out.write("\nendmodule\n")
+
+
+class IntermediateWriter:
+    """
+    Grava o rn_wrapper.v em paralelo a um consumo em streaming.
+    O corpo de cada módulo vai para um arquivo temporário, pois o cabeçalho
+    ANSI só é conhecido depois que todas as portas do módulo foram lidas;
+    no 'endmodule' o módulo é descarregado no arquivo final.
+    """
+    def __init__(self, output_file):
+        self.output_file = output_file
+        self.body = tempfile.TemporaryFile('w+')
+        self.f_out = None
+        self.pending = False
+
+    def write(self, line):
+        self.body.write(line)
+        self.pending = True
+
+    def end_module(self, info):
+        if self.f_out is None:
+            self.f_out = compressed_io.open_text(self.output_file, 'w')
+        else:
+            self.f_out.write("\n")
+        self.body.seek(0)
+        write_organized_module(self.f_out, info, self.body)
+        self.body.seek(0)
+        self.body.truncate()
+        self.pending = False
+
+    def finish(self, info):
+        # Módulo sem 'endmodule' (ou netlist vazia): descarrega o que houver
+        if self.pending or self.f_out is None:
+            self.end_module(info)
+        self.f_out.close()
+        self.body.close()
+
+
+def clean_and_organize_netlist(input_file, output_file="rn_wrapper.v"):
     if not os.path.exists(input_file):
         print(f"Erro: O arquivo '{input_file}' não foi encontrado.")
         return
 
-    # Regras de Renomeação de Células
-    decap_pattern = r"sky130_ef_sc_hd__decap_\d+_12"
-    standard_prefix = "sky130_fd_sc_hd__"
-
     try:
-        with open(input_file, 'r') as f:
-            lines = f.readlines()
+        info = new_netlist_info()
+        writer = IntermediateWriter(output_file)
 
         # 1. Pré-processamento: Limpeza de nomes e extração de dados
-        module_name = "unknown"
-        inputs = {}
-        outputs = {}
-        body = []
-        
-        # Regex para capturar o nome do módulo
-        re_module = re.compile(r"module\s+(\w+)")
-        # Regex para capturar input/output [largura] nome;
-        re_port = re.compile(r"^\s*(input|output)\s+(\[[^\]]+\]\s+)?(\w+)\s*;")
-        
-        # Flags de controle
-        found_first_body_line = False
-
-        for line in lines:
-            # Aplica renomeação de células na linha
-            line = re.sub(decap_pattern, "decap_12", line)
-            line = re.sub(standard_prefix, "", line)
-            
-            stripped = line.strip()
-            if not stripped: continue
-
-            # Identifica nome do módulo
-            m_mod = re_module.search(stripped)
-            if m_mod and module_name == "unknown":
-                module_name = m_mod.group(1)
-                continue
-
-            # Captura definições de portas
-            m_port = re_port.search(stripped)
-            if m_port:
-                direction = m_port.group(1)
-                width = m_port.group(2).strip() + " " if m_port.group(2) else ""
-                name = m_port.group(3)
-                
-                if direction == "input":
-                    inputs[name] = f"input {width}{name}"
-                else:
-                    outputs[name] = f"output {width}{name}"
-                continue
-
-            # Identifica o início do corpo real (wires ou instâncias)
-            # Ignora linhas que são apenas nomes de portas ou parênteses do cabeçalho antigo
-            if stripped.startswith("wire") or ("(" in stripped and not stripped.startswith("module")):
-                found_first_body_line = True
-            
-            if found_first_body_line and not stripped.startswith("endmodule"):
-                body.append(line)
+        with compressed_io.open_text(input_file) as f:
+            for _ in iter_clean_lines(f, info, writer):
+                pass
 
         # 2. Reconstrução seguindo IEEE 1364-2005 (Estilo ANSI)
-        with open(output_file, 'w') as f_out:
-            f_out.write(f"module {module_name} (\n")
-            
-            # Ordena entradas e saídas alfabeticamente
-            sorted_ports = [inputs[k] for k in sorted(inputs)] + [outputs[k] for k in sorted(outputs)]
-            
-            for i, port in enumerate(sorted_ports):
-                comma = "," if i < len(sorted_ports) - 1 else ""
-                f_out.write(f"    {port}{comma}\n")
-            
-            f_out.write(");\n\n")
-
-            # Escreve o corpo (wires e instâncias)
-            for b_line in body:
-                f_out.write(b_line)
-            
-            f_out.write("\nendmodule\n")
-        
+        writer.finish(info)
+
         print(f"Sucesso! O arquivo '{output_file}' foi limpo e normalizado.")
 
     except Exception as e:
         print(f"Erro ao processar: {e}")
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Uso: python rename_netlist.py <arquivo_origem.v>")
+    if len(sys.argv) not in (2, 3):
+        print("Uso: python rename_netlist.py <arquivo_origem.v> [regras.txt]")
     else:
-        clean_and_organize_netlist(sys.argv[1])
\ No newline at end of file
+        if len(sys.argv) == 3:
+            load_rename_rules(sys.argv[2])
+        clean_and_organize_netlist(sys.argv[1])
@@ -1,656 +1,260 @@
-CELL_DB = {
-    #1
-    'a2111o_1': {'A1': (-80, 50), 'A2': (-40, 50), 'B1': (0, 13), 'C1': (40, 30), 'D1': (80, 7), 'X': (0, 57)},
-    #2
-    'a2111o_2': {'A1': (-80, 50), 'A2': (-40, 50), 'B1': (0, 13), 'C1': (40, 30), 'D1': (80, 7), 'X': (0, 57)},
-    #3
-    'a2111o_4': {'A1': (-80, 50), 'A2': (-40, 50), 'B1': (0, 13), 'C1': (40, 30), 'D1': (80, 7), 'X': (0, 57)},
-    #4
-    'a2111oi_0': {'A1': (-80, 50), 'A2': (-40, 50), 'B1': (0, 13), 'C1': (40, 30), 'D1': (80, 7), 'Y': (0, 67)},
-    #5
-    'a2111oi_1': {'A1': (-80, 50), 'A2': (-40, 50), 'B1': (0, 13), 'C1': (40, 30), 'D1': (80, 7), 'Y': (0, 67)},
-    #6
-    'a2111oi_2': {'A1': (-80, 50), 'A2': (-40, 50), 'B1': (0, 13), 'C1': (40, 30), 'D1': (80, 7), 'Y': (0, 67)},
-    #7
-    'a2111oi_4': {'A1': (-80, 50), 'A2': (-40, 50), 'B1': (0, 13), 'C1': (40, 30), 'D1': (80, 7), 'Y': (0, 67)},
-    #8
-    'a211o_1': {'A1': (-60, 50), 'A2': (-20, 50), 'B1': (20, 30), 'C1': (60, 10), 'X': (0, 57)},
-    #9
-    'a211o_2': {'A1': (-60, 50), 'A2': (-20, 50), 'B1': (20, 30), 'C1': (60, 10), 'X': (0, 57)},
-    #10
-    'a211o_4': {'A1': (-60, 50), 'A2': (-20, 50), 'B1': (20, 30), 'C1': (60, 10), 'X': (0, 57)},
-    #11
-    'a211oi_1': {'A1': (-60, 50), 'A2': (-20, 50), 'B1': (20, 30), 'C1': (60, 10), 'Y': (0, 67)},
-    #12
-    'a211oi_2': {'A1': (-60, 50), 'A2': (-20, 50), 'B1': (20, 30), 'C1': (60, 10), 'Y': (0, 67)},
-    #13
-    'a211oi_4': {'A1': (-60, 50), 'A2': (-20, 50), 'B1': (20, 30), 'C1': (60, 10), 'Y': (0, 67)},
-    #14
-    'a21bo_1': {'A1': (-40, 50), 'A2': (0, 50), 'B1_N': (40, 10), 'X': (0, 57)},
-    #15
-    'a21bo_2': {'A1': (-40, 50), 'A2': (0, 50), 'B1_N': (40, 10), 'X': (0, 57)},
-    #16
-    'a21bo_4': {'A1': (-40, 50), 'A2': (0, 50), 'B1_N': (40, 10), 'X': (0, 57)},
-    #17
-    'a21boi_0': {'A1': (-40, 50), 'A2': (0, 50), 'B1_N': (40, 10), 'Y': (0, 67)},
-    #18
-    'a21boi_1': {'A1': (-40, 50), 'A2': (0, 50), 'B1_N': (40, 10), 'Y': (0, 67)},
-    #19
-    'a21boi_2': {'A1': (-40, 50), 'A2': (0, 50), 'B1_N': (40, 10), 'Y': (0, 67)},
-    #20
-    'a21boi_4': {'A1': (-40, 50), 'A2': (0, 50), 'B1_N': (40, 10), 'Y': (0, 67)},
-    #21
-    'a21o_1': {'A1': (-40, 50), 'A2': (0, 50), 'B1': (40, 10), 'X': (0, 57)},
-    #22
-    'a21o_2': {'A1': (-40, 50), 'A2': (0, 50), 'B1': (40, 10), 'X': (0, 57)},
-    #23
-    'a21o_4': {'A1': (-40, 50), 'A2': (0, 50), 'B1': (40, 10), 'X': (0, 57)},
-    #24
-    'a21oi_1': {'A1': (-40, 50), 'A2': (0, 50), 'B1': (40, 10), 'Y': (0, 67)},
-    #25
-    'a21oi_2': {'A1': (-40, 50), 'A2': (0, 50), 'B1': (40, 10), 'Y': (0, 67)},
-    #26
-    'a21oi_4': {'A1': (-40, 50), 'A2': (0, 50), 'B1': (40, 10), 'Y': (0, 67)},
-    #27
-    'a221o_1': {'A1': (-80, 50), 'A2': (-40, 50), 'B1': (0, 50), 'B2': (40, 50), 'C1': (80, 0), 'X': (0, 57)},
-    #28
-    'a221o_2': {'A1': (-80, 50), 'A2': (-40, 50), 'B1': (0, 50), 'B2': (40, 50), 'C1': (80, 0), 'X': (0, 57)},
-    #29
-    'a221o_4': {'A1': (-80, 50), 'A2': (-40, 50), 'B1': (0, 50), 'B2': (40, 50), 'C1': (80, 0), 'X': (0, 57)},
-    #30
-    'a221oi_1': {'A1': (-80, 50), 'A2': (-40, 50), 'B1': (0, 50), 'B2': (40, 50), 'C1': (80, 0), 'Y': (0, 67)},
-    #31
-    'a221oi_2': {'A1': (-80, 50), 'A2': (-40, 50), 'B1': (0, 50), 'B2': (40, 50), 'C1': (80, 0), 'Y': (0, 67)},
-    #32
-    'a221oi_4': {'A1': (-80, 50), 'A2': (-40, 50), 'B1': (0, 50), 'B2': (40, 50), 'C1': (80, 0), 'Y': (0, 67)},
-    #33
-    'a222oi_1': {'A1': (-100, 50), 'A2': (-60, 50), 'B1': (-20, 50), 'B2': (20, 50), 'C1': (60, 50), 'C2': (100, 50), 'Y': (0, 67)},
-    #34
-    'a22o_1': {'A1': (-60, 50), 'A2': (-20, 50), 'B1': (20, 50), 'B2': (60, 50), 'X': (0, 57)},
-    #35
-    'a22o_2': {'A1': (-60, 50), 'A2': (-20, 50), 'B1': (20, 50), 'B2': (60, 50), 'X': (0, 57)},
-    #36
-    'a22o_4': {'A1': (-60, 50), 'A2': (-20, 50), 'B1': (20, 50), 'B2': (60, 50), 'X': (0, 57)},
-    #37
-    'a22oi_1': {'A1': (-60, 50), 'A2': (-20, 50), 'B1': (20, 50), 'B2': (60, 50), 'Y': (0, 67)},
-    #38
-    'a22oi_2': {'A1': (-60, 50), 'A2': (-20, 50), 'B1': (20, 50), 'B2': (60, 50), 'Y': (0, 67)},
-    #39
-    'a22oi_4': {'A1': (-60, 50), 'A2': (-20, 50), 'B1': (20, 50), 'B2': (60, 50), 'Y': (0, 67)},
-    #40
-    'a2bb2o_1': {'A1_N': (-60, 50), 'A2_N': (-20, 50), 'B1': (20, 50), 'B2': (60, 50), 'X': (0, 57)},
-    #41
-    'a2bb2o_2': {'A1_N': (-60, 50), 'A2_N': (-20, 50), 'B1': (20, 50), 'B2': (60, 50), 'X': (0, 57)},
-    #42
-    'a2bb2o_4': {'A1_N': (-60, 50), 'A2_N': (-20, 50), 'B1': (20, 50), 'B2': (60, 50), 'X': (0, 57)},
-    #43
-    'a2bb2oi_1': {'A1_N': (-60, 50), 'A2_N': (-20, 50), 'B1': (20, 50), 'B2': (60, 50), 'Y': (0, 67)},
-    #44
-    'a2bb2oi_2': {'A1_N': (-60, 50), 'A2_N': (-20, 50), 'B1': (20, 50), 'B2': (60, 50), 'Y': (0, 67)},
-    #45
-    'a2bb2oi_4': {'A1_N': (-60, 50), 'A2_N': (-20, 50), 'B1': (20, 50), 'B2': (60, 50), 'Y': (0, 67)},
-    #46
-    'a311o_1': {'A1': (-80, 60), 'A2': (-40, 50), 'A3': (0, 60), 'B1': (40, 20), 'C1': (80, 10), 'X': (0, 57)},
-    #47
-    'a311o_2': {'A1': (-80, 60), 'A2': (-40, 50), 'A3': (0, 60), 'B1': (40, 20), 'C1': (80, 10), 'X': (0, 57)},
-    #48
-    'a311o_4': {'A1': (-80, 60), 'A2': (-40, 50), 'A3': (0, 60), 'B1': (40, 20), 'C1': (80, 10), 'X': (0, 57)},
-    #49
-    'a311oi_1': {'A1': (-80, 60), 'A2': (-40, 50), 'A3': (0, 60), 'B1': (40, 20), 'C1': (80, 10), 'Y': (0, 67)},
-    #50
-    'a311oi_2': {'A1': (-80, 60), 'A2': (-40, 50), 'A3': (0, 60), 'B1': (40, 20), 'C1': (80, 10), 'Y': (0, 67)},
-    #51
-    'a311oi_4': {'A1': (-80, 60), 'A2': (-40, 50), 'A3': (0, 60), 'B1': (40, 20), 'C1': (80, 10), 'Y': (0, 67)},
-    #52
-    'a31o_1': {'A1': (-60, 60), 'A2': (-20, 50), 'A3': (20, 60), 'B1': (60, 20), 'X': (0, 57)},
-    #53
-    'a31o_2': {'A1': (-60, 60), 'A2': (-20, 50), 'A3': (20, 60), 'B1': (60, 20), 'X': (0, 57)},
-    #54
-    'a31o_4': {'A1': (-60, 60), 'A2': (-20, 50), 'A3': (20, 60), 'B1': (60, 20), 'X': (0, 57)},
-    #55
-    'a31oi_1': {'A1': (-60, 60), 'A2': (-20, 50), 'A3': (20, 60), 'B1': (60, 20), 'Y': (0, 67)},
-    #56
-    'a31oi_2': {'A1': (-60, 60), 'A2': (-20, 50), 'A3': (20, 60), 'B1': (60, 20), 'Y': (0, 67)},
-    #57
-    'a31oi_4': {'A1': (-60, 60), 'A2': (-20, 50), 'A3': (20, 60), 'B1': (60, 20), 'Y': (0, 67)},
-    #58
-    'a32o_1': {'A1': (-80, 60), 'A2': (-40, 50), 'A3': (0, 60), 'B1': (40, 10), 'B2': (80, 0), 'X': (0, 57)},
-    #59
-    'a32o_2': {'A1': (-80, 60), 'A2': (-40, 50), 'A3': (0, 60), 'B1': (40, 10), 'B2': (80, 0), 'X': (0, 57)},
-    #60
-    'a32o_4': {'A1': (-80, 60), 'A2': (-40, 50), 'A3': (0, 60), 'B1': (40, 10), 'B2': (80, 0), 'X': (0, 57)},
-    #61
-    'a32oi_1': {'A1': (-80, 60), 'A2': (-40, 48), 'A3': (0, 60), 'B1': (40, 52), 'B2': (80, 52), 'Y': (0, 67)},
-    #62
-    'a32oi_2': {'A1': (-80, 60), 'A2': (-40, 48), 'A3': (0, 60), 'B1': (40, 52), 'B2': (80, 52), 'Y': (0, 67)},
-    #63
-    'a32oi_4': {'A1': (-80, 60), 'A2': (-40, 48), 'A3': (0, 60), 'B1': (40, 52), 'B2': (80, 52), 'Y': (0, 67)},
-    #64
-    'a41o_1': {'A1': (-80, 55), 'A2': (-40, 60), 'A3': (0, 60), 'A4': (40, 55), 'B1': (70, 20), 'X': (0, 57)},
-    #65
-    'a41o_2': {'A1': (-80, 55), 'A2': (-40, 60), 'A3': (0, 60), 'A4': (40, 55), 'B1': (70, 20), 'X': (0, 57)},
-    #66
-    'a41o_4': {'A1': (-80, 55), 'A2': (-40, 60), 'A3': (0, 60), 'A4': (40, 55), 'B1': (70, 20), 'X': (0, 57)},
-    #67
-    'a41oi_1': {'A1': (-80, 55), 'A2': (-40, 60), 'A3': (0, 60), 'A4': (40, 55), 'B1': (70, 20), 'Y': (0, 67)},
-    #68
-    'a41oi_2': {'A1': (-80, 55), 'A2': (-40, 60), 'A3': (0, 60), 'A4': (40, 55), 'B1': (70, 20), 'Y': (0, 67)},
-    #69
-    'a41oi_4': {'A1': (-80, 55), 'A2': (-40, 60), 'A3': (0, 60), 'A4': (40, 55), 'B1': (70, 20), 'Y': (0, 67)},
-    #70
-    'and2_0': {'A': (-20, 30), 'B': (20, 30), 'X': (0, 35)},
-    #71
-    'and2_1': {'A': (-20, 30), 'B': (20, 30), 'X': (0, 35)},
-    #72
-    'and2_2': {'A': (-20, 30), 'B': (20, 30), 'X': (0, 35)},
-    #73
-    'and2_4': {'A': (-20, 30), 'B': (20, 30), 'X': (0, 35)},
-    #74
-    'and2b_1': {'A_N': (-20, 40), 'B': (20, 30), 'X': (0, 35)},
-    #75
-    'and2b_2': {'A_N': (-20, 40), 'B': (20, 30), 'X': (0, 35)},
-    #76
-    'and2b_4': {'A_N': (-20, 40), 'B': (20, 30), 'X': (0, 35)},
-    #77
-    'and3_1': {'A': (-40, 40), 'B': (0, 30), 'C': (40, 40), 'X': (0, 35)},
-    #78
-    'and3_2': {'A': (-40, 40), 'B': (0, 30), 'C': (40, 40), 'X': (0, 35)},
-    #79
-    'and3_4': {'A': (-40, 40), 'B': (0, 30), 'C': (40, 40), 'X': (0, 35)},
-    #80
-    'and3b_1': {'A_N': (-40, 40), 'B': (0, 30), 'C': (40, 40), 'X': (0, 35)},
-    #81
-    'and3b_2': {'A_N': (-40, 40), 'B': (0, 30), 'C': (40, 40), 'X': (0, 35)},
-    #82
-    'and3b_4': {'A_N': (-40, 40), 'B': (0, 30), 'C': (40, 40), 'X': (0, 35)},
-    #83
-    'and4_1': {'A': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'X': (0, 35)},
-    #84
-    'and4_2': {'A': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'X': (0, 35)},
-    #85
-    'and4_4': {'A': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'X': (0, 35)},
-    #86
-    'and4b_1': {'A_N': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'X': (0, 35)},
-    #87
-    'and4b_2': {'A_N': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'X': (0, 35)},
-    #88
-    'and4b_4': {'A_N': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'X': (0, 35)},
-    #89
-    'and4bb_1': {'A_N': (-60, 40), 'B_N': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'X': (0, 35)},
-    #90
-    'and4bb_2': {'A_N': (-60, 40), 'B_N': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'X': (0, 35)},
-    #91
-    'and4bb_4': {'A_N': (-60, 40), 'B_N': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'X': (0, 35)},
-    #92
-    'buf_1': {'A': (0, 40), 'X': (0, 40)},
-    #93
-    'buf_12': {'A': (0, 40), 'X': (0, 40)},
-    #94
-    'buf_16': {'A': (0, 40), 'X': (0, 40)},
-    #95
-    'buf_2': {'A': (0, 40), 'X': (0, 40)},
-    #96
-    'buf_4': {'A': (0, 40), 'X': (0, 40)},
-    #97
-    'buf_6': {'A': (0, 40), 'X': (0, 40)},
-    #98
-    'buf_8': {'A': (0, 40), 'X': (0, 40)},
-    #99
-    'bufbuf_16': {'A': (0, 40), 'X': (0, 40)},
-    #100
-    'bufbuf_8': {'A': (0, 40), 'X': (0, 40)},
-    #101
-    'bufinv_16': {'A': (0, 40), 'Y': (0, 40)},
-    #102
-    'bufinv_8': {'A': (0, 40), 'Y': (0, 40)},
-    #103
-    'clkbuf_1': {'A': (0, 40), 'X': (0, 40)},
-    #104
-    'clkbuf_16': {'A': (0, 40), 'X': (0, 40)},
-    #105
-    'clkbuf_2': {'A': (0, 40), 'X': (0, 40)},
-    #106
-    'clkbuf_4': {'A': (0, 40), 'X': (0, 40)},
-    #107
-    'clkbuf_8': {'A': (0, 40), 'X': (0, 40)},
-    #108
-    'clkdlybuf4s15_1': {'A': (0, 40), 'X': (0, 40)},
-    #109
-    'clkdlybuf4s15_2': {'A': (0, 40), 'X': (0, 40)},
-    #110
-    'clkdlybuf4s18_1': {'A': (0, 40), 'X': (0, 40)},
-    #221
-    'lpflow_decapkapwr_12': {},
-    #222
-    'lpflow_decapkapwr_3': {},
-    #223
-    'lpflow_decapkapwr_4': {},
-    #224
-    'lpflow_decapkapwr_6': {},
-    #225
-    'lpflow_decapkapwr_8': {},
-    #226
-    'lpflow_inputiso0n_1': {'A': (-10, 70), 'SLEEP_B': (10, 70), 'X': (-10, 70)},
-    #227
-    'lpflow_inputiso0p_1': {'A': (-10, 70), 'SLEEP': (10, 70), 'X': (-10, 70)},
-    #228
-    'lpflow_inputiso1n_1': {'A': (-10, 70), 'SLEEP_B': (10, 70), 'X': (-10, 70)},
-    #229
-    'lpflow_inputiso1p_1': {'A': (-10, 70), 'SLEEP': (10, 70), 'X': (-10, 70)},
-    #230
-    'lpflow_inputisolatch_1': {'D': (-10, 70), 'SLEEP_B': (10, 70), 'Q': (-10, 70)},
-    #231
-    'lpflow_isobufsrc_1': {'A': (-10, 70), 'SLEEP': (10, 70), 'X': (-10, 70)},
-    #232
-    'lpflow_isobufsrc_16': {'A': (-10, 70), 'SLEEP': (10, 70), 'X': (-10, 70)},
-    #233
-    'lpflow_isobufsrc_2': {'A': (-10, 70), 'SLEEP': (10, 70), 'X': (-10, 70)},
-    #234
-    'lpflow_isobufsrc_4': {'A': (-10, 70), 'SLEEP': (10, 70), 'X': (-10, 70)},
-    #235
-    'lpflow_isobufsrc_8': {'A': (-10, 70), 'SLEEP': (10, 70), 'X': (-10, 70)},
-    #236
-    'lpflow_isobufsrckapwr_16': {'A': (-20, 70), 'SLEEP': (0, 70), 'KAPWR': (20, 70), 'X': (-20, 70)},
-    #237
-    'lpflow_lsbuf_lh_hl_isowell_tap_1': {'A': (-10, 70), 'X': (-10, 70)},
-    #238
-    'lpflow_lsbuf_lh_hl_isowell_tap_2': {'A': (-10, 70), 'X': (-10, 70)},
-    #239
-    'lpflow_lsbuf_lh_hl_isowell_tap_4': {'A': (-10, 70), 'X': (-10, 70)},
-    #240
-    'lpflow_lsbuf_lh_isowell_4': {'A': (-10, 70), 'X': (-10, 70)},
-    #241
-    'lpflow_lsbuf_lh_isowell_tap_1': {'A': (-10, 70), 'X': (-10, 70)},
-    #242
-    'lpflow_lsbuf_lh_isowell_tap_2': {'A': (-10, 70), 'X': (-10, 70)},
-    #243
-    'lpflow_lsbuf_lh_isowell_tap_4': {'A': (-10, 70), 'X': (-10, 70)},
-    #244
-    'macro_sparecell': {'LO': (0, 70)},
-    #245
-    'maj3_1': {'A': (-40, 40), 'B': (0, 40), 'C': (40, 40), 'X': (0, 40)},
-    #246
-    'maj3_2': {'A': (-40, 40), 'B': (0, 40), 'C': (40, 40), 'X': (0, 40)},
-    #247
-    'maj3_4': {'A': (-40, 40), 'B': (0, 40), 'C': (40, 40), 'X': (0, 40)},
-    #248
-    'mux2_1': {'A0': (-20, 20), 'A1': (20, 20), 'S': (60, 0), 'X': (0, 17)},
-    #249
-    'mux2_2': {'A0': (-20, 20), 'A1': (20, 20), 'S': (60, 0), 'X': (0, 17)},
-    #250
-    'mux2_4': {'A0': (-20, 20), 'A1': (20, 20), 'S': (60, 0), 'X': (0, 17)},
-    #251
-    'mux2_8': {'A0': (-20, 20), 'A1': (20, 20), 'S': (60, 0), 'X': (0, 17)},
-    #252
-    'mux2i_1': {'A0': (-20, 20), 'A1': (20, 20), 'S': (60, 0), 'Y': (0, 27)},
-    #253
-    'mux2i_2': {'A0': (-20, 20), 'A1': (20, 20), 'S': (60, 0), 'Y': (0, 27)},
-    #254
-    'mux2i_4': {'A0': (-20, 20), 'A1': (20, 20), 'S': (60, 0), 'Y': (0, 27)},
-    #255
-    'mux4_1': {'A0': (-60, 20), 'A1': (-20, 20), 'A2': (20, 20), 'A3': (60, 20), 'S0': (100, 10), 'S1': (130, 10), 'X': (0, 17)},
-    #256
-    'mux4_2': {'A0': (-60, 20), 'A1': (-20, 20), 'A2': (20, 20), 'A3': (60, 20), 'S0': (100, 10), 'S1': (130, 10), 'X': (0, 17)},
-    #257
-    'mux4_4': {'A0': (-60, 20), 'A1': (-20, 20), 'A2': (20, 20), 'A3': (60, 20), 'S0': (100, 10), 'S1': (130, 10), 'X': (0, 17)},
-    #258
-    'nand2_1': {'A': (-20, 30), 'B': (20, 30), 'Y': (0, 45)},
-    #259
-    'nand2_2': {'A': (-20, 30), 'B': (20, 30), 'Y': (0, 45)},
-    #260
-    'nand2_4': {'A': (-20, 30), 'B': (20, 30), 'Y': (0, 45)},
-    #261
-    'nand2_8': {'A': (-20, 30), 'B': (20, 30), 'Y': (0, 45)},
-    #262
-    'nand2b_1': {'A_N': (-20, 40), 'B': (20, 30), 'Y': (0, 45)},
-    #263
-    'nand2b_2': {'A_N': (-20, 40), 'B': (20, 30), 'Y': (0, 45)},
-    #264
-    'nand2b_4': {'A_N': (-20, 40), 'B': (20, 30), 'Y': (0, 45)},
-    #265
-    'nand3_1': {'A': (-40, 40), 'B': (0, 30), 'C': (40, 40), 'Y': (0, 45)},
-    #266
-    'nand3_2': {'A': (-40, 40), 'B': (0, 30), 'C': (40, 40), 'Y': (0, 45)},
-    #267
-    'nand3_4': {'A': (-40, 40), 'B': (0, 30), 'C': (40, 40), 'Y': (0, 45)},
-    #268
-    'nand3b_1': {'A_N': (-40, 40), 'B': (0, 30), 'C': (40, 40), 'Y': (0, 45)},
-    #269
-    'nand3b_2': {'A_N': (-40, 40), 'B': (0, 30), 'C': (40, 40), 'Y': (0, 45)},
-    #270
-    'nand3b_4': {'A_N': (-40, 40), 'B': (0, 30), 'C': (40, 40), 'Y': (0, 45)},
-    #271
-    'nand4_1': {'A': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'Y': (0, 45)},
-    #272
-    'nand4_2': {'A': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'Y': (0, 45)},
-    #273
-    'nand4_4': {'A': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'Y': (0, 45)},
-    #274
-    'nand4b_1': {'A_N': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'Y': (0, 45)},
-    #275
-    'nand4b_2': {'A_N': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'Y': (0, 45)},
-    #276
-    'nand4b_4': {'A_N': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'Y': (0, 45)},
-    #277
-    'nand4bb_1': {'A_N': (-60, 40), 'B_N': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'Y': (0, 45)},
-    #278
-    'nand4bb_2': {'A_N': (-60, 40), 'B_N': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'Y': (0, 45)},
-    #279
-    'nand4bb_4': {'A_N': (-60, 40), 'B_N': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'Y': (0, 45)},
-    #280
-    'nor2_1': {'A': (-20, 25), 'B': (20, 25), 'Y': (0, 45)},
-    #281
-    'nor2_2': {'A': (-20, 25), 'B': (20, 25), 'Y': (0, 45)},
-    #282
-    'nor2_4': {'A': (-20, 25), 'B': (20, 25), 'Y': (0, 45)},
-    #283
-    'nor2_8': {'A': (-20, 25), 'B': (20, 25), 'Y': (0, 45)},
-    #284
-    'nor2b_1': {'A': (-20, 25), 'B_N': (20, 35), 'Y': (0, 45)},
-    #285
-    'nor2b_2': {'A': (-20, 25), 'B_N': (20, 35), 'Y': (0, 45)},
-    #286
-    'nor2b_4': {'A': (-20, 25), 'B_N': (20, 35), 'Y': (0, 45)},
-    #287
-    'nor3_1': {'A': (-40, 40), 'B': (0, 21), 'C': (40, 40), 'Y': (0, 45)},
-    #288
-    'nor3_2': {'A': (-40, 40), 'B': (0, 21), 'C': (40, 40), 'Y': (0, 45)},
-    #289
-    'nor3_4': {'A': (-40, 40), 'B': (0, 21), 'C': (40, 40), 'Y': (0, 45)},
-    #290
-    'nor3b_1': {'A': (-40, 40), 'B': (0, 21), 'C_N': (40, 40), 'Y': (0, 45)},
-    #291
-    'nor3b_2': {'A': (-40, 40), 'B': (0, 21), 'C_N': (40, 40), 'Y': (0, 45)},
-    #292
-    'nor3b_4': {'A': (-40, 40), 'B': (0, 21), 'C_N': (40, 40), 'Y': (0, 45)},
-    #293
-    'nor4_1': {'A': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'Y': (0, 45)},
-    #294
-    'nor4_2': {'A': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'Y': (0, 45)},
-    #295
-    'nor4_4': {'A': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'Y': (0, 45)},
-    #296
-    'nor4b_1': {'A': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D_N': (60, 40), 'Y': (0, 45)},
-    #297
-    'nor4b_2': {'A': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D_N': (60, 40), 'Y': (0, 45)},
-    #298
-    'nor4b_4': {'A': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D_N': (60, 40), 'Y': (0, 45)},
-    #299
-    'nor4bb_1': {'A': (-60, 40), 'B': (-20, 45), 'C_N': (20, 45), 'D_N': (60, 40), 'Y': (0, 45)},
-    #300
-    'nor4bb_2': {'A': (-60, 40), 'B': (-20, 45), 'C_N': (20, 45), 'D_N': (60, 40), 'Y': (0, 45)},
-    #301
-    'nor4bb_4': {'A': (-60, 40), 'B': (-20, 45), 'C_N': (20, 45), 'D_N': (60, 40), 'Y': (0, 45)},
-    #302
-    'o2111a_1': {'A1': (-80, 52), 'A2': (-40, 52), 'B1': (0, 10), 'C1': (40, 20), 'D1': (80, 0), 'X': (0, 57)},
-    #303
-    'o2111a_2': {'A1': (-80, 52), 'A2': (-40, 52), 'B1': (0, 10), 'C1': (40, 20), 'D1': (80, 0), 'X': (0, 57)},
-    #304
-    'o2111a_4': {'A1': (-80, 52), 'A2': (-40, 52), 'B1': (0, 10), 'C1': (40, 20), 'D1': (80, 0), 'X': (0, 57)},
-    #305
-    'o2111ai_1': {'A1': (-80, 52), 'A2': (-40, 52), 'B1': (0, 10), 'C1': (40, 20), 'D1': (80, 0), 'Y': (0, 67)},
-    #306
-    'o2111ai_2': {'A1': (-80, 52), 'A2': (-40, 52), 'B1': (0, 10), 'C1': (40, 20), 'D1': (80, 0), 'Y': (0, 67)},
-    #307
-    'o2111ai_4': {'A1': (-80, 52), 'A2': (-40, 52), 'B1': (0, 10), 'C1': (40, 20), 'D1': (80, 0), 'Y': (0, 67)},
-    #308
-    'o211a_1': {'A1': (-60, 52), 'A2': (-20, 52), 'B1': (20, 20), 'C1': (60, 10), 'X': (0, 57)},
-    #309
-    'o211a_2': {'A1': (-60, 52), 'A2': (-20, 52), 'B1': (20, 20), 'C1': (60, 10), 'X': (0, 57)},
-    #310
-    'o211a_4': {'A1': (-60, 52), 'A2': (-20, 52), 'B1': (20, 20), 'C1': (60, 10), 'X': (0, 57)},
-    #311
-    'o211ai_1': {'A1': (-60, 52), 'A2': (-20, 52), 'B1': (20, 20), 'C1': (60, 10), 'Y': (0, 67)},
-    #312
-    'o211ai_2': {'A1': (-60, 52), 'A2': (-20, 52), 'B1': (20, 20), 'C1': (60, 10), 'Y': (0, 67)},
-    #313
-    'o211ai_4': {'A1': (-60, 52), 'A2': (-20, 52), 'B1': (20, 20), 'C1': (60, 10), 'Y': (0, 67)},
-    #314
-    'o21a_1': {'A1': (-40, 52), 'A2': (0, 52), 'B1': (40, 17), 'X': (0, 57)},
-    #315
-    'o21a_2': {'A1': (-40, 52), 'A2': (0, 52), 'B1': (40, 17), 'X': (0, 57)},
-    #316
-    'o21a_4': {'A1': (-40, 52), 'A2': (0, 52), 'B1': (40, 17), 'X': (0, 57)},
-    #317
-    'o21ai_0': {'A1': (-40, 52), 'A2': (0, 52), 'B1': (40, 17), 'Y': (0, 67)},
-    #318
-    'o21ai_1': {'A1': (-40, 52), 'A2': (0, 52), 'B1': (40, 17), 'Y': (0, 67)},
-    #319
-    'o21ai_2': {'A1': (-40, 52), 'A2': (0, 52), 'B1': (40, 17), 'Y': (0, 67)},
-    #320
-    'o21ai_4': {'A1': (-40, 52), 'A2': (0, 52), 'B1': (40, 17), 'Y': (0, 67)},
-    #321
-    'o21ba_1': {'A1': (-40, 52), 'A2': (0, 52), 'B1_N': (40, 17), 'X': (0, 57)},
-    #322
-    'o21ba_2': {'A1': (-40, 52), 'A2': (0, 52), 'B1_N': (40, 17), 'X': (0, 57)},
-    #323
-    'o21ba_4': {'A1': (-40, 52), 'A2': (0, 52), 'B1_N': (40, 17), 'X': (0, 57)},
-    #324
-    'o21bai_1': {'A1': (-40, 52), 'A2': (0, 52), 'B1_N': (40, 17), 'Y': (0, 67)},
-    #325
-    'o21bai_2': {'A1': (-40, 52), 'A2': (0, 52), 'B1_N': (40, 17), 'Y': (0, 67)},
-    #326
-    'o21bai_4': {'A1': (-40, 52), 'A2': (0, 52), 'B1_N': (40, 17), 'Y': (0, 67)},
-    #327
-    'o221a_1': {'A1': (-80, 52), 'A2': (-40, 52), 'B1': (0, 52), 'B2': (40, 52), 'C1': (80, 5), 'X': (0, 57)},
-    #328
-    'o221a_2': {'A1': (-80, 52), 'A2': (-40, 52), 'B1': (0, 52), 'B2': (40, 52), 'C1': (80, 5), 'X': (0, 57)},
-    #329
-    'o221a_4': {'A1': (-80, 52), 'A2': (-40, 52), 'B1': (0, 52), 'B2': (40, 52), 'C1': (80, 5), 'X': (0, 57)},
-    #330
-    'o221ai_1': {'A1': (-80, 52), 'A2': (-40, 52), 'B1': (0, 52), 'B2': (40, 52), 'C1': (80, 5), 'Y': (0, 67)},
-    #331
-    'o221ai_2': {'A1': (-80, 52), 'A2': (-40, 52), 'B1': (0, 52), 'B2': (40, 52), 'C1': (80, 5), 'Y': (0, 67)},
-    #332
-    'o221ai_4': {'A1': (-80, 52), 'A2': (-40, 52), 'B1': (0, 52), 'B2': (40, 52), 'C1': (80, 5), 'Y': (0, 67)},
-    #333
-    'o22a_1': {'A1': (-60, 52), 'A2': (-20, 52), 'B1': (20, 52), 'B2': (60, 52), 'X': (0, 57)},
-    #334
-    'o22a_2': {'A1': (-60, 52), 'A2': (-20, 52), 'B1': (20, 52), 'B2': (60, 52), 'X': (0, 57)},
-    #335
-    'o22a_4': {'A1': (-60, 52), 'A2': (-20, 52), 'B1': (20, 52), 'B2': (60, 52), 'X': (0, 57)},
-    #336
-    'o22ai_1': {'A1': (-60, 52), 'A2': (-20, 52), 'B1': (20, 52), 'B2': (60, 52), 'Y': (0, 67)},
-    #337
-    'o22ai_2': {'A1': (-60, 52), 'A2': (-20, 52), 'B1': (20, 52), 'B2': (60, 52), 'Y': (0, 67)},
-    #338
-    'o22ai_4': {'A1': (-60, 52), 'A2': (-20, 52), 'B1': (20, 52), 'B2': (60, 52), 'Y': (0, 67)},
-    #339
-    'o2bb2a_1': {'A1_N': (-60, 62), 'A2_N': (-20, 62), 'B1': (20, 52), 'B2': (60, 52), 'X': (0, 57)},
-    #340
-    'o2bb2a_2': {'A1_N': (-60, 62), 'A2_N': (-20, 62), 'B1': (20, 52), 'B2': (60, 52), 'X': (0, 57)},
-    #341
-    'o2bb2a_4': {'A1_N': (-60, 62), 'A2_N': (-20, 62), 'B1': (20, 52), 'B2': (60, 52), 'X': (0, 57)},
-    #342
-    'o2bb2ai_1': {'A1_N': (-60, 62), 'A2_N': (-20, 62), 'B1': (20, 52), 'B2': (60, 52), 'Y': (0, 67)},
-    #343
-    'o2bb2ai_2': {'A1_N': (-60, 62), 'A2_N': (-20, 62), 'B1': (20, 52), 'B2': (60, 52), 'Y': (0, 67)},
-    #344
-    'o2bb2ai_4': {'A1_N': (-60, 62), 'A2_N': (-20, 62), 'B1': (20, 52), 'B2': (60, 52), 'Y': (0, 67)},
-    #345
-    'o311a_1': {'A1': (-80, 60), 'A2': (-40, 43), 'A3': (0, 60), 'B1': (40, 20), 'C1': (80, 10), 'X': (0, 57)},
-    #346
-    'o311a_2': {'A1': (-80, 60), 'A2': (-40, 43), 'A3': (0, 60), 'B1': (40, 20), 'C1': (80, 10), 'X': (0, 57)},
-    #347
-    'o311a_4': {'A1': (-80, 60), 'A2': (-40, 43), 'A3': (0, 60), 'B1': (40, 20), 'C1': (80, 10), 'X': (0, 57)},
-    #348
-    'o311ai_0': {'A1': (-80, 60), 'A2': (-40, 43), 'A3': (0, 60), 'B1': (40, 20), 'C1': (80, 10), 'Y': (0, 67)},
-    #349
-    'o311ai_1': {'A1': (-80, 60), 'A2': (-40, 43), 'A3': (0, 60), 'B1': (40, 20), 'C1': (80, 10), 'Y': (0, 67)},
-    #350
-    'o311ai_2': {'A1': (-80, 60), 'A2': (-40, 43), 'A3': (0, 60), 'B1': (40, 20), 'C1': (80, 10), 'Y': (0, 67)},
-    #351
-    'o311ai_4': {'A1': (-80, 60), 'A2': (-40, 43), 'A3': (0, 60), 'B1': (40, 20), 'C1': (80, 10), 'Y': (0, 67)},
-    #352
-    'o31a_1': {'A1': (-60, 60), 'A2': (-20, 43), 'A3': (20, 60), 'B1': (60, 20), 'X': (0, 57)},
-    #353
-    'o31a_2': {'A1': (-60, 60), 'A2': (-20, 43), 'A3': (20, 60), 'B1': (60, 20), 'X': (0, 57)},
-    #354
-    'o31a_4': {'A1': (-60, 60), 'A2': (-20, 43), 'A3': (20, 60), 'B1': (60, 20), 'X': (0, 57)},
-    #355
-    'o31ai_1': {'A1': (-60, 60), 'A2': (-20, 43), 'A3': (20, 60), 'B1': (60, 20), 'Y': (0, 67)},
-    #356
-    'o31ai_2': {'A1': (-60, 60), 'A2': (-20, 43), 'A3': (20, 60), 'B1': (60, 20), 'Y': (0, 67)},
-    #357
-    'o31ai_4': {'A1': (-60, 60), 'A2': (-20, 43), 'A3': (20, 60), 'B1': (60, 20), 'Y': (0, 67)},
-    #358
-    'o32a_1': {'A1': (-80, 60), 'A2': (-40, 48), 'A3': (0, 60), 'B1': (40, 52), 'B2': (80, 52), 'X': (0, 57)},
-    #359
-    'o32a_2': {'A1': (-80, 60), 'A2': (-40, 48), 'A3': (0, 60), 'B1': (40, 52), 'B2': (80, 52), 'X': (0, 57)},
-    #360
-    'o32a_4': {'A1': (-80, 60), 'A2': (-40, 48), 'A3': (0, 60), 'B1': (40, 52), 'B2': (80, 52), 'X': (0, 57)},
-    #361
-    'o32ai_1': {'A1': (-80, 60), 'A2': (-40, 48), 'A3': (0, 60), 'B1': (40, 52), 'B2': (80, 52), 'Y': (0, 67)},
-    #362
-    'o32ai_2': {'A1': (-80, 60), 'A2': (-40, 48), 'A3': (0, 60), 'B1': (40, 52), 'B2': (80, 52), 'Y': (0, 67)},
-    #363
-    'o32ai_4': {'A1': (-80, 60), 'A2': (-40, 48), 'A3': (0, 60), 'B1': (40, 52), 'B2': (80, 52), 'Y': (0, 67)},
-    #364
-    'o41a_1': {'A1': (-80, 57), 'A2': (-40, 65), 'A3': (0, 65), 'A4': (40, 57), 'B1': (80, 20), 'X': (0, 57)},
-    #365
-    'o41a_2': {'A1': (-80, 57), 'A2': (-40, 65), 'A3': (0, 65), 'A4': (40, 57), 'B1': (80, 20), 'X': (0, 57)},
-    #366
-    'o41a_4': {'A1': (-80, 57), 'A2': (-40, 65), 'A3': (0, 65), 'A4': (40, 57), 'B1': (80, 20), 'X': (0, 57)},
-    #367
-    'o41ai_1': {'A1': (-80, 57), 'A2': (-40, 65), 'A3': (0, 65), 'A4': (40, 57), 'B1': (80, 20), 'Y': (0, 67)},
-    #368
-    'o41ai_2': {'A1': (-80, 57), 'A2': (-40, 65), 'A3': (0, 65), 'A4': (40, 57), 'B1': (80, 20), 'Y': (0, 67)},
-    #369
-    'o41ai_4': {'A1': (-80, 57), 'A2': (-40, 65), 'A3': (0, 65), 'A4': (40, 57), 'B1': (80, 20), 'Y': (0, 67)},
-    #370
-    'or2_0': {'A': (-20, 25), 'B': (20, 25), 'X': (0, 35)},
-    #371
-    'or2_1': {'A': (-20, 25), 'B': (20, 25), 'X': (0, 35)},
-    #372
-    'or2_2': {'A': (-20, 25), 'B': (20, 25), 'X': (0, 35)},
-    #373
-    'or2_4': {'A': (-20, 25), 'B': (20, 25), 'X': (0, 35)},
-    #374
-    'or2b_1': {'A': (-20, 35), 'B_N': (20, 35), 'X': (0, 35)},
-    #375
-    'or2b_2': {'A': (-20, 35), 'B_N': (20, 35), 'X': (0, 35)},
-    #376
-    'or2b_4': {'A': (-20, 35), 'B_N': (20, 35), 'X': (0, 35)},
-    #377
-    'or3_1': {'A': (-40, 35), 'B': (0, 21), 'C': (40, 35), 'X': (0, 35)},
-    #378
-    'or3_2': {'A': (-40, 35), 'B': (0, 21), 'C': (40, 35), 'X': (0, 35)},
-    #379
-    'or3_4': {'A': (-40, 35), 'B': (0, 21), 'C': (40, 35), 'X': (0, 35)},
-    #380
-    'or3b_1': {'A': (-40, 35), 'B': (0, 21), 'C_N': (40, 40), 'X': (0, 35)},
-    #381
-    'or3b_2': {'A': (-40, 35), 'B': (0, 21), 'C_N': (40, 40), 'X': (0, 35)},
-    #382
-    'or3b_4': {'A': (-40, 35), 'B': (0, 21), 'C_N': (40, 40), 'X': (0, 35)},
-    #383
-    'or4_1': {'A': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'X': (0, 35)},
-    #384
-    'or4_2': {'A': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'X': (0, 35)},
-    #385
-    'or4_4': {'A': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'X': (0, 35)},
-    #386
-    'or4b_1': {'A': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D_N': (60, 40), 'X': (0, 35)},
-    #387
-    'or4b_2': {'A': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D_N': (60, 40), 'X': (0, 35)},
-    #388
-    'or4b_4': {'A': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D_N': (60, 40), 'X': (0, 35)},
-    #389
-    'or4bb_1': {'A': (-60, 40), 'B': (-20, 45), 'C_N': (20, 45), 'D_N': (60, 40), 'X': (0, 35)},
-    #390
-    'or4bb_2': {'A': (-60, 40), 'B': (-20, 45), 'C_N': (20, 45), 'D_N': (60, 40), 'X': (0, 35)},
-    #391
-    'or4bb_4': {'A': (-60, 40), 'B': (-20, 45), 'C_N': (20, 45), 'D_N': (60, 40), 'X': (0, 35)},
-    #392
-    'probe_p_8': {'A': (0, 70), 'X': (0, 70)},
-    #393
-    'probec_p_8': {'A': (0, 70), 'X': (0, 70)},
-    #394
-    'sdfbbn_1': {'CLK_N': (-50, 70), 'D': (-30, 70), 'RESET_B': (-10, 70), 'SCD': (10, 70), 'SCE': (30, 70), 'SET_B': (50, 70), 'Q': (-50, 70), 'Q_N': (-30, 70)},
-    #395
-    'sdfbbn_2': {'CLK_N': (-50, 70), 'D': (-30, 70), 'RESET_B': (-10, 70), 'SCD': (10, 70), 'SCE': (30, 70), 'SET_B': (50, 70), 'Q': (-50, 70), 'Q_N': (-30, 70)},
-    #396
-    'sdfbbp_1': {'CLK': (-50, 70), 'D': (-30, 70), 'RESET_B': (-10, 70), 'SCD': (10, 70), 'SCE': (30, 70), 'SET_B': (50, 70), 'Q': (-50, 70), 'Q_N': (-30, 70)},
-    #397
-    'sdfrbp_1': {'CLK': (-40, 70), 'D': (-20, 70), 'RESET_B': (0, 70), 'SCD': (20, 70), 'SCE': (40, 70), 'Q': (-40, 70), 'Q_N': (-20, 70)},
-    #398
-    'sdfrbp_2': {'CLK': (-40, 70), 'D': (-20, 70), 'RESET_B': (0, 70), 'SCD': (20, 70), 'SCE': (40, 70), 'Q': (-40, 70), 'Q_N': (-20, 70)},
-    #399
-    'sdfrtn_1': {'CLK_N': (-40, 70), 'D': (-20, 70), 'RESET_B': (0, 70), 'SCD': (20, 70), 'SCE': (40, 70), 'Q': (-40, 70)},
-    #400
-    'sdfrtp_1': {'CLK': (-40, 70), 'D': (-20, 70), 'RESET_B': (0, 70), 'SCD': (20, 70), 'SCE': (40, 70), 'Q': (-40, 70)},
-    #401
-    'sdfrtp_2': {'CLK': (-40, 70), 'D': (-20, 70), 'RESET_B': (0, 70), 'SCD': (20, 70), 'SCE': (40, 70), 'Q': (-40, 70)},
-    #402
-    'sdfrtp_4': {'CLK': (-40, 70), 'D': (-20, 70), 'RESET_B': (0, 70), 'SCD': (20, 70), 'SCE': (40, 70), 'Q': (-40, 70)},
-    #403
-    'sdfsbp_1': {'CLK': (-40, 70), 'D': (-20, 70), 'SCD': (0, 70), 'SCE': (20, 70), 'SET_B': (40, 70), 'Q': (-40, 70), 'Q_N': (-20, 70)},
-    #404
-    'sdfsbp_2': {'CLK': (-40, 70), 'D': (-20, 70), 'SCD': (0, 70), 'SCE': (20, 70), 'SET_B': (40, 70), 'Q': (-40, 70), 'Q_N': (-20, 70)},
-    #405
-    'sdfstp_1': {'CLK': (-40, 70), 'D': (-20, 70), 'SCD': (0, 70), 'SCE': (20, 70), 'SET_B': (40, 70), 'Q': (-40, 70)},
-    #406
-    'sdfstp_2': {'CLK': (-40, 70), 'D': (-20, 70), 'SCD': (0, 70), 'SCE': (20, 70), 'SET_B': (40, 70), 'Q': (-40, 70)},
-    #407
-    'sdfstp_4': {'CLK': (-40, 70), 'D': (-20, 70), 'SCD': (0, 70), 'SCE': (20, 70), 'SET_B': (40, 70), 'Q': (-40, 70)},
-    #408
-    'sdfxbp_1': {'CLK': (-30, 70), 'D': (-10, 70), 'SCD': (10, 70), 'SCE': (30, 70), 'Q': (-30, 70), 'Q_N': (-10, 70)},
-    #409
-    'sdfxbp_2': {'CLK': (-30, 70), 'D': (-10, 70), 'SCD': (10, 70), 'SCE': (30, 70), 'Q': (-30, 70), 'Q_N': (-10, 70)},
-    #410
-    'sdfxtp_1': {'CLK': (-30, 70), 'D': (-10, 70), 'SCD': (10, 70), 'SCE': (30, 70), 'Q': (-30, 70)},
-    #411
-    'sdfxtp_2': {'CLK': (-30, 70), 'D': (-10, 70), 'SCD': (10, 70), 'SCE': (30, 70), 'Q': (-30, 70)},
-    #412
-    'sdfxtp_4': {'CLK': (-30, 70), 'D': (-10, 70), 'SCD': (10, 70), 'SCE': (30, 70), 'Q': (-30, 70)},
-    #413
-    'sdlclkp_1': {'CLK': (-20, 70), 'GATE': (0, 70), 'SCE': (20, 70), 'GCLK': (-20, 70)},
-    #414
-    'sdlclkp_2': {'CLK': (-20, 70), 'GATE': (0, 70), 'SCE': (20, 70), 'GCLK': (-20, 70)},
-    #415
-    'sdlclkp_4': {'CLK': (-20, 70), 'GATE': (0, 70), 'SCE': (20, 70), 'GCLK': (-20, 70)},
-    #416
-    'sedfxbp_1': {'CLK': (-40, 70), 'D': (-20, 70), 'DE': (0, 70), 'SCD': (20, 70), 'SCE': (40, 70), 'Q': (-40, 70), 'Q_N': (-20, 70)},
-    #417
-    'sedfxbp_2': {'CLK': (-40, 70), 'D': (-20, 70), 'DE': (0, 70), 'SCD': (20, 70), 'SCE': (40, 70), 'Q': (-40, 70), 'Q_N': (-20, 70)},
-    #418
-    'sedfxtp_1': {'CLK': (-40, 70), 'D': (-20, 70), 'DE': (0, 70), 'SCD': (20, 70), 'SCE': (40, 70), 'Q': (-40, 70)},
-    #419
-    'sedfxtp_2': {'CLK': (-40, 70), 'D': (-20, 70), 'DE': (0, 70), 'SCD': (20, 70), 'SCE': (40, 70), 'Q': (-40, 70)},
-    #420
-    'sedfxtp_4': {'CLK': (-40, 70), 'D': (-20, 70), 'DE': (0, 70), 'SCD': (20, 70), 'SCE': (40, 70), 'Q': (-40, 70)},
-    #421
-    'tap_1': {},
-    #422
-    'tap_2': {},
-    #423
-    'tapvgnd2_1': {},
-    #424
-    'tapvgnd_1': {},
-    #425
-    'tapvpwrvgnd_1': {},
-    #426
-    'xnor2_1': {'A': (-20, 35), 'B': (20, 35), 'Y': (0, 45)},
-    #427
-    'xnor2_2': {'A': (-20, 35), 'B': (20, 35), 'Y': (0, 45)},
-    #428
-    'xnor2_4': {'A': (-20, 35), 'B': (20, 35), 'Y': (0, 45)},
-    #429
-    'xnor3_1': {'A': (-40, 45), 'B': (0, 31.4), 'C': (40, 45), 'X': (0, 45)},
-    #430
-    'xnor3_2': {'A': (-40, 45), 'B': (0, 31.4), 'C': (40, 45), 'X': (0, 45)},
-    #431
-    'xnor3_4': {'A': (-40, 45), 'B': (0, 31.4), 'C': (40, 45), 'X': (0, 45)},
-    #432
-    'xor2_1': {'A': (-20, 35), 'B': (20, 35), 'X': (0, 35)},
-    #433
-    'xor2_2': {'A': (-20, 35), 'B': (20, 35), 'X': (0, 35)},
-    #434
-    'xor2_4': {'A': (-20, 35), 'B': (20, 35), 'X': (0, 35)},
-    #435
-    'xor3_1': {'A': (-40, 45), 'B': (0, 31.4), 'C': (40, 45), 'X': (0, 35)},
-    #436
-    'xor3_2': {'A': (-40, 45), 'B': (0, 31.4), 'C': (40, 45), 'X': (0, 35)},
-    #437
-    'xor3_4': {'A': (-40, 45), 'B': (0, 31.4), 'C': (40, 45), 'X': (0, 35)},
-}
\ No newline at end of file
+import os
+import marshal
+import hashlib
+from collections.abc import Mapping
+
+# Banco com as medidas internas dos .sym da biblioteca digital do pdk
+# (modelo nl, sem pinos de alimentação): pino -> (dy, dx_off).
+# As variações de drive strength de uma célula (a2111o_1, _2, _4...) têm o
+# mesmo footprint, então a tabela fonte guarda a geometria uma vez por família.
+# Em uso, o banco vem de um cache compilado (marshal) em __pycache__, refeito
+# apenas quando este arquivo muda; a tabela fonte só é avaliada nesse caso.
+
+# Pinos de saída da biblioteca (nomes do modelo nl); os demais são entradas.
+# Com bibliotecas de símbolos (--sym-lib) vale a direção declarada no .sym.
+OUTPUT_PINS = frozenset({'X', 'Y', 'Z', 'Q', 'Q_N', 'GCLK', 'HI', 'LO', 'COUT', 'COUT_N', 'SUM'})
+
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "__pycache__", "sky130_db.cells")
+CACHE_FORMAT = 1
+
+
+def _source_tables():
+    """Tabela fonte: família -> (geometria dos pinos, sufixos de drive strength)."""
+    return {
+        'a2111o': ({'A1': (-80, 50), 'A2': (-40, 50), 'B1': (0, 13), 'C1': (40, 30), 'D1': (80, 7), 'X': (0, 57)}, ('1', '2', '4')),
+        'a2111oi': ({'A1': (-80, 50), 'A2': (-40, 50), 'B1': (0, 13), 'C1': (40, 30), 'D1': (80, 7), 'Y': (0, 67)}, ('0', '1', '2', '4')),
+        'a211o': ({'A1': (-60, 50), 'A2': (-20, 50), 'B1': (20, 30), 'C1': (60, 10), 'X': (0, 57)}, ('1', '2', '4')),
+        'a211oi': ({'A1': (-60, 50), 'A2': (-20, 50), 'B1': (20, 30), 'C1': (60, 10), 'Y': (0, 67)}, ('1', '2', '4')),
+        'a21bo': ({'A1': (-40, 50), 'A2': (0, 50), 'B1_N': (40, 10), 'X': (0, 57)}, ('1', '2', '4')),
+        'a21boi': ({'A1': (-40, 50), 'A2': (0, 50), 'B1_N': (40, 10), 'Y': (0, 67)}, ('0', '1', '2', '4')),
+        'a21o': ({'A1': (-40, 50), 'A2': (0, 50), 'B1': (40, 10), 'X': (0, 57)}, ('1', '2', '4')),
+        'a21oi': ({'A1': (-40, 50), 'A2': (0, 50), 'B1': (40, 10), 'Y': (0, 67)}, ('1', '2', '4')),
+        'a221o': ({'A1': (-80, 50), 'A2': (-40, 50), 'B1': (0, 50), 'B2': (40, 50), 'C1': (80, 0), 'X': (0, 57)}, ('1', '2', '4')),
+        'a221oi': ({'A1': (-80, 50), 'A2': (-40, 50), 'B1': (0, 50), 'B2': (40, 50), 'C1': (80, 0), 'Y': (0, 67)}, ('1', '2', '4')),
+        'a222oi': ({'A1': (-100, 50), 'A2': (-60, 50), 'B1': (-20, 50), 'B2': (20, 50), 'C1': (60, 50), 'C2': (100, 50), 'Y': (0, 67)}, ('1',)),
+        'a22o': ({'A1': (-60, 50), 'A2': (-20, 50), 'B1': (20, 50), 'B2': (60, 50), 'X': (0, 57)}, ('1', '2', '4')),
+        'a22oi': ({'A1': (-60, 50), 'A2': (-20, 50), 'B1': (20, 50), 'B2': (60, 50), 'Y': (0, 67)}, ('1', '2', '4')),
+        'a2bb2o': ({'A1_N': (-60, 50), 'A2_N': (-20, 50), 'B1': (20, 50), 'B2': (60, 50), 'X': (0, 57)}, ('1', '2', '4')),
+        'a2bb2oi': ({'A1_N': (-60, 50), 'A2_N': (-20, 50), 'B1': (20, 50), 'B2': (60, 50), 'Y': (0, 67)}, ('1', '2', '4')),
+        'a311o': ({'A1': (-80, 60), 'A2': (-40, 50), 'A3': (0, 60), 'B1': (40, 20), 'C1': (80, 10), 'X': (0, 57)}, ('1', '2', '4')),
+        'a311oi': ({'A1': (-80, 60), 'A2': (-40, 50), 'A3': (0, 60), 'B1': (40, 20), 'C1': (80, 10), 'Y': (0, 67)}, ('1', '2', '4')),
+        'a31o': ({'A1': (-60, 60), 'A2': (-20, 50), 'A3': (20, 60), 'B1': (60, 20), 'X': (0, 57)}, ('1', '2', '4')),
+        'a31oi': ({'A1': (-60, 60), 'A2': (-20, 50), 'A3': (20, 60), 'B1': (60, 20), 'Y': (0, 67)}, ('1', '2', '4')),
+        'a32o': ({'A1': (-80, 60), 'A2': (-40, 50), 'A3': (0, 60), 'B1': (40, 10), 'B2': (80, 0), 'X': (0, 57)}, ('1', '2', '4')),
+        'a32oi': ({'A1': (-80, 60), 'A2': (-40, 48), 'A3': (0, 60), 'B1': (40, 52), 'B2': (80, 52), 'Y': (0, 67)}, ('1', '2', '4')),
+        'a41o': ({'A1': (-80, 55), 'A2': (-40, 60), 'A3': (0, 60), 'A4': (40, 55), 'B1': (70, 20), 'X': (0, 57)}, ('1', '2', '4')),
+        'a41oi': ({'A1': (-80, 55), 'A2': (-40, 60), 'A3': (0, 60), 'A4': (40, 55), 'B1': (70, 20), 'Y': (0, 67)}, ('1', '2', '4')),
+        'and2': ({'A': (-20, 30), 'B': (20, 30), 'X': (0, 35)}, ('0', '1', '2', '4')),
+        'and2b': ({'A_N': (-20, 40), 'B': (20, 30), 'X': (0, 35)}, ('1', '2', '4')),
+        'and3': ({'A': (-40, 40), 'B': (0, 30), 'C': (40, 40), 'X': (0, 35)}, ('1', '2', '4')),
+        'and3b': ({'A_N': (-40, 40), 'B': (0, 30), 'C': (40, 40), 'X': (0, 35)}, ('1', '2', '4')),
+        'and4': ({'A': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'X': (0, 35)}, ('1', '2', '4')),
+        'and4b': ({'A_N': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'X': (0, 35)}, ('1', '2', '4')),
+        'and4bb': ({'A_N': (-60, 40), 'B_N': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'X': (0, 35)}, ('1', '2', '4')),
+        'buf': ({'A': (0, 40), 'X': (0, 40)}, ('1', '12', '16', '2', '4', '6', '8')),
+        'bufbuf': ({'A': (0, 40), 'X': (0, 40)}, ('16', '8')),
+        'bufinv': ({'A': (0, 40), 'Y': (0, 40)}, ('16', '8')),
+        'clkbuf': ({'A': (0, 40), 'X': (0, 40)}, ('1', '16', '2', '4', '8')),
+        'clkdlybuf4s15': ({'A': (0, 40), 'X': (0, 40)}, ('1', '2')),
+        'clkdlybuf4s18': ({'A': (0, 40), 'X': (0, 40)}, ('1',)),
+        'lpflow_decapkapwr': ({}, ('12', '3', '4', '6', '8')),
+        'lpflow_inputiso0n': ({'A': (-10, 70), 'SLEEP_B': (10, 70), 'X': (-10, 70)}, ('1',)),
+        'lpflow_inputiso0p': ({'A': (-10, 70), 'SLEEP': (10, 70), 'X': (-10, 70)}, ('1',)),
+        'lpflow_inputiso1n': ({'A': (-10, 70), 'SLEEP_B': (10, 70), 'X': (-10, 70)}, ('1',)),
+        'lpflow_inputiso1p': ({'A': (-10, 70), 'SLEEP': (10, 70), 'X': (-10, 70)}, ('1',)),
+        'lpflow_inputisolatch': ({'D': (-10, 70), 'SLEEP_B': (10, 70), 'Q': (-10, 70)}, ('1',)),
+        'lpflow_isobufsrc': ({'A': (-10, 70), 'SLEEP': (10, 70), 'X': (-10, 70)}, ('1', '16', '2', '4', '8')),
+        'lpflow_isobufsrckapwr': ({'A': (-20, 70), 'SLEEP': (0, 70), 'KAPWR': (20, 70), 'X': (-20, 70)}, ('16',)),
+        'lpflow_lsbuf_lh_hl_isowell_tap': ({'A': (-10, 70), 'X': (-10, 70)}, ('1', '2', '4')),
+        'lpflow_lsbuf_lh_isowell': ({'A': (-10, 70), 'X': (-10, 70)}, ('4',)),
+        'lpflow_lsbuf_lh_isowell_tap': ({'A': (-10, 70), 'X': (-10, 70)}, ('1', '2', '4')),
+        'macro': ({'LO': (0, 70)}, ('sparecell',)),
+        'maj3': ({'A': (-40, 40), 'B': (0, 40), 'C': (40, 40), 'X': (0, 40)}, ('1', '2', '4')),
+        'mux2': ({'A0': (-20, 20), 'A1': (20, 20), 'S': (60, 0), 'X': (0, 17)}, ('1', '2', '4', '8')),
+        'mux2i': ({'A0': (-20, 20), 'A1': (20, 20), 'S': (60, 0), 'Y': (0, 27)}, ('1', '2', '4')),
+        'mux4': ({'A0': (-60, 20), 'A1': (-20, 20), 'A2': (20, 20), 'A3': (60, 20), 'S0': (100, 10), 'S1': (130, 10), 'X': (0, 17)}, ('1', '2', '4')),
+        'nand2': ({'A': (-20, 30), 'B': (20, 30), 'Y': (0, 45)}, ('1', '2', '4', '8')),
+        'nand2b': ({'A_N': (-20, 40), 'B': (20, 30), 'Y': (0, 45)}, ('1', '2', '4')),
+        'nand3': ({'A': (-40, 40), 'B': (0, 30), 'C': (40, 40), 'Y': (0, 45)}, ('1', '2', '4')),
+        'nand3b': ({'A_N': (-40, 40), 'B': (0, 30), 'C': (40, 40), 'Y': (0, 45)}, ('1', '2', '4')),
+        'nand4': ({'A': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'Y': (0, 45)}, ('1', '2', '4')),
+        'nand4b': ({'A_N': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'Y': (0, 45)}, ('1', '2', '4')),
+        'nand4bb': ({'A_N': (-60, 40), 'B_N': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'Y': (0, 45)}, ('1', '2', '4')),
+        'nor2': ({'A': (-20, 25), 'B': (20, 25), 'Y': (0, 45)}, ('1', '2', '4', '8')),
+        'nor2b': ({'A': (-20, 25), 'B_N': (20, 35), 'Y': (0, 45)}, ('1', '2', '4')),
+        'nor3': ({'A': (-40, 40), 'B': (0, 21), 'C': (40, 40), 'Y': (0, 45)}, ('1', '2', '4')),
+        'nor3b': ({'A': (-40, 40), 'B': (0, 21), 'C_N': (40, 40), 'Y': (0, 45)}, ('1', '2', '4')),
+        'nor4': ({'A': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'Y': (0, 45)}, ('1', '2', '4')),
+        'nor4b': ({'A': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D_N': (60, 40), 'Y': (0, 45)}, ('1', '2', '4')),
+        'nor4bb': ({'A': (-60, 40), 'B': (-20, 45), 'C_N': (20, 45), 'D_N': (60, 40), 'Y': (0, 45)}, ('1', '2', '4')),
+        'o2111a': ({'A1': (-80, 52), 'A2': (-40, 52), 'B1': (0, 10), 'C1': (40, 20), 'D1': (80, 0), 'X': (0, 57)}, ('1', '2', '4')),
+        'o2111ai': ({'A1': (-80, 52), 'A2': (-40, 52), 'B1': (0, 10), 'C1': (40, 20), 'D1': (80, 0), 'Y': (0, 67)}, ('1', '2', '4')),
+        'o211a': ({'A1': (-60, 52), 'A2': (-20, 52), 'B1': (20, 20), 'C1': (60, 10), 'X': (0, 57)}, ('1', '2', '4')),
+        'o211ai': ({'A1': (-60, 52), 'A2': (-20, 52), 'B1': (20, 20), 'C1': (60, 10), 'Y': (0, 67)}, ('1', '2', '4')),
+        'o21a': ({'A1': (-40, 52), 'A2': (0, 52), 'B1': (40, 17), 'X': (0, 57)}, ('1', '2', '4')),
+        'o21ai': ({'A1': (-40, 52), 'A2': (0, 52), 'B1': (40, 17), 'Y': (0, 67)}, ('0', '1', '2', '4')),
+        'o21ba': ({'A1': (-40, 52), 'A2': (0, 52), 'B1_N': (40, 17), 'X': (0, 57)}, ('1', '2', '4')),
+        'o21bai': ({'A1': (-40, 52), 'A2': (0, 52), 'B1_N': (40, 17), 'Y': (0, 67)}, ('1', '2', '4')),
+        'o221a': ({'A1': (-80, 52), 'A2': (-40, 52), 'B1': (0, 52), 'B2': (40, 52), 'C1': (80, 5), 'X': (0, 57)}, ('1', '2', '4')),
+        'o221ai': ({'A1': (-80, 52), 'A2': (-40, 52), 'B1': (0, 52), 'B2': (40, 52), 'C1': (80, 5), 'Y': (0, 67)}, ('1', '2', '4')),
+        'o22a': ({'A1': (-60, 52), 'A2': (-20, 52), 'B1': (20, 52), 'B2': (60, 52), 'X': (0, 57)}, ('1', '2', '4')),
+        'o22ai': ({'A1': (-60, 52), 'A2': (-20, 52), 'B1': (20, 52), 'B2': (60, 52), 'Y': (0, 67)}, ('1', '2', '4')),
+        'o2bb2a': ({'A1_N': (-60, 62), 'A2_N': (-20, 62), 'B1': (20, 52), 'B2': (60, 52), 'X': (0, 57)}, ('1', '2', '4')),
+        'o2bb2ai': ({'A1_N': (-60, 62), 'A2_N': (-20, 62), 'B1': (20, 52), 'B2': (60, 52), 'Y': (0, 67)}, ('1', '2', '4')),
+        'o311a': ({'A1': (-80, 60), 'A2': (-40, 43), 'A3': (0, 60), 'B1': (40, 20), 'C1': (80, 10), 'X': (0, 57)}, ('1', '2', '4')),
+        'o311ai': ({'A1': (-80, 60), 'A2': (-40, 43), 'A3': (0, 60), 'B1': (40, 20), 'C1': (80, 10), 'Y': (0, 67)}, ('0', '1', '2', '4')),
+        'o31a': ({'A1': (-60, 60), 'A2': (-20, 43), 'A3': (20, 60), 'B1': (60, 20), 'X': (0, 57)}, ('1', '2', '4')),
+        'o31ai': ({'A1': (-60, 60), 'A2': (-20, 43), 'A3': (20, 60), 'B1': (60, 20), 'Y': (0, 67)}, ('1', '2', '4')),
+        'o32a': ({'A1': (-80, 60), 'A2': (-40, 48), 'A3': (0, 60), 'B1': (40, 52), 'B2': (80, 52), 'X': (0, 57)}, ('1', '2', '4')),
+        'o32ai': ({'A1': (-80, 60), 'A2': (-40, 48), 'A3': (0, 60), 'B1': (40, 52), 'B2': (80, 52), 'Y': (0, 67)}, ('1', '2', '4')),
+        'o41a': ({'A1': (-80, 57), 'A2': (-40, 65), 'A3': (0, 65), 'A4': (40, 57), 'B1': (80, 20), 'X': (0, 57)}, ('1', '2', '4')),
+        'o41ai': ({'A1': (-80, 57), 'A2': (-40, 65), 'A3': (0, 65), 'A4': (40, 57), 'B1': (80, 20), 'Y': (0, 67)}, ('1', '2', '4')),
+        'or2': ({'A': (-20, 25), 'B': (20, 25), 'X': (0, 35)}, ('0', '1', '2', '4')),
+        'or2b': ({'A': (-20, 35), 'B_N': (20, 35), 'X': (0, 35)}, ('1', '2', '4')),
+        'or3': ({'A': (-40, 35), 'B': (0, 21), 'C': (40, 35), 'X': (0, 35)}, ('1', '2', '4')),
+        'or3b': ({'A': (-40, 35), 'B': (0, 21), 'C_N': (40, 40), 'X': (0, 35)}, ('1', '2', '4')),
+        'or4': ({'A': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D': (60, 40), 'X': (0, 35)}, ('1', '2', '4')),
+        'or4b': ({'A': (-60, 40), 'B': (-20, 45), 'C': (20, 45), 'D_N': (60, 40), 'X': (0, 35)}, ('1', '2', '4')),
+        'or4bb': ({'A': (-60, 40), 'B': (-20, 45), 'C_N': (20, 45), 'D_N': (60, 40), 'X': (0, 35)}, ('1', '2', '4')),
+        'probe_p': ({'A': (0, 70), 'X': (0, 70)}, ('8',)),
+        'probec_p': ({'A': (0, 70), 'X': (0, 70)}, ('8',)),
+        'sdfbbn': ({'CLK_N': (-50, 70), 'D': (-30, 70), 'RESET_B': (-10, 70), 'SCD': (10, 70), 'SCE': (30, 70), 'SET_B': (50, 70), 'Q': (-50, 70), 'Q_N': (-30, 70)}, ('1', '2')),
+        'sdfbbp': ({'CLK': (-50, 70), 'D': (-30, 70), 'RESET_B': (-10, 70), 'SCD': (10, 70), 'SCE': (30, 70), 'SET_B': (50, 70), 'Q': (-50, 70), 'Q_N': (-30, 70)}, ('1',)),
+        'sdfrbp': ({'CLK': (-40, 70), 'D': (-20, 70), 'RESET_B': (0, 70), 'SCD': (20, 70), 'SCE': (40, 70), 'Q': (-40, 70), 'Q_N': (-20, 70)}, ('1', '2')),
+        'sdfrtn': ({'CLK_N': (-40, 70), 'D': (-20, 70), 'RESET_B': (0, 70), 'SCD': (20, 70), 'SCE': (40, 70), 'Q': (-40, 70)}, ('1',)),
+        'sdfrtp': ({'CLK': (-40, 70), 'D': (-20, 70), 'RESET_B': (0, 70), 'SCD': (20, 70), 'SCE': (40, 70), 'Q': (-40, 70)}, ('1', '2', '4')),
+        'sdfsbp': ({'CLK': (-40, 70), 'D': (-20, 70), 'SCD': (0, 70), 'SCE': (20, 70), 'SET_B': (40, 70), 'Q': (-40, 70), 'Q_N': (-20, 70)}, ('1', '2')),
+        'sdfstp': ({'CLK': (-40, 70), 'D': (-20, 70), 'SCD': (0, 70), 'SCE': (20, 70), 'SET_B': (40, 70), 'Q': (-40, 70)}, ('1', '2', '4')),
+        'sdfxbp': ({'CLK': (-30, 70), 'D': (-10, 70), 'SCD': (10, 70), 'SCE': (30, 70), 'Q': (-30, 70), 'Q_N': (-10, 70)}, ('1', '2')),
+        'sdfxtp': ({'CLK': (-30, 70), 'D': (-10, 70), 'SCD': (10, 70), 'SCE': (30, 70), 'Q': (-30, 70)}, ('1', '2', '4')),
+        'sdlclkp': ({'CLK': (-20, 70), 'GATE': (0, 70), 'SCE': (20, 70), 'GCLK': (-20, 70)}, ('1', '2', '4')),
+        'sedfxbp': ({'CLK': (-40, 70), 'D': (-20, 70), 'DE': (0, 70), 'SCD': (20, 70), 'SCE': (40, 70), 'Q': (-40, 70), 'Q_N': (-20, 70)}, ('1', '2')),
+        'sedfxtp': ({'CLK': (-40, 70), 'D': (-20, 70), 'DE': (0, 70), 'SCD': (20, 70), 'SCE': (40, 70), 'Q': (-40, 70)}, ('1', '2', '4')),
+        'tap': ({}, ('1', '2')),
+        'tapvgnd2': ({}, ('1',)),
+        'tapvgnd': ({}, ('1',)),
+        'tapvpwrvgnd': ({}, ('1',)),
+        'xnor2': ({'A': (-20, 35), 'B': (20, 35), 'Y': (0, 45)}, ('1', '2', '4')),
+        'xnor3': ({'A': (-40, 45), 'B': (0, 31.4), 'C': (40, 45), 'X': (0, 45)}, ('1', '2', '4')),
+        'xor2': ({'A': (-20, 35), 'B': (20, 35), 'X': (0, 35)}, ('1', '2', '4')),
+        'xor3': ({'A': (-40, 45), 'B': (0, 31.4), 'C': (40, 45), 'X': (0, 35)}, ('1', '2', '4')),
+    }
+
+
+def compile_tables(families):
+    """
+    Deduplica a tabela fonte: uma lista de footprints (geometria compartilhada)
+    e um índice tipo de célula -> posição do footprint.
+    """
+    footprints, index = [], {}
+    for family, (geometry, suffixes) in families.items():
+        fid = len(footprints)
+        footprints.append(geometry)
+        for suffix in suffixes:
+            index[f"{family}_{suffix}"] = fid
+    return footprints, index
+
+
+def _source_key():
+    st = os.stat(os.path.abspath(__file__))
+    return (CACHE_FORMAT, st.st_mtime_ns, st.st_size)
+
+
+def load_compiled(cache_file=CACHE_FILE):
+    """Lê o cache compilado; refaz (e tenta gravar) se estiver ausente ou velho."""
+    key = _source_key()
+    try:
+        with open(cache_file, 'rb') as f:
+            cached_key, footprints, index = marshal.load(f)
+        if tuple(cached_key) == key:
+            return footprints, index
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    footprints, index = compile_tables(_source_tables())
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        tmp = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            marshal.dump((key, footprints, index), f)
+        os.replace(tmp, cache_file)
+    except OSError:
+        pass  # diretório sem permissão de escrita: segue só com a versão em memória
+    return footprints, index
+
+
+class CellDB(Mapping):
+    """
+    Visão dict-like do banco (tipo de célula -> {pino: (dy, dx_off)}),
+    carregada na primeira consulta. Tipos da mesma família devolvem o mesmo
+    dicionário de geometria.
+    """
+    def __init__(self, loader=load_compiled):
+        self._loader = loader
+        self._footprints = None
+        self._index = None
+        # Células vindas de bibliotecas de símbolos (sym_indexer): têm
+        # precedência sobre a tabela fonte e trazem a direção dos pinos
+        self._extra = {}
+        self._directions = {}
+
+    def _load(self):
+        self._footprints, self._index = self._loader()
+
+    def __getitem__(self, cell_type):
+        geometry = self.get(cell_type)
+        if geometry is None:
+            raise KeyError(cell_type)
+        return geometry
+
+    def get(self, cell_type, default=None):
+        geometry = self._extra.get(cell_type)
+        if geometry is not None:
+            return geometry
+        if self._index is None:
+            self._load()
+        fid = self._index.get(cell_type)
+        return default if fid is None else self._footprints[fid]
+
+    def __contains__(self, cell_type):
+        if cell_type in self._extra:
+            return True
+        if self._index is None:
+            self._load()
+        return cell_type in self._index
+
+    def __iter__(self):
+        if self._index is None:
+            self._load()
+        yield from self._extra
+        for cell_type in self._index:
+            if cell_type not in self._extra:
+                yield cell_type
+
+    def __len__(self):
+        if self._index is None:
+            self._load()
+        return len(self._index) + sum(1 for t in self._extra if t not in self._index)
+
+    def add_cells(self, geometry, directions=None):
+        """Acrescenta (ou substitui) células, ex.: as lidas pelo sym_indexer."""
+        self._extra.update(geometry)
+        if directions:
+            self._directions.update(directions)
+
+    def pin_direction(self, cell_type, pin_name):
+        """Direção do pino ('in', 'out', 'inout'): a do símbolo, se houver, senão a da tabela."""
+        direction = self._directions.get(cell_type, {}).get(pin_name)
+        if direction is None:
+            direction = 'out' if pin_name in OUTPUT_PINS else 'in'
+        return direction
+
+    def fingerprint(self):
+        """Hash do conteúdo efetivo (tabela, símbolos e direções): muda se qualquer geometria mudar."""
+        if self._index is None:
+            self._load()
+        content = (self._footprints, self._index, self._extra, self._directions, sorted(OUTPUT_PINS))
+        return hashlib.sha1(marshal.dumps(content)).hexdigest()
+
+
+CELL_DB = CellDB()
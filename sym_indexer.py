@@ -0,0 +1,119 @@
+import os
+import re
+import sys
+import json
+import glob
+import hashlib
+
+# Indexador de bibliotecas de símbolos do xschem (.sym): extrai os pinos
+# (caixas "B 5" com name=/dir=) e monta a geometria no formato do CELL_DB,
+# pino -> (dy, dx_off), mais a direção de cada pino. O resultado fica em um
+# cache em disco por biblioteca; só os .sym novos ou alterados (mtime/tamanho)
+# são lidos de novo.
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "verilog_to_xschem")
+CACHE_FORMAT = 1
+
+re_pin_box = re.compile(r"^B\s+5\s+(\S+)\s+(\S+)\s+(\S+)\s+(\S+)\s+\{([^}]*)\}", re.MULTILINE)
+re_attr_name = re.compile(r"(?:^|\s)name=(\S+)")
+re_attr_dir = re.compile(r"(?:^|\s)dir=(\w+)")
+
+# Prefixos de biblioteca removidos do nome do arquivo (hd, hs, ms, hvl...)
+re_lib_prefix = re.compile(r"^sky130_\w+?_sc_\w+?__")
+
+
+def parse_symbol(path):
+    """
+    Lê um .sym e retorna {pino: (dy, dx_off, direção)}. O ponto do pino é o
+    centro da caixa "B 5"; dx_off é a distância horizontal até a origem do
+    símbolo. Pinos de alimentação (VGND, VPWR...) entram como os demais.
+    """
+    with open(path, 'r', errors='replace') as f:
+        content = f.read()
+
+    pins = {}
+    for x1, y1, x2, y2, attrs in re_pin_box.findall(content):
+        m_name = re_attr_name.search(attrs)
+        if not m_name:
+            continue
+        m_dir = re_attr_dir.search(attrs)
+        cx = (float(x1) + float(x2)) / 2
+        cy = (float(y1) + float(y2)) / 2
+        pins[m_name.group(1)] = (_compact(cy), _compact(abs(cx)), m_dir.group(1) if m_dir else "inout")
+    return pins
+
+
+def _compact(value):
+    """Mantém inteiros como int (como no banco escrito à mão)."""
+    return int(value) if value == int(value) else value
+
+
+def cell_name(path):
+    """Tipo de célula a partir do nome do arquivo: a2111o_1.sym -> a2111o_1."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return re_lib_prefix.sub("", stem)
+
+
+def cache_path(sym_dir, cache_dir=CACHE_DIR):
+    digest = hashlib.sha1(os.path.abspath(sym_dir).encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, f"sym_index_{digest}.json")
+
+
+def index_library(sym_dir, cache_dir=CACHE_DIR):
+    """
+    Indexa todos os .sym de 'sym_dir'. Retorna {tipo: {pino: (dy, dx_off, dir)}}.
+    O cache guarda, por arquivo, mtime/tamanho e os pinos extraídos.
+    """
+    cache_file = cache_path(sym_dir, cache_dir)
+    try:
+        with open(cache_file, 'r') as f:
+            cache = json.load(f)
+        if cache.get('format') != CACHE_FORMAT:
+            cache = None
+    except (OSError, ValueError):
+        cache = None
+    entries = cache['files'] if cache else {}
+
+    files = {}
+    parsed = 0
+    for path in sorted(glob.glob(os.path.join(sym_dir, "*.sym"))):
+        st = os.stat(path)
+        name = os.path.basename(path)
+        entry = entries.get(name)
+        if entry is None or entry['mtime_ns'] != st.st_mtime_ns or entry['size'] != st.st_size:
+            entry = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'pins': parse_symbol(path)}
+            parsed += 1
+        files[name] = entry
+
+    # Regrava se algo foi relido ou algum .sym deixou de existir
+    if parsed or len(files) != len(entries):
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = f"{cache_file}.{os.getpid()}.tmp"
+            with open(tmp, 'w') as f:
+                json.dump({'format': CACHE_FORMAT, 'sym_dir': os.path.abspath(sym_dir), 'files': files}, f)
+            os.replace(tmp, cache_file)
+        except OSError:
+            pass
+
+    print(f"Biblioteca '{sym_dir}': {len(files)} símbolo(s), {parsed} relido(s).")
+    return {cell_name(name): {pin: tuple(v) for pin, v in entry['pins'].items()}
+            for name, entry in files.items()}
+
+
+def load_symbol_library(sym_dir, cache_dir=CACHE_DIR):
+    """Geometria no formato do CELL_DB ({tipo: {pino: (dy, dx_off)}}) e direções."""
+    geometry, directions = {}, {}
+    for cell_type, pins in index_library(sym_dir, cache_dir).items():
+        geometry[cell_type] = {pin: (dy, dx) for pin, (dy, dx, _) in pins.items()}
+        directions[cell_type] = {pin: d for pin, (_, _, d) in pins.items()}
+    return geometry, directions
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Uso: python sym_indexer.py <diretório com .sym>")
+    else:
+        geometry, _ = load_symbol_library(sys.argv[1])
+        for cell_type in sorted(geometry):
+            print(f"    '{cell_type}': {geometry[cell_type]},")
@@ -0,0 +1,446 @@
+import re
+import mmap
+
+# Tokens de uma netlist estrutural pós-síntese.
+# A ordem importa: identificadores escapados vêm antes da pontuação para que
+# nomes como "\u_core/alu[3] " não sejam confundidos com comentários ou slices.
+_TOKEN = re.compile(r"""
+      \\\S+                                   # identificador escapado (termina no espaço)
+    | [A-Za-z_][\w$]*                         # identificador simples / palavra-chave
+    | \d*'[sS]?[bBoOdDhH][0-9a-fA-FxXzZ_?]+    # constante com base (1'b0, 8'hFF)
+    | \d+
+    | "(?:[^"\\]|\\.)*"                       # string
+    | //|/\*|\(\*(?!\))                       # comentários e atributos (* ... *)
+    | \S
+""", re.VERBOSE)
+
+# Palavras-chave que não descrevem instâncias
+RESERVED = {
+    'module', 'macromodule', 'endmodule', 'input', 'output', 'inout', 'wire', 'reg',
+    'tri', 'supply0', 'supply1', 'assign', 'always', 'initial', 'parameter',
+    'localparam', 'defparam', 'genvar', 'integer', 'specify', 'endspecify',
+}
+
+PORT_DIRECTIONS = ('input', 'output', 'inout')
+
+# Modificadores que podem aparecer entre a direção e o nome da porta
+_PORT_MODIFIERS = {'wire', 'reg', 'signed', 'unsigned', 'tri', 'logic'}
+
+
+def iter_tokens(lines):
+    """
+    Gera os tokens da netlist linha a linha, descartando comentários,
+    atributos e diretivas de compilação. Só a linha corrente fica em memória.
+    """
+    finditer = _TOKEN.finditer
+    closing = None  # terminador pendente de um bloco que atravessa linhas
+
+    for line in lines:
+        pos = 0
+        if closing:
+            end = line.find(closing)
+            if end < 0:
+                continue
+            pos = end + 2
+            closing = None
+
+        while pos is not None:
+            start, pos = pos, None
+            for m in finditer(line, start):
+                tok = m.group()
+                if tok == '//' or tok == '`':
+                    break
+                if tok == '/*' or tok == '(*':
+                    terminator = '*/' if tok == '/*' else '*)'
+                    end = line.find(terminator, m.end())
+                    if end < 0:
+                        closing = terminator
+                    else:
+                        pos = end + 2
+                    break
+                yield tok
+
+
+def _join_expr(tokens):
+    """Reconstrói a expressão de uma conexão (ex.: net[3], {a,b}, \\nome [2])."""
+    if len(tokens) == 1:
+        return tokens[0]
+    parts = []
+    for tok in tokens:
+        parts.append(tok)
+        # Identificador escapado precisa do espaço que o termina
+        if tok[0] == '\\':
+            parts.append(' ')
+    return ''.join(parts).rstrip()
+
+
+def _split_range(tokens, i):
+    """Consome um range [msb:lsb] a partir de tokens[i]; retorna (texto, próximo índice)."""
+    if i >= len(tokens) or tokens[i] != '[':
+        return "", i
+    j = tokens.index(']', i)
+    return ''.join(tokens[i:j + 1]), j + 1
+
+
+def _parse_port_decl(tokens, direction):
+    """Interpreta 'input [7:0] a, b' (sem a palavra de direção) em (direção, nome, largura)."""
+    ports = []
+    width = ""
+    i = 0
+    n = len(tokens)
+    while i < n:
+        tok = tokens[i]
+        if tok in _PORT_MODIFIERS or tok == ',':
+            i += 1
+        elif tok == '[':
+            width, i = _split_range(tokens, i)
+        else:
+            ports.append((direction, tok, width))
+            i += 1
+            # Ignora um eventual range de array após o nome
+            _, i = _split_range(tokens, i)
+    return ports
+
+
+def _parse_module_header(stmt):
+    """Retorna (nome, portas ANSI) de 'module nome #(...) (input a, output y)'."""
+    name = stmt[1]
+    ports = []
+    i = 2
+    if i < len(stmt) and stmt[i] == '#':
+        i = _skip_group(stmt, i + 1)
+    if i >= len(stmt) or stmt[i] != '(':
+        return name, ports
+
+    # Percorre a lista de portas: só há declaração se aparecer uma direção
+    direction = None
+    decl = []
+    for tok in stmt[i + 1:-1]:
+        if tok in PORT_DIRECTIONS:
+            if direction:
+                ports.extend(_parse_port_decl(decl, direction))
+            direction, decl = tok, []
+        elif direction:
+            decl.append(tok)
+    if direction:
+        ports.extend(_parse_port_decl(decl, direction))
+    return name, ports
+
+
+def _skip_group(stmt, i):
+    """Pula um grupo balanceado de parênteses iniciado em stmt[i]."""
+    depth = 0
+    n = len(stmt)
+    while i < n:
+        tok = stmt[i]
+        if tok == '(':
+            depth += 1
+        elif tok == ')':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return i
+
+
+def _parse_connections(stmt, i):
+    """
+    Lê as conexões nomeadas '.PINO(expr)' a partir do '(' em stmt[i].
+    Retorna (lista de (pino, net), próximo índice). Pinos vazios são ignorados.
+    """
+    conns = []
+    n = len(stmt)
+    i += 1
+    while i < n:
+        tok = stmt[i]
+        if tok == ')':
+            return conns, i + 1
+        if tok == '.' and i + 2 < n and stmt[i + 2] == '(':
+            pin = stmt[i + 1]
+            j = i + 3
+            depth = 1
+            expr = []
+            while j < n:
+                t = stmt[j]
+                if t == '(':
+                    depth += 1
+                elif t == ')':
+                    depth -= 1
+                    if depth == 0:
+                        break
+                expr.append(t)
+                j += 1
+            if expr:
+                conns.append((pin, _join_expr(expr)))
+            i = j + 1
+        elif tok == '(':
+            # Conexão posicional com sub-expressão: sem nome de pino, é ignorada
+            i = _skip_group(stmt, i)
+        else:
+            i += 1
+    return conns, i
+
+
+def _parse_instances(stmt):
+    """Interpreta 'tipo #(...) nome (conns), nome2 (conns)' em dicionários de instância."""
+    cell_type = stmt[0]
+    i = 1
+    n = len(stmt)
+    if i < n and stmt[i] == '#':
+        i = _skip_group(stmt, i + 1)
+
+    instances = []
+    while i < n:
+        name = stmt[i]
+        i += 1
+        # Arrays de instâncias: nome [3:0] (...)
+        rng, i = _split_range(stmt, i)
+        if i >= n or stmt[i] != '(':
+            break
+        conns, i = _parse_connections(stmt, i)
+        instances.append({'type': cell_type, 'name': name + rng, 'conns': conns})
+        if i < n and stmt[i] == ',':
+            i += 1
+    return instances
+
+
+def _statement_records(stmt):
+    """Registros de um statement completo (tokens sem o ';' final)."""
+    head = stmt[0]
+    if head == 'module' or head == 'macromodule':
+        module_name, ports = _parse_module_header(stmt)
+        return [('module', module_name)] + [('port', port) for port in ports]
+    if head in PORT_DIRECTIONS:
+        return [('port', port) for port in _parse_port_decl(stmt[1:], head)]
+    if head not in RESERVED and len(stmt) > 2:
+        return [('instance', inst) for inst in _parse_instances(stmt)]
+    return []
+
+
+def _count_instances(stmt):
+    """Instâncias de um statement descartado: grupos de parênteses de nível 0 fora de #(...)."""
+    count, depth, prev = 0, 0, stmt[0]
+    for tok in stmt[1:]:
+        if tok == '(':
+            if depth == 0 and prev != '#':
+                count += 1
+            depth += 1
+        elif tok == ')':
+            depth -= 1
+        prev = tok
+    return count
+
+
+def iter_netlist(lines, instance_filter=None):
+    """
+    Lê a netlist em uma única passada e gera registros (tipo, dado):
+      ('module', nome)
+      ('port', (direção, nome, largura))
+      ('instance', {'type', 'name', 'conns'})
+      ('skipped', (tipo, quantidade))
+      ('endmodule', nome)
+    'lines' pode ser o próprio handle do arquivo: o consumo de memória fica
+    limitado ao maior statement, independente do tamanho da netlist.
+
+    Se 'instance_filter(tipo)' retornar False, o statement da instância é
+    descartado já no tokenizador (sem montar conexões nem dicionário) e só
+    a contagem é reportada em um registro 'skipped'.
+    """
+    stmt = []
+    module_name = None
+    skip_type = None
+
+    for tok in iter_tokens(lines):
+        if skip_type is not None:
+            # Consome o statement descartado contando as instâncias: cada grupo
+            # de parênteses de nível 0 que não seja de parâmetros (#(...)).
+            if tok == '(':
+                if depth == 0 and prev != '#':
+                    skipped += 1
+                depth += 1
+            elif tok == ')':
+                depth -= 1
+            elif tok == ';':
+                yield 'skipped', (skip_type, skipped)
+                skip_type = None
+            prev = tok
+            continue
+
+        if tok == 'endmodule':
+            stmt = []
+            yield 'endmodule', module_name
+            module_name = None
+            continue
+        if tok != ';':
+            if not stmt and instance_filter is not None and tok not in RESERVED and not instance_filter(tok):
+                skip_type, skipped, depth, prev = tok, 0, 0, tok
+                continue
+            stmt.append(tok)
+            continue
+
+        if not stmt:
+            continue
+        if stmt[0] == 'module' or stmt[0] == 'macromodule':
+            module_name = stmt[1]
+        yield from _statement_records(stmt)
+        stmt = []
+
+
+# Leitura direta de bytes (iter_netlist_file): o arquivo é mapeado em memória
+# e varrido com regexes de bytes, sem passar por linhas nem por str. As
+# formas que dominam uma netlist pós-síntese (instância com conexões nomeadas
+# a nets simples, declarações sem comentários) são casadas por inteiro e só
+# os nomes mantidos são decodificados; o resto cai no tokenizador genérico,
+# um statement por vez. As páginas já lidas podem ser descartadas pelo
+# sistema, então o arquivo pode ser maior que a memória da máquina.
+
+_B_ID = rb"[A-Za-z_][\w$]*"
+_B_NET = _B_ID + rb"(?:\[\d+\])?"
+
+_FAST_INSTANCE = re.compile(rb"\s*(" + _B_ID + rb")\s+(" + _B_ID + rb")\s*\(((?:\s*\." + _B_ID +
+                            rb"\s*\(\s*" + _B_NET + rb"\s*\)\s*,?)*)\s*\)\s*;")
+_FAST_CONN = re.compile(rb"\.(" + _B_ID + rb")\s*\(\s*(" + _B_NET + rb")")
+_FAST_DECL = re.compile(rb"\s*(wire|input|output|inout)\b([^;/`(\\\"]*);")
+
+# Espaços, comentários, atributos e diretivas casam sem grupo (ignorados);
+# os tokens, na mesma ordem de _TOKEN, ficam no grupo 1
+_TOKEN_BYTES = re.compile(rb"""
+      \s+ | //[^\n]* | `[^\n]*
+    | /\*.*?(?:\*/|\Z) | \(\*(?!\)).*?(?:\*\)|\Z)
+    | ( \\\S+
+      | [A-Za-z_][\w$\x80-\xff]*
+      | \d*'[sS]?[bBoOdDhH][0-9a-fA-FxXzZ_?]+
+      | \d+
+      | "(?:[^"\\]|\\.)*"
+      | [\x80-\xff]+
+      | \S )
+""", re.VERBOSE | re.DOTALL)
+
+
+def _next_statement(buf, pos):
+    """
+    Tokeniza (como str) o statement que começa em buf[pos:]. Retorna
+    (tokens, posição seguinte, terminador), com terminador ';', 'endmodule'
+    ou None no fim do arquivo.
+    """
+    stmt = []
+    for m in _TOKEN_BYTES.finditer(buf, pos):
+        tok = m.group(1)
+        if tok is None:
+            continue
+        tok = tok.decode()
+        if tok == ';' or tok == 'endmodule':
+            return stmt, m.end(), tok
+        stmt.append(tok)
+    return stmt, len(buf), None
+
+
+class _ByteScanner:
+    """
+    Estado da leitura em bytes entre buffers sucessivos: módulo corrente e
+    tipos/pinos já decodificados (se repetem, então são decodificados uma vez).
+    """
+    def __init__(self, instance_filter=None):
+        self.instance_filter = instance_filter
+        self.module_name = None
+        self.types, self.pins = {}, {}
+
+    def scan(self, buf, final=True):
+        """
+        Gera os registros dos statements completos de 'buf' e retorna a posição
+        do primeiro statement incompleto. Com 'final', buf vai até o fim do
+        arquivo e um statement sem terminador é descartado, como em iter_netlist.
+        """
+        instance_filter, types, pins = self.instance_filter, self.types, self.pins
+        fast_instance, fast_decl, find_conns = _FAST_INSTANCE.match, _FAST_DECL.match, _FAST_CONN.findall
+        pos, end = 0, len(buf)
+
+        while pos < end:
+            m = fast_instance(buf, pos)
+            if m:
+                raw_type = m.group(1)
+                cell_type = types.get(raw_type)
+                if cell_type is None:
+                    cell_type = types[raw_type] = raw_type.decode()
+                if cell_type not in RESERVED:
+                    pos = m.end()
+                    if instance_filter is not None and not instance_filter(cell_type):
+                        yield 'skipped', (cell_type, 1)
+                        continue
+                    conns = []
+                    for raw_pin, net in find_conns(m.group(3)):
+                        pin = pins.get(raw_pin)
+                        if pin is None:
+                            pin = pins[raw_pin] = raw_pin.decode()
+                        conns.append((pin, net.decode()))
+                    yield 'instance', {'type': cell_type, 'name': m.group(2).decode(), 'conns': conns}
+                    continue
+
+            m = fast_decl(buf, pos)
+            if m:
+                pos = m.end()
+                if m.group(1) != b'wire':
+                    direction = m.group(1).decode()
+                    for port in _parse_port_decl(list(iter_tokens([m.group(2).decode()])), direction):
+                        yield 'port', port
+                continue
+
+            stmt, next_pos, terminator = _next_statement(buf, pos)
+            # Sem o resto do arquivo, um 'endmodule' colado ao fim pode ser o início de outro nome
+            if not final and (terminator is None or next_pos == end):
+                return pos
+            pos = next_pos
+            if terminator == 'endmodule':
+                yield 'endmodule', self.module_name
+                self.module_name = None
+            elif terminator is None or not stmt:
+                continue
+            elif instance_filter is not None and stmt[0] not in RESERVED and not instance_filter(stmt[0]):
+                yield 'skipped', (stmt[0], _count_instances(stmt))
+            else:
+                if stmt[0] == 'module' or stmt[0] == 'macromodule':
+                    self.module_name = stmt[1]
+                yield from _statement_records(stmt)
+        return pos
+
+
+def iter_netlist_bytes(buf, instance_filter=None):
+    """
+    Como iter_netlist, mas sobre um buffer de bytes (bytes, mmap) com a
+    netlist inteira; gera os mesmos registros.
+    """
+    yield from _ByteScanner(instance_filter).scan(buf)
+
+
+# Tamanho dos blocos lidos de um stream (ex.: descompressão de um .gz)
+STREAM_CHUNK = 1 << 22
+
+
+def iter_netlist_stream(stream, instance_filter=None, chunk_size=STREAM_CHUNK):
+    """
+    Como iter_netlist_bytes, lendo 'stream' (binário) em blocos: só o bloco
+    corrente e o statement que o atravessa ficam em memória.
+    """
+    scanner = _ByteScanner(instance_filter)
+    buf = b""
+    while True:
+        data = stream.read(chunk_size)
+        buf += data
+        stop = yield from scanner.scan(buf, final=not data)
+        if not data:
+            return
+        buf = buf[stop:]
+
+
+def iter_netlist_file(path, instance_filter=None):
+    """iter_netlist_bytes sobre o arquivo 'path' mapeado em memória (somente leitura)."""
+    with open(path, 'rb') as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Arquivo vazio: não há o que mapear
+            return
+        with buf:
+            if hasattr(buf, 'madvise'):
+                buf.madvise(mmap.MADV_SEQUENTIAL)
+            yield from iter_netlist_bytes(buf, instance_filter)